@@ -1,9 +1,17 @@
 import oracledb as cx_Oracle
+import os
 import time
 import sys
+import json
+import urllib.request
 from datetime import datetime
 import re
 
+# Schema migrations and the expiry report are shared with the Flask API
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "backend"))
+import migrations
+import expiry_report
+
 EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
 PHONE_RE = re.compile(r"^[\d\+\-\s\(\)]{7,25}$") 
 
@@ -11,6 +19,7 @@ PHONE_RE = re.compile(r"^[\d\+\-\s\(\)]{7,25}$")
 DB_USER = "system"
 DB_PASS = "root"
 DB_DSN  = cx_Oracle.makedsn("localhost", 1521, service_name="xepdb1")
+API_URL = "http://localhost:5000/api"  # running Flask API, told about CLI writes
 # -----------------------------------------
 
 # ---------- DB CONNECTION ----------
@@ -27,6 +36,24 @@ def connect_db():
 
 con, cur = connect_db()
 
+# ---------- Helper: tell the API its cached reads are stale ----------
+def post_api(path, payload=None):
+    try:
+        req = urllib.request.Request(f"{API_URL}{path}", method="POST",
+                                     data=json.dumps(payload or {}).encode(),
+                                     headers={'Content-Type': 'application/json'})
+        urllib.request.urlopen(req, timeout=2)
+    except Exception:
+        pass  # API not running; nothing cached to drop
+
+def notify_api(*tables):
+    post_api("/admin/cache/invalidate", {'tables': list(tables)})
+
+def notify_api_schema():
+    """After a migration: the API re-reads the schema and drops every cached read"""
+    post_api("/admin/schema-cache/invalidate")
+    notify_api('SUPPLIERS', 'CUSTOMERS', 'MEDICINES', 'INVENTORY', 'ORDERS')
+
 # ---------- Helper: execute safely ----------
 def try_execute(sql, binds=None, silent_on_exists=False):
     try:
@@ -45,101 +72,25 @@ def try_execute(sql, binds=None, silent_on_exists=False):
 
 # ---------- SCHEMA & SETUP ----------
 
-def setup_schema():
-    print("\n--- Creating / Ensuring Pharmacy Schema ---")
-    # Suppliers
-    try_execute("""
-    CREATE TABLE Suppliers (
-        supplier_id NUMBER GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
-        name VARCHAR2(120) NOT NULL,
-        contact_email VARCHAR2(120) NOT NULL,
-        phone VARCHAR2(20) NOT NULL,
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        CONSTRAINT unique_supplier_entry UNIQUE (name,contact_email,phone)
-    )
-    """, silent_on_exists=True)
-    # Customers
-    try_execute("""
-    CREATE TABLE Customers (
-        customer_id NUMBER GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
-        name VARCHAR2(120) NOT NULL,
-        phone VARCHAR2(20),
-        email VARCHAR2(120),
-        address VARCHAR2(300),
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-    )
-    """, silent_on_exists=True)
-    # Medicines
-    try_execute("""
-    CREATE TABLE Medicines (
-        medicine_id NUMBER GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
-        name VARCHAR2(200) NOT NULL,
-        pharma_form VARCHAR2(50),
-        strength VARCHAR2(50),
-        unit_price NUMBER(10,2) DEFAULT 0,
-        supplier_id NUMBER,
-        expiry_date DATE,
-        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-        is_active CHAR(1) DEFAULT 'Y' CHECK (is_active IN ('Y','N')),
-        retired_at TIMESTAMP NULL,
-        CONSTRAINT fk_med_supplier FOREIGN KEY (supplier_id) REFERENCES Suppliers(supplier_id),
-        CONSTRAINT unique_medicine_entry UNIQUE (name, pharma_form, strength, expiry_date)
-    )
-""", silent_on_exists=True)
-
-    # Inventory
-    try_execute("""
-    CREATE TABLE Inventory (
-        medicine_id NUMBER PRIMARY KEY,
-        qty NUMBER DEFAULT 0,
-        min_threshold NUMBER DEFAULT 10,
-        CONSTRAINT fk_inv_med FOREIGN KEY(medicine_id) REFERENCES Medicines(medicine_id)
-    )
-    """, silent_on_exists=True)
-    # Orders & Order_Items
-    try_execute("""
-    CREATE TABLE Orders (
-        order_id NUMBER GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
-        order_date DATE DEFAULT SYSDATE,
-        customer_id NUMBER,
-        total_amount NUMBER(12,2),
-        status VARCHAR2(20),
-        CONSTRAINT fk_ord_cust FOREIGN KEY(customer_id) REFERENCES Customers(customer_id)
-    )
-    """, silent_on_exists=True)
-    try_execute("""
-    CREATE TABLE Order_Items (
-        order_item_id NUMBER GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
-        order_id NUMBER,
-        medicine_id NUMBER,
-        quantity NUMBER,
-        unit_price NUMBER(10,2),
-        line_total NUMBER(12,2),
-        CONSTRAINT fk_oi_order FOREIGN KEY(order_id) REFERENCES Orders(order_id)
-    )
-    """, silent_on_exists=True)
-    # Audit log
-    try_execute("""
-    CREATE TABLE Audit_Log (
-        audit_id NUMBER GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
-        action_by VARCHAR2(100),
-        action VARCHAR2(100),
-        object_name VARCHAR2(100),
-        details VARCHAR2(2000),
-        action_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-    )
-    """, silent_on_exists=True)
-
-    # Add a CHECK constraint: unit_price >= 0
+def setup_schema(report_current=False):
+    """Apply pending schema migrations; returns the versions applied, None on failure"""
+    deferred = {}
     try:
-        cur.execute("ALTER TABLE Medicines ADD (CONSTRAINT chk_price_nonneg CHECK (unit_price >= 0))")
-    except Exception:
-        pass  # ignore if exists
-
-
-    con.commit()
-    print("Schema ensured. Tables and basic constraints created.\n")
-    time.sleep(1)
+        applied = migrations.migrate(con, log=print, deferred=deferred)
+    except Exception as e:
+        con.rollback()
+        print("Migration failed:", e)
+        notify_api_schema()  # earlier migrations may have applied
+        return None
+    if deferred:
+        print(f"Deferred migration(s) {', '.join(map(str, deferred))}; fix the data above and apply again.")
+    if applied:
+        print(f"Applied migration(s) {', '.join(map(str, applied))}.\n")
+        notify_api_schema()
+        time.sleep(1)
+    elif report_current and not deferred:
+        print(f"Schema is current (version {migrations.LATEST_VERSION}).")
+    return applied
 
 # ---------- Seed realistic sample data ----------
 def seed_data():
@@ -150,27 +101,23 @@ def seed_data():
         ("Cipla Ltd.", "sales@cipla.com", "+91-9876543210"),
         ("Sun Pharma", "support@sunpharma.com", "+91-9123456780")
     ]
-    for name, email, phone in suppliers:
-        cur.execute("""
-            SELECT supplier_id FROM Suppliers
-            WHERE LOWER(name) = LOWER(:1)
-               OR LOWER(contact_email) = LOWER(:2)
-               OR phone = :3
-        """, (name, email, phone))
-        if not cur.fetchone():
-            try_execute("INSERT INTO Suppliers(name, contact_email, phone) VALUES(:1,:2,:3)",
-                        (name, email, phone))
+    # suppliers already on file are rejected by the uq_suppliers_* indexes
+    cur.executemany("INSERT INTO Suppliers(name, contact_email, phone) VALUES(:1,:2,:3)",
+                    suppliers, batcherrors=True)
+    for err in cur.getbatcherrors():
+        if "ORA-00001" not in err.message:
+            print("SQL Error:", err.message)
     con.commit()
 
     # --- CUSTOMERS ---
-    cur.execute("""
-        SELECT customer_id FROM Customers
-        WHERE LOWER(name) = LOWER(:1)
-           OR LOWER(email) = LOWER(:2)
-    """, ("John Doe", "john@example.com"))
-    if not cur.fetchone():
-        try_execute("INSERT INTO Customers(name, phone, email, address) VALUES(:1,:2,:3,:4)",
-                    ("John Doe", "9998887776", "john@example.com", "23 Green Street, Vellore"))
+    try_execute("""
+        MERGE INTO Customers c
+        USING (SELECT :1 AS name, :2 AS phone, :3 AS email, :4 AS address FROM dual) s
+        ON (LOWER(c.email) = LOWER(s.email))
+        WHEN NOT MATCHED THEN
+            INSERT (name, phone, email, address)
+            VALUES (s.name, s.phone, s.email, s.address)
+    """, ("John Doe", "9998887776", "john@example.com", "23 Green Street, Vellore"))
 
     # --- MEDICINES ---
     medicines = [
@@ -179,19 +126,19 @@ def seed_data():
         ("OldSyrup", "Syrup", "100 ml", 40.00, 2, "2020-01-01")
     ]
 
-    for name, form, strength, price, sup, expiry in medicines:
-        cur.execute("""
-            SELECT medicine_id FROM Medicines
-            WHERE LOWER(name) = LOWER(:1)
-              AND LOWER(pharma_form) = LOWER(:2)
-              AND LOWER(strength) = LOWER(:3)
-              AND TO_CHAR(expiry_date, 'YYYY-MM-DD') = :4
-        """, (name, form, strength, expiry))
-        if not cur.fetchone():
-            try_execute("""
-                INSERT INTO Medicines(name, pharma_form, strength, unit_price, supplier_id, expiry_date)
-                VALUES(:1,:2,:3,:4,:5,TO_DATE(:6,'YYYY-MM-DD'))
-            """, (name, form, strength, price, sup, expiry))
+    # matched on the uq_medicines_dedupe key
+    cur.executemany("""
+        MERGE INTO Medicines m
+        USING (SELECT :1 AS name, :2 AS pharma_form, :3 AS strength, :4 AS unit_price,
+                      :5 AS supplier_id, TO_DATE(:6,'YYYY-MM-DD') AS expiry_date FROM dual) s
+        ON (LOWER(m.name) = LOWER(s.name)
+            AND LOWER(m.pharma_form) = LOWER(s.pharma_form)
+            AND LOWER(m.strength) = LOWER(s.strength)
+            AND TRUNC(m.expiry_date) = s.expiry_date)
+        WHEN NOT MATCHED THEN
+            INSERT (name, pharma_form, strength, unit_price, supplier_id, expiry_date)
+            VALUES (s.name, s.pharma_form, s.strength, s.unit_price, s.supplier_id, s.expiry_date)
+    """, medicines)
     con.commit()
 
     # --- INVENTORY ---
@@ -209,154 +156,27 @@ def seed_data():
         
 
 
-# ---------- Triggers: expiry protection & audit ----------
+# ---------- Triggers, stored procedures and views (re-create) ----------
 def setup_triggers():
-    print("Creating triggers: expiry-check (BEFORE INSERT) and audit logging (AFTER INSERT/UPDATE/DELETE).")
-    # BEFORE INSERT on Medicines: Give Warning for Expired Medicine
-    try_execute("""
-    CREATE OR REPLACE TRIGGER trg_med_before_ins
-    BEFORE INSERT OR UPDATE ON Medicines
-    FOR EACH ROW
-    DECLARE
-    BEGIN
-          -- Check if expiry_date is in the past (i.e., expired)
-      IF :NEW.expiry_date IS NOT NULL AND :NEW.expiry_date < TRUNC(SYSDATE) THEN
-            -- Print a warning message (capturable in Python)
-        DBMS_OUTPUT.PUT_LINE('Warning: Medicine "' || :NEW.name || 
-                         '" has an expired date (' || TO_CHAR(:NEW.expiry_date, 'YYYY-MM-DD') || ').');
-      END IF;
-    END;
-    """)
-    # AFTER changes to Orders and Medicines -> audit
-    try_execute("""
-    CREATE OR REPLACE TRIGGER trg_audit_orders
-    AFTER INSERT OR UPDATE OR DELETE ON Orders
-    FOR EACH ROW
-    BEGIN
-      IF INSERTING THEN
-        INSERT INTO Audit_Log(action_by, action, object_name, details) VALUES(USER,'INSERT','ORDERS','Order placed or inserted');
-      ELSIF UPDATING THEN
-        INSERT INTO Audit_Log(action_by, action, object_name, details) VALUES(USER,'UPDATE','ORDERS','Order updated');
-      ELSIF DELETING THEN
-        INSERT INTO Audit_Log(action_by, action, object_name, details) VALUES(USER,'DELETE','ORDERS','Order deleted');
-      END IF;
-    END;
-    """)
-    try_execute("""
-    CREATE OR REPLACE TRIGGER trg_audit_medicines
-    AFTER INSERT OR UPDATE OR DELETE ON Medicines
-    FOR EACH ROW
-    BEGIN
-      IF INSERTING THEN
-        INSERT INTO Audit_Log(action_by, action, object_name, details) VALUES(USER,'INSERT','MEDICINES','Inserted ' || :NEW.name);
-      ELSIF UPDATING THEN
-        INSERT INTO Audit_Log(action_by, action, object_name, details) VALUES(USER,'UPDATE','MEDICINES','Updated ' || :NEW.name);
-      ELSIF DELETING THEN
-        INSERT INTO Audit_Log(action_by, action, object_name, details) VALUES(USER,'DELETE','MEDICINES','Deleted ' || :OLD.name);
-      END IF;
-    END;
-    """)
+    print("Re-creating triggers: expiry-check, audit logging, daily sales rollup and supplier stats.")
+    for _, sql in migrations.TRIGGERS:
+        try_execute(sql)
     con.commit()
     print("Triggers created.\n")
     time.sleep(1)
 
-# ---------- Stored Procedure: place order (transactional) ----------
 def create_stored_procedures():
-    print("Creating stored procedure sp_place_order (places order, updates inventory, adds order_items).")
-    
-    try_execute("""CREATE OR REPLACE PROCEDURE sp_place_order (
-        p_customer_id IN NUMBER,
-          p_items       IN "SYS"."ODCINUMBERLIST",
-          p_qtys        IN "SYS"."ODCINUMBERLIST"
-        ) IS
-          v_unit_price   NUMBER(10,2);
-          v_total        NUMBER(12,2) := 0;
-          v_line_total   NUMBER(12,2);
-          v_order_id     NUMBER;
-          v_stock        NUMBER;
-          v_expiry       DATE;
-        BEGIN
-          IF p_items.COUNT != p_qtys.COUNT THEN
-            RAISE_APPLICATION_ERROR(-20060, 'Items and quantities length mismatch');
-          END IF;
-
-          FOR i IN 1 .. p_items.COUNT LOOP
-            BEGIN
-              SELECT unit_price, expiry_date
-              INTO v_unit_price, v_expiry
-              FROM Medicines
-              WHERE medicine_id = p_items(i);
-            EXCEPTION
-              WHEN NO_DATA_FOUND THEN
-                RAISE_APPLICATION_ERROR(-20063, 'Medicine not found: ' || p_items(i));
-            END;
-
-            IF v_expiry IS NOT NULL AND v_expiry < TRUNC(SYSDATE) THEN
-              RAISE_APPLICATION_ERROR(-20061, 'Cannot sell expired medicine id ' || p_items(i));
-            END IF;
-
-            BEGIN
-              SELECT qty INTO v_stock
-              FROM Inventory
-              WHERE medicine_id = p_items(i)
-              FOR UPDATE;
-            EXCEPTION
-              WHEN NO_DATA_FOUND THEN
-                RAISE_APPLICATION_ERROR(-20064, 'Inventory row not found for medicine id ' || p_items(i));
-            END;
-
-            IF v_stock < p_qtys(i) THEN
-              RAISE_APPLICATION_ERROR(-20062, 'Insufficient stock for medicine id ' || p_items(i));
-            END IF;
-
-            v_line_total := v_unit_price * p_qtys(i);
-            v_total := v_total + v_line_total;
-          END LOOP;
-
-          INSERT INTO Orders (customer_id, total_amount, status)
-          VALUES (p_customer_id, v_total, 'COMPLETED')
-          RETURNING order_id INTO v_order_id;
-
-          FOR i IN 1 .. p_items.COUNT LOOP
-            SELECT unit_price INTO v_unit_price FROM Medicines WHERE medicine_id = p_items(i);
-
-            INSERT INTO Order_Items (order_id, medicine_id, quantity, unit_price, line_total)
-            VALUES (v_order_id, p_items(i), p_qtys(i), v_unit_price, v_unit_price * p_qtys(i));
-
-            UPDATE Inventory
-            SET qty = qty - p_qtys(i)
-            WHERE medicine_id = p_items(i);
-          END LOOP;
-
-          INSERT INTO Audit_Log (action_by, action, object_name, details)
-          VALUES (USER, 'PROC', 'sp_place_order', 'Order ' || v_order_id || ' placed for customer ' || NVL(TO_CHAR(p_customer_id),'UNKNOWN'));
-
-          COMMIT;
-        EXCEPTION
-          WHEN OTHERS THEN
-            ROLLBACK;
-            RAISE;
-        END sp_place_order;
-    """)
-    print("Stored procedure created.\n")
+    print("Re-creating stored procedures sp_place_order, sp_place_order_bulk and sp_place_order_from_holds.")
+    for _, sql in migrations.PROCEDURES:
+        try_execute(sql)
+    con.commit()
+    print("Stored procedures created.\n")
     time.sleep(1)
 
-# ---------- Views for reporting ----------
-
 def create_views():
-    print("Creating view vw_inventory_summary for quick inventory glance.")
-    try_execute("""
-    CREATE OR REPLACE VIEW vw_inventory_summary AS
-      SELECT m.medicine_id,
-             NVL(m.name,'') AS name,
-             NVL(m.pharma_form,'') AS pharma_form,
-             NVL(m.strength,'') AS strength,
-             NVL(m.unit_price,0) AS unit_price,
-             NVL(i.qty,0) AS qty,
-             m.expiry_date,
-             NVL(m.is_active,'Y') AS is_active
-      FROM Medicines m LEFT JOIN Inventory i ON m.medicine_id = i.medicine_id
-    """)
+    print("Re-creating view vw_inventory_summary for quick inventory glance.")
+    for _, sql in migrations.VIEWS:
+        try_execute(sql)
     con.commit()
     print("View created.\n")
     time.sleep(1)
@@ -457,42 +277,41 @@ def add_medicine():
             return
 
     try:
-        # check duplicate
+        # check duplicate (a uq_medicines_dedupe index lookup)
         cur.execute("""
             SELECT medicine_id FROM Medicines
             WHERE LOWER(name)=LOWER(:1)
               AND LOWER(pharma_form)=LOWER(:2)
               AND LOWER(strength)=LOWER(:3)
-              AND TO_CHAR(expiry_date,'YYYY-MM-DD')=:4
+              AND TRUNC(expiry_date)=TO_DATE(:4,'YYYY-MM-DD')
         """, (name, form, strength, expiry_input))
         existing = cur.fetchone()
         if existing:
             print(f"Medicine already exists (ID: {existing[0]}). Skipping insert.")
             return
 
-        # insert
+        # insert, getting the new id back directly
+        mid_var = cur.var(int)
         cur.execute("""
             INSERT INTO Medicines (name, pharma_form, strength, unit_price, supplier_id, expiry_date)
             VALUES (:1, :2, :3, :4, :5, TO_DATE(:6,'YYYY-MM-DD'))
-        """, (name, form, strength, price, supplier_id, expiry_input))
-        con.commit()
+            RETURNING medicine_id INTO :7
+        """, (name, form, strength, price, supplier_id, expiry_input, mid_var))
+        mid = mid_var.getvalue()[0]
 
-        # get medicine id
-        cur.execute("""
-            SELECT medicine_id FROM Medicines
-            WHERE LOWER(name)=LOWER(:1)
-              AND LOWER(pharma_form)=LOWER(:2)
-              AND LOWER(strength)=LOWER(:3)
-              AND TO_CHAR(expiry_date,'YYYY-MM-DD')=:4
-            ORDER BY medicine_id DESC FETCH FIRST 1 ROWS ONLY
-        """, (name, form, strength, expiry_input))
-        mid = cur.fetchone()[0]
-
-        try_execute("INSERT INTO Inventory (medicine_id, qty, min_threshold) VALUES (:1, :2, :3)",
+        cur.execute("INSERT INTO Inventory (medicine_id, qty, min_threshold) VALUES (:1, :2, :3)",
                     (mid, quantity, 10))
         con.commit()
+        notify_api('MEDICINES', 'INVENTORY')
 
         print(f"Medicine '{name}' added successfully with ID {mid}.")
+    except cx_Oracle.IntegrityError as e:
+        con.rollback()
+        if "ORA-00001" in str(e):
+            # added by another session since the check above
+            print("Medicine already exists. Skipping insert.")
+        else:
+            print("Error adding medicine:", e)
     except Exception as e:
         print("Error adding medicine:", e)
 
@@ -512,6 +331,7 @@ def update_stock():
             print("Inventory row missing for this medicine. Creating one.")
             cur.execute("INSERT INTO Inventory(medicine_id, qty, min_threshold) VALUES(:1, :2, :3)", (mid, qty, 10))
         con.commit()
+        notify_api('INVENTORY')
         print("Stock updated.")
         cur.execute("INSERT INTO Audit_Log(action_by, action, object_name, details) VALUES(USER,'UPDATE','INVENTORY','Medicine '||:1||' qty change '||:2)", (mid, qty))
         con.commit()
@@ -572,22 +392,35 @@ def view_low_stock():
 
 def view_expiring_meds():
     print("\n---Near-expiry Medicines ---")
-    # expired
-    cur.execute("SELECT medicine_id, name, expiry_date FROM Medicines WHERE expiry_date < TRUNC(SYSDATE)")
-    expired = cur.fetchall()
-    if expired:
-        print("EXPIRED MEDICINES:")
-        for r in expired:
-            print(f"ID:{r[0]} | {r[1]} | Expiry:{r[2].strftime('%Y-%m-%d')}")
-    else:
-        print("No expired medicines.")
-    # near expiry within 90 days
-    cur.execute("SELECT medicine_id, name, expiry_date FROM Medicines WHERE expiry_date BETWEEN TRUNC(SYSDATE) AND TRUNC(SYSDATE)+90")
-    near = cur.fetchall()
-    if near:
-        print("\nNEAR-EXPIRY (next 90 days):")
-        for r in near:
-            print(f"ID:{r[0]} | {r[1]} | Expiry:{r[2].strftime('%Y-%m-%d')}")
+    days_in = input("Horizon in days [90]: ").strip()
+    try:
+        days = int(days_in) if days_in else 90
+    except ValueError:
+        print("Invalid number of days.")
+        return
+    if not 0 <= days <= expiry_report.EXPIRY_MAX_HORIZON_DAYS:
+        print(f"Horizon must be between 0 and {expiry_report.EXPIRY_MAX_HORIZON_DAYS} days.")
+        return
+    query, binds = expiry_report.expiring_query(days)
+    cur.execute(query, binds)
+    rows = cur.fetchall()
+    if not rows:
+        print(f"No expired medicines or medicines expiring in the next {days} days.")
+        return
+    bucket = None
+    total_qty = 0
+    total_value = 0
+    for r in rows:
+        days_left = int(r[3])
+        label = expiry_report.expiry_bucket(days_left, days)['label']
+        if label != bucket:
+            bucket = label
+            print("\nEXPIRED MEDICINES:" if days_left < 0 else f"\nEXPIRING IN {label} DAYS:")
+        value = r[4] * r[5]
+        total_qty += r[4]
+        total_value += value
+        print(f"ID:{r[0]} | {r[1]} | Expiry:{r[2].strftime('%Y-%m-%d')} | Qty:{r[4]} | At risk:₹{value:.2f}")
+    print(f"\nTotal at risk: {total_qty} units, ₹{total_value:.2f}")
     time.sleep(1)
 def retire_medicine():
     """
@@ -618,6 +451,8 @@ def retire_medicine():
         return
 
     try:
+        # drop its stock holds, so expiring holds cannot restock it later
+        cur.execute("DELETE FROM Stock_Holds WHERE medicine_id = :1", (mid,))
         # zero inventory (if exists)
         cur.execute("UPDATE Inventory SET qty = 0 WHERE medicine_id = :1", (mid,))
         # mark medicine inactive and set retired timestamp
@@ -625,6 +460,7 @@ def retire_medicine():
         # audit
         cur.execute("INSERT INTO Audit_Log(action_by, action, object_name, details) VALUES(USER, 'RETIRE', 'MEDICINES', 'Retired medicine ' || :1)", (mid,))
         con.commit()
+        notify_api('MEDICINES', 'INVENTORY')
         print(f"Medicine ID {mid} retired and inventory set to 0.")
     except Exception as e:
         print("Error retiring medicine:", e)
@@ -661,6 +497,7 @@ def restore_medicine():
         cur.execute("UPDATE Medicines SET is_active = 'Y', retired_at = NULL WHERE medicine_id = :1", (mid,))
         cur.execute("INSERT INTO Audit_Log(action_by, action, object_name, details) VALUES(USER, 'RESTORE', 'MEDICINES', 'Restored medicine ' || :1)", (mid,))
         con.commit()
+        notify_api('MEDICINES', 'INVENTORY')
         print(f"Medicine ID {mid} restored.")
     except Exception as e:
         print("Error restoring medicine:", e)
@@ -704,10 +541,11 @@ def create_invoice():
         if not PHONE_RE.match(phone):
             print("Invalid phone format. Please enter digits, +, -, spaces or parentheses. Aborting.")
             return
-        cur.execute("INSERT INTO Customers(name, phone) VALUES(:1, :2)", (name, phone))
+        cid_var = cur.var(int)
+        cur.execute("INSERT INTO Customers(name, phone) VALUES(:1, :2) RETURNING customer_id INTO :3", (name, phone, cid_var))
         con.commit()
-        cur.execute("SELECT customer_id FROM Customers WHERE ROWID = (SELECT MAX(ROWID) FROM Customers)")
-        cid = cur.fetchone()[0]
+        notify_api('CUSTOMERS')
+        cid = cid_var.getvalue()[0]
         print("Guest customer id:", cid)
 
     items = []
@@ -733,7 +571,7 @@ def create_invoice():
         print("No items selected. Aborting invoice.")
         return
 
-    #Call stored procedure sp_place_order using SYS.ODCINUMBERLIST
+    #Call stored procedure sp_place_order_bulk using SYS.ODCINUMBERLIST
     try:
         # Get Oracle type for SYS.ODCINUMBERLIST
         odci_type = con.gettype("SYS.ODCINUMBERLIST")
@@ -747,8 +585,9 @@ def create_invoice():
 
         # Call the procedure
         try:
-            cur.callproc("sp_place_order", [cid, oracle_items, oracle_qtys])
+            cur.callproc("sp_place_order_bulk", [cid, oracle_items, oracle_qtys])
             con.commit()
+            notify_api('ORDERS', 'INVENTORY')
             print("Order placed successfully!")
         except cx_Oracle.DatabaseError as e:
             error_obj, = e.args
@@ -794,11 +633,13 @@ def view_orders():
 def daily_sales_summary():
     print("\n--- Daily Sales Summary (last 7 days) ---")
     cur.execute("""
-      SELECT TRUNC(order_date) sale_date, COUNT(*) orders, SUM(total_amount) total_sales, AVG(total_amount) avg_order
-      FROM Orders
-      WHERE order_date >= TRUNC(SYSDATE)-7
-      GROUP BY TRUNC(order_date)
-      ORDER BY TRUNC(order_date) DESC
+      SELECT sale_date, SUM(orders) orders, SUM(total_sales) total_sales,
+             SUM(total_sales) / NULLIF(SUM(orders), 0) avg_order
+      FROM Daily_Sales
+      WHERE sale_date >= TRUNC(SYSDATE)-7
+      GROUP BY sale_date
+      HAVING SUM(orders) > 0
+      ORDER BY sale_date DESC
     """)
     rows = cur.fetchall()
     if not rows:
@@ -809,6 +650,26 @@ def daily_sales_summary():
         print(f"{date_str} | Orders: {r[1]} | Sales: ₹{r[2]:.2f} | Avg order: ₹{r[3]:.2f}")
     time.sleep(1)
 
+def rebuild_sales_rollup():
+    print("Rebuilding Daily_Sales from Orders...")
+    for statement in migrations.REBUILD_SALES_ROLLUP:
+        cur.execute(statement)
+    rows = cur.rowcount
+    con.commit()
+    notify_api('ORDERS')
+    print(f"Daily sales rollup rebuilt ({rows} rows).\n")
+    time.sleep(1)
+
+def rebuild_supplier_stats():
+    print("Rebuilding Supplier_Stats from Medicines...")
+    for statement in migrations.REBUILD_SUPPLIER_STATS:
+        cur.execute(statement)
+    rows = cur.rowcount
+    con.commit()
+    notify_api('SUPPLIERS')
+    print(f"Supplier stats rebuilt ({rows} rows).\n")
+    time.sleep(1)
+
 # ---------- Supplier Management ----------
 def supplier_menu():
     while True:
@@ -852,7 +713,7 @@ def add_supplier():
         print("Invalid phone format. Please enter digits, +, -, spaces or parentheses. Aborting.")
         return
 
-    # check existing
+    # check existing (each predicate is a uq_suppliers_* index lookup)
     try:
         cur.execute("""
             SELECT supplier_id FROM Suppliers
@@ -871,7 +732,14 @@ def add_supplier():
     try:
         cur.execute("INSERT INTO Suppliers(name, contact_email, phone) VALUES(:1,:2,:3)", (name, email, phone))
         con.commit()
+        notify_api('SUPPLIERS')
         print("Supplier added.")
+    except cx_Oracle.IntegrityError as e:
+        con.rollback()
+        if "ORA-00001" in str(e):
+            print("Supplier already exists. Skipping insert.")
+        else:
+            print("Error:", e)
     except Exception as e:
         print("Error:", e)
 
@@ -885,10 +753,9 @@ def view_suppliers():
 def supplier_performance():
     print("\n--- Supplier Performance (group by supplier) ---")
     cur.execute("""
-      SELECT s.supplier_id, s.name, COUNT(m.medicine_id) meds_count, AVG(m.unit_price) avg_price, MAX(m.unit_price) max_price
-      FROM Suppliers s LEFT JOIN Medicines m ON s.supplier_id = m.supplier_id
-      GROUP BY s.supplier_id, s.name
-      HAVING COUNT(m.medicine_id) >= 0
+      SELECT s.supplier_id, s.name, NVL(st.meds_count, 0) meds_count,
+             st.price_sum / NULLIF(st.meds_count, 0) avg_price, st.max_price
+      FROM Suppliers s LEFT JOIN Supplier_Stats st ON st.supplier_id = s.supplier_id
       ORDER BY meds_count DESC
     """)
     rows = cur.fetchall()
@@ -952,8 +819,8 @@ def union_intersect_demo():
 
 def view_audit_log():
     print("\n--- Audit Log (recent 20) ---")
-    cur.execute("SELECT audit_id, action_by, action, object_name, details, action_time FROM Audit_Log ORDER BY action_time DESC")
-    rows = cur.fetchmany(20)
+    cur.execute("SELECT audit_id, action_by, action, object_name, details, action_time FROM Audit_Log ORDER BY action_time DESC, audit_id DESC FETCH FIRST 20 ROWS ONLY")
+    rows = cur.fetchall()
     for r in rows:
         print(f"{r[0]} | {r[1]} | {r[2]} | {r[3]} | {r[4]} | {r[5]}")
     time.sleep(1)
@@ -962,18 +829,16 @@ def view_audit_log():
 def maintenance_menu():
     while True:
         print("\n--- Maintenance & Admin ---")
-        print("1. Create Schema & Objects (tables, triggers, procs, views)")
+        print("1. Apply schema migrations (tables, triggers, procs, views)")
         print("2. Seed sample data")
         print("3. Recreate stored procedures / views / triggers")
         print("4. Cleanup (DROP many objects) - CAREFUL")
-        print("5. Back to Main")
+        print("5. Rebuild daily sales rollup")
+        print("6. Rebuild supplier stats")
+        print("7. Back to Main")
         ch = input("Enter choice: ").strip()
         if ch == "1":
-            setup_schema()
-            create_views()
-            setup_triggers()
-            create_stored_procedures()
-            print("Setup done.")
+            setup_schema(report_current=True)
         elif ch == "2":
             seed_data()
         elif ch == "3":
@@ -986,27 +851,17 @@ def maintenance_menu():
             if confirm == 'y':
                 cleanup_db()
         elif ch == "5":
+            rebuild_sales_rollup()
+        elif ch == "6":
+            rebuild_supplier_stats()
+        elif ch == "7":
             break
         else:
             print("Invalid choice")
 
 def cleanup_db():
     print("Dropping objects (attempt). This is destructive.")
-    stmts = [
-        "DROP TRIGGER trg_audit_medicines",
-        "DROP TRIGGER trg_audit_orders",
-        "DROP TRIGGER trg_med_before_ins",
-        "DROP PROCEDURE sp_place_order",
-        "DROP VIEW vw_inventory_summary",
-        "DROP TABLE Order_Items CASCADE CONSTRAINTS",
-        "DROP TABLE Orders CASCADE CONSTRAINTS",
-        "DROP TABLE Inventory CASCADE CONSTRAINTS",
-        "DROP TABLE Medicines CASCADE CONSTRAINTS",
-        "DROP TABLE Customers CASCADE CONSTRAINTS",
-        "DROP TABLE Suppliers CASCADE CONSTRAINTS",
-        "DROP TABLE Audit_Log CASCADE CONSTRAINTS"
-    ]
-    for s in stmts:
+    for s in migrations.DROP_STATEMENTS:
         try:
             try_execute(s)
             con.commit()
@@ -1048,12 +903,13 @@ def main_menu():
 # ---------- Start-up welcome and ensure minimal objects exist ----------
 def startup():
     print("Welcome to Pharmacy Management System.")
-    # Ensure schema created by default for convenience
-    setup_schema()
-    create_views()
-    create_stored_procedures()
-    setup_triggers()
-    seed_data()
+    # One version query when the schema is current; sample data only goes
+    # into a database that was just created
+    applied = setup_schema()
+    if applied is None:
+        print("Fix the migration error above, then apply it from Maintenance & Admin.")
+    elif 1 in applied:
+        seed_data()
     print("System ready. Launching main menu...\n")
     time.sleep(1)
     main_menu()
@@ -1,10 +1,23 @@
-from flask import Flask, jsonify, request
+from flask import Flask, jsonify, request, g, Response, stream_with_context
 from flask_cors import CORS
 import oracledb as cx_Oracle
 import os
+import io
+import base64
+import json
+import random
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
 from dotenv import load_dotenv
 from datetime import datetime, timedelta
 import re
+import catalog_import
+import migrations
+import expiry_report
 
 load_dotenv()
 
@@ -18,20 +31,129 @@ DB_HOST = os.getenv('DB_HOST', 'localhost')
 DB_PORT = os.getenv('DB_PORT', '1521')
 DB_SERVICE = os.getenv('DB_SERVICE', 'xepdb1')
 
+# Session pool configuration
+DB_POOL_MIN = int(os.getenv('DB_POOL_MIN', '2'))
+DB_POOL_MAX = int(os.getenv('DB_POOL_MAX', '10'))
+DB_POOL_INCREMENT = int(os.getenv('DB_POOL_INCREMENT', '1'))
+DB_POOL_WAIT_TIMEOUT = int(os.getenv('DB_POOL_WAIT_TIMEOUT', '5000'))  # milliseconds
+
+# List pagination: pages are opt-in per request (?paginate=true or ?after=...)
+# unless API_PAGINATE_LISTS=true, in which case ?paginate=false restores
+# the full, unpaginated listing.
+PAGINATE_LISTS = os.getenv('API_PAGINATE_LISTS', 'false').lower() == 'true'
+DEFAULT_PAGE_SIZE = int(os.getenv('API_PAGE_SIZE', '100'))
+MAX_PAGE_SIZE = 1000
+
+# Streaming listings (?stream=true): rows per fetch round trip and per chunk
+STREAM_ARRAYSIZE = int(os.getenv('API_STREAM_ARRAYSIZE', '500'))
+
+# Read-through response cache for catalog reads
+RESPONSE_CACHE_TTL = float(os.getenv('API_CACHE_TTL', '30'))  # seconds
+RESPONSE_CACHE_SIZE = int(os.getenv('API_CACHE_SIZE', '256'))  # entries
+
+# Order placement retries for deadlock (ORA-00060) and serialization (ORA-08177) failures
+ORDER_RETRY_ATTEMPTS = int(os.getenv('ORDER_RETRY_ATTEMPTS', '3'))
+ORDER_RETRY_BACKOFF_MS = int(os.getenv('ORDER_RETRY_BACKOFF_MS', '50'))
+RETRYABLE_ORDER_ERRORS = ('ORA-00060', 'ORA-08177')
+
+# Stock holds (cart reservations): default and maximum lifetime, sweep interval
+HOLD_TTL_SECONDS = int(os.getenv('HOLD_TTL_SECONDS', '600'))
+HOLD_MAX_TTL_SECONDS = int(os.getenv('HOLD_MAX_TTL_SECONDS', '3600'))
+HOLD_SWEEP_INTERVAL = int(os.getenv('HOLD_SWEEP_INTERVAL', '30'))  # seconds
+
+# Worker threads for the dashboard's concurrent report queries; each holds
+# one pooled session while its query runs
+REPORT_WORKERS = int(os.getenv('API_REPORT_WORKERS', '5'))
+
+# Row counts for /api/stats and /api/health are cached this long (seconds)
+STATS_CACHE_TTL = float(os.getenv('API_STATS_TTL', '60'))
+
+# Apply pending schema migrations when the server starts
+AUTO_MIGRATE = os.getenv('API_AUTO_MIGRATE', 'true').lower() == 'true'
+
+# Default horizon (days) for /api/inventory/expiring
+EXPIRY_HORIZON_DAYS = int(os.getenv('API_EXPIRY_HORIZON_DAYS', '90'))
+
 # Validation patterns
 EMAIL_RE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
 PHONE_RE = re.compile(r"^[\d\+\-\s\(\)]{7,25}$")
 
+_report_executor = ThreadPoolExecutor(max_workers=REPORT_WORKERS, thread_name_prefix='report')
+
+_pool = None
+_pool_lock = threading.Lock()
+_pool_stats = {
+    'acquires': 0,
+    'timeouts': 0,
+    'errors': 0,
+    'total_wait_ms': 0.0,
+    'max_wait_ms': 0.0
+}
+
+def get_pool():
+    """Create the process-wide session pool on first use and return it"""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                dsn = cx_Oracle.makedsn(DB_HOST, DB_PORT, service_name=DB_SERVICE)
+                _pool = cx_Oracle.create_pool(
+                    user=DB_USER,
+                    password=DB_PASS,
+                    dsn=dsn,
+                    min=DB_POOL_MIN,
+                    max=DB_POOL_MAX,
+                    increment=DB_POOL_INCREMENT,
+                    getmode=cx_Oracle.POOL_GETMODE_TIMEDWAIT,
+                    wait_timeout=DB_POOL_WAIT_TIMEOUT
+                )
+    return _pool
+
+def acquire_connection():
+    """Borrow a session from the pool, recording the wait for /api/admin/pool-stats.
+
+    Raises if none can be had; background work uses it directly, routes
+    go through get_db_connection().
+    """
+    start = time.perf_counter()
+    try:
+        connection = get_pool().acquire()
+    except Exception as e:
+        with _pool_lock:
+            if "DPY-4005" in str(e):
+                _pool_stats['timeouts'] += 1
+            else:
+                _pool_stats['errors'] += 1
+        raise
+
+    waited_ms = (time.perf_counter() - start) * 1000
+    with _pool_lock:
+        _pool_stats['acquires'] += 1
+        _pool_stats['total_wait_ms'] += waited_ms
+        _pool_stats['max_wait_ms'] = max(_pool_stats['max_wait_ms'], waited_ms)
+    return connection
+
 def get_db_connection():
-    """Create and return a database connection"""
+    """Borrow a session from the pool (conn.close() gives it back)"""
     try:
-        dsn = cx_Oracle.makedsn(DB_HOST, DB_PORT, service_name=DB_SERVICE)
-        connection = cx_Oracle.connect(user=DB_USER, password=DB_PASS, dsn=dsn)
-        return connection
+        connection = acquire_connection()
     except Exception as e:
         print(f"Database connection error: {e}")
         return None
 
+    # Remember the session so it is released even if a route returns early
+    g.setdefault('db_connections', []).append(connection)
+    return connection
+
+@app.teardown_appcontext
+def release_db_connections(exc):
+    """Give back any pooled sessions a route did not close itself"""
+    for connection in g.pop('db_connections', []):
+        try:
+            connection.close()
+        except cx_Oracle.InterfaceError:
+            pass  # already released by the route
+
 def try_execute(cursor, sql, binds=None, silent_on_exists=False):
     """Helper function to execute SQL safely"""
     try:
@@ -48,11 +170,347 @@ def try_execute(cursor, sql, binds=None, silent_on_exists=False):
             print(f"SQL Error: {e}")
             return False
 
+_schema_caps = None
+_schema_caps_lock = threading.Lock()
+
+def get_schema_capabilities(cursor):
+    """Return the cached schema capabilities, introspecting them on first use.
+
+    Holds the columns of every table, plus the views and procedures present,
+    so routes can pick SQL variants without a data-dictionary round trip.
+    """
+    global _schema_caps
+    if _schema_caps is None:
+        with _schema_caps_lock:
+            if _schema_caps is None:
+                caps = {'columns': {}, 'views': set(), 'procedures': set()}
+
+                cursor.execute("SELECT table_name, column_name FROM user_tab_columns")
+                for table_name, column_name in cursor.fetchall():
+                    caps['columns'].setdefault(table_name, set()).add(column_name)
+
+                cursor.execute("SELECT view_name FROM user_views")
+                caps['views'] = {row[0] for row in cursor.fetchall()}
+
+                cursor.execute("""
+                    SELECT object_name FROM user_procedures
+                    WHERE object_type = 'PROCEDURE'
+                """)
+                caps['procedures'] = {row[0] for row in cursor.fetchall()}
+
+                _schema_caps = caps
+    return _schema_caps
+
+def has_column(cursor, table_name, column_name):
+    """Check the cached capabilities for TABLE.COLUMN (names in upper case)"""
+    columns = get_schema_capabilities(cursor)['columns'].get(table_name, set())
+    return column_name in columns
+
+def invalidate_schema_capabilities():
+    """Drop the cached capabilities; the next request re-introspects"""
+    global _schema_caps
+    with _schema_caps_lock:
+        _schema_caps = None
+
+_migration_error = None  # why a required migration failed, for /api/health/ready
+_deferred_migrations = {}  # {version: reason} for optional ones, for /api/admin/migrations
+
+def record_migration_result(deferred, error=None):
+    """Keep the outcome of a migration run for the readiness probe and the admin routes.
+
+    Only a failure up to migrations.REQUIRED_VERSION makes the API unready;
+    later migrations are reported alongside the deferred ones.
+    """
+    global _migration_error, _deferred_migrations
+    if isinstance(error, migrations.MigrationError) and error.version > migrations.REQUIRED_VERSION:
+        deferred[error.version] = str(error)
+        error = None
+    _migration_error = str(error) if error else None
+    _deferred_migrations = deferred
+
+def migrate_schema():
+    """Apply pending migrations at startup; one version query if current"""
+    deferred = {}
+    try:
+        with acquire_connection() as conn:
+            applied = migrations.migrate(conn, log=print, deferred=deferred)
+        record_migration_result(deferred)
+        if applied:
+            invalidate_schema_capabilities()
+    except Exception as e:
+        record_migration_result(deferred, e)
+        invalidate_schema_capabilities()
+        print(f"Could not migrate the schema at startup: {e}")
+
+def warm_schema_capabilities():
+    """Introspect the schema once at startup so the first request skips it"""
+    try:
+        with acquire_connection() as conn:
+            get_schema_capabilities(conn.cursor())
+    except Exception as e:
+        print(f"Could not load schema capabilities at startup: {e}")
+
+def encode_cursor(values):
+    """Pack the sort key of the last row of a page into an opaque token"""
+    raw = json.dumps(values, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+def decode_cursor(token, key_types):
+    """Unpack a token from encode_cursor(), converting each key part.
+
+    Raises ValueError if the token was not produced for this key shape.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(token + '=' * (-len(token) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(key_types):
+            raise ValueError('cursor does not match this listing')
+        return [convert(v) for convert, v in zip(key_types, values)]
+    except (TypeError, json.JSONDecodeError, UnicodeDecodeError, base64.binascii.Error) as e:
+        raise ValueError(str(e))
+
+def cursor_datetime(value):
+    """Key converter for DATE sort columns stored in a cursor"""
+    return datetime.strptime(value, '%Y-%m-%d %H:%M:%S')
+
+def cursor_timestamp(value):
+    """Key converter for TIMESTAMP sort columns; kept as text for TO_TIMESTAMP"""
+    datetime.strptime(value, '%Y-%m-%d %H:%M:%S.%f')
+    return value
+
+def parse_time_arg(name):
+    """Read an ISO date/datetime query arg as TO_TIMESTAMP text, or None"""
+    value = request.args.get(name)
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value).strftime('%Y-%m-%d %H:%M:%S.%f')
+    except ValueError:
+        raise ValueError(f"{name} must be an ISO date or datetime")
+
+def get_page_args(key_types, default_limit=None):
+    """Return (limit, after_key) if this request is paginated, else None.
+
+    after_key is None for the first page. Raises ValueError for a bad cursor.
+    """
+    after = request.args.get('after')
+    paginate = request.args.get('paginate')
+    if paginate is None:
+        paginated = PAGINATE_LISTS or after is not None
+    else:
+        paginated = paginate.lower() == 'true'
+    if not paginated:
+        return None
+
+    limit = request.args.get('limit', default_limit or DEFAULT_PAGE_SIZE, type=int)
+    limit = max(1, min(limit, MAX_PAGE_SIZE))
+    return limit, decode_cursor(after, key_types) if after else None
+
+def page_response(items, next_key):
+    """Wrap one page of a listing together with the cursor for the next"""
+    return jsonify({
+        'items': items,
+        'next': encode_cursor(next_key) if next_key else None
+    })
+
+def wants_stream(page):
+    """True if the client asked for a streamed (unpaginated) listing"""
+    return page is None and request.args.get('stream', 'false').lower() == 'true'
+
+def prepare_stream_cursor(cursor):
+    """Size fetches for streaming so rows arrive in a few large batches"""
+    cursor.arraysize = STREAM_ARRAYSIZE
+    cursor.prefetchrows = STREAM_ARRAYSIZE
+
+def stream_json_response(conn, cursor, items):
+    """Send an iterator of dicts as a JSON array, one chunk per fetch batch.
+
+    The first chunk goes out before the last row is fetched, and only one
+    batch is held in memory. The pooled session stays checked out until
+    the stream ends.
+    """
+    # Teardown runs as soon as the view returns, so the generator, not the
+    # request, is now responsible for giving the session back
+    g.db_connections = [c for c in g.get('db_connections', []) if c is not conn]
+    
+    def generate():
+        try:
+            prefix = '['
+            chunk = []
+            for item in items:
+                chunk.append(app.json.dumps(item))
+                if len(chunk) >= STREAM_ARRAYSIZE:
+                    yield prefix + ','.join(chunk)
+                    prefix = ','
+                    chunk = []
+            if chunk:
+                yield prefix + ','.join(chunk)
+                prefix = ','
+            yield '[]' if prefix == '[' else ']'
+        finally:
+            cursor.close()
+            conn.close()
+
+    return Response(stream_with_context(generate()), mimetype='application/json')
+
+_response_cache = OrderedDict()  # key -> (expires_at, tables, body, mimetype)
+_response_cache_lock = threading.Lock()
+_response_cache_stats = {'hits': 0, 'misses': 0, 'evictions': 0, 'invalidations': 0}
+_table_versions = {}  # TABLE -> change counter, bumped by every write path
+
+# Part of every ETag, so tags issued before a restart never match again
+_etag_epoch = format(int(time.time() * 1000), 'x')
+
+def get_table_versions(tables):
+    """Current change counters for the given tables"""
+    with _response_cache_lock:
+        return tuple(_table_versions.get(t, 0) for t in tables)
+
+def make_etag(versions):
+    """Weak ETag value from change counters; shared with the async app"""
+    return _etag_epoch + '-' + '.'.join(str(v) for v in versions)
+
+def bump_table_versions(*tables):
+    """Record that the given tables changed and drop cached reads of them"""
+    with _response_cache_lock:
+        for t in tables:
+            _table_versions[t] = _table_versions.get(t, 0) + 1
+        stale = [k for k, v in _response_cache.items() if v[1] & set(tables)]
+        for k in stale:
+            del _response_cache[k]
+        _response_cache_stats['invalidations'] += len(stale)
+
+def cached_response(*tables):
+    """Serve a GET route from an in-process TTL/LRU cache.
+
+    Entries are keyed by path and query args and dropped as soon as a write
+    path bumps one of `tables`. Only plain 200 responses are cached.
+    """
+    table_set = frozenset(tables)
+    
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            key = (request.path, tuple(sorted(request.args.items(multi=True))))
+            now = time.monotonic()
+            with _response_cache_lock:
+                entry = _response_cache.get(key)
+                if entry and entry[0] > now:
+                    _response_cache.move_to_end(key)
+                    _response_cache_stats['hits'] += 1
+                    return Response(entry[2], mimetype=entry[3])
+                _response_cache_stats['misses'] += 1
+            versions = get_table_versions(tables)
+            
+            response = app.make_response(view(*args, **kwargs))
+            if response.status_code != 200 or response.is_streamed:
+                return response
+            
+            with _response_cache_lock:
+                # Skip storing if a write landed while the query ran
+                if versions == tuple(_table_versions.get(t, 0) for t in tables):
+                    _response_cache[key] = (now + RESPONSE_CACHE_TTL, table_set,
+                                            response.get_data(), response.mimetype)
+                    _response_cache.move_to_end(key)
+                    while len(_response_cache) > RESPONSE_CACHE_SIZE:
+                        _response_cache.popitem(last=False)
+                        _response_cache_stats['evictions'] += 1
+            return response
+        return wrapper
+    return decorator
+
+def etag_response(*tables):
+    """Tag a GET route with the change counters of `tables`.
+
+    A request whose If-None-Match carries the current tag gets
+    304 Not Modified without the view (or its query) running. Writers
+    outside this process report through /api/admin/cache/invalidate.
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            # Read the counters before the query, so a write that lands
+            # mid-query makes the next request miss rather than hit
+            etag = make_etag(get_table_versions(tables))
+            
+            if request.if_none_match.contains_weak(etag):
+                response = Response(status=304)
+            else:
+                response = app.make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag, weak=True)
+            # Let browsers keep the body but revalidate on every use
+            response.headers['Cache-Control'] = 'no-cache'
+            return response
+        return wrapper
+    return decorator
+
 # ==================== INVENTORY ROUTES ====================
 
+def format_inventory_row(columns, row):
+    """Turn one inventory query row into its JSON shape"""
+    item = dict(zip(columns, row))
+    if item.get('expiry_date') and item['expiry_date'] is not None:
+        try:
+            item['expiry_date'] = item['expiry_date'].strftime('%Y-%m-%d')
+        except:
+            item['expiry_date'] = str(item['expiry_date'])
+    else:
+        item['expiry_date'] = None
+    
+    if item.get('unit_price') is not None:
+        item['unit_price'] = float(item['unit_price'])
+    if item.get('qty') is not None:
+        item['qty'] = int(item['qty'])
+    return item
+
+def inventory_query(has_is_active, include_inactive=False, after_id=None, limit=None):
+    """SQL and binds for the inventory listing.
+
+    With a limit, returns one page (plus one look-ahead row) in medicine_id
+    order after after_id; without one, the whole listing. Shared with the
+    async app.
+    """
+    conditions = []
+    binds = {}
+    if has_is_active and not include_inactive:
+        conditions.append("NVL(m.is_active,'Y') = 'Y'")
+    if after_id is not None:
+        conditions.append("m.medicine_id > :after_id")
+        binds['after_id'] = after_id
+    
+    query = f"""
+        SELECT m.medicine_id, 
+               NVL(m.name,'') AS name,
+               NVL(m.pharma_form,'') AS pharma_form,
+               NVL(m.strength,'') AS strength,
+               NVL(m.unit_price,0) AS unit_price,
+               NVL(i.qty,0) AS qty,
+               m.expiry_date,
+               {"NVL(m.is_active,'Y')" if has_is_active else "'Y'"} AS is_active,
+               m.supplier_id
+        FROM Medicines m 
+        LEFT JOIN Inventory i ON m.medicine_id = i.medicine_id
+    """
+    if conditions:
+        query += " WHERE " + " AND ".join(conditions)
+    if limit:
+        # One extra row tells us whether another page follows
+        query += " ORDER BY m.medicine_id FETCH FIRST :fetch_rows ROWS ONLY"
+        binds['fetch_rows'] = limit + 1
+    return query, binds
+
 @app.route('/api/inventory', methods=['GET'])
+@etag_response('MEDICINES', 'INVENTORY')
+@cached_response('MEDICINES', 'INVENTORY')
 def get_inventory():
-    """Get all inventory items"""
+    """Get all inventory items (keyset-paginated on medicine_id on request)"""
+    try:
+        page = get_page_args((int,))
+    except ValueError:
+        return jsonify({'error': 'Invalid pagination cursor'}), 400
+    
     conn = get_db_connection()
     if not conn:
         return jsonify({'error': 'Database connection failed'}), 500
@@ -62,86 +520,36 @@ def get_inventory():
         cursor = conn.cursor()
         include_inactive = request.args.get('include_inactive', 'false').lower() == 'true'
         
-        # Check if is_active column exists
-        has_is_active = False
-        try:
-            cursor.execute("""
-                SELECT column_name 
-                FROM user_tab_columns 
-                WHERE table_name = 'MEDICINES' 
-                AND column_name = 'IS_ACTIVE'
-            """)
-            has_is_active = cursor.fetchone() is not None
-        except:
-            pass
-        
-        # Build query based on whether is_active exists
-        if has_is_active and include_inactive:
-            query = """
-                SELECT m.medicine_id, 
-                       NVL(m.name,'') AS name,
-                       NVL(m.pharma_form,'') AS pharma_form,
-                       NVL(m.strength,'') AS strength,
-                       NVL(m.unit_price,0) AS unit_price,
-                       NVL(i.qty,0) AS qty,
-                       m.expiry_date,
-                       NVL(m.is_active,'Y') AS is_active,
-                       m.supplier_id
-                FROM Medicines m 
-                LEFT JOIN Inventory i ON m.medicine_id = i.medicine_id
-            """
-        elif has_is_active:
-            query = """
-                SELECT m.medicine_id, 
-                       NVL(m.name,'') AS name,
-                       NVL(m.pharma_form,'') AS pharma_form,
-                       NVL(m.strength,'') AS strength,
-                       NVL(m.unit_price,0) AS unit_price,
-                       NVL(i.qty,0) AS qty,
-                       m.expiry_date,
-                       NVL(m.is_active,'Y') AS is_active,
-                       m.supplier_id
-                FROM Medicines m 
-                LEFT JOIN Inventory i ON m.medicine_id = i.medicine_id
-                WHERE NVL(m.is_active,'Y') = 'Y'
-            """
-        else:
-            query = """
-                SELECT m.medicine_id, 
-                       NVL(m.name,'') AS name,
-                       NVL(m.pharma_form,'') AS pharma_form,
-                       NVL(m.strength,'') AS strength,
-                       NVL(m.unit_price,0) AS unit_price,
-                       NVL(i.qty,0) AS qty,
-                       m.expiry_date,
-                       'Y' AS is_active,
-                       m.supplier_id
-                FROM Medicines m 
-                LEFT JOIN Inventory i ON m.medicine_id = i.medicine_id
-            """
-        cursor.execute(query)
+        # Schema capabilities are cached, so this costs no extra round trip
+        has_is_active = has_column(cursor, 'MEDICINES', 'IS_ACTIVE')
+        
+        query, binds = inventory_query(has_is_active, include_inactive,
+                                       page[1][0] if page and page[1] else None,
+                                       page[0] if page else None)
+        
+        stream = wants_stream(page)
+        if stream:
+            prepare_stream_cursor(cursor)
+        cursor.execute(query, binds)
         
         columns = [col[0].lower() for col in cursor.description]
+        if stream:
+            response = stream_json_response(
+                conn, cursor, (format_inventory_row(columns, row) for row in cursor))
+            # The stream releases the session; keep finally from closing it now
+            cursor = conn = None
+            return response
         rows = cursor.fetchall()
         
-        inventory = []
-        for row in rows:
-            item = dict(zip(columns, row))
-            if item.get('expiry_date') and item['expiry_date'] is not None:
-                try:
-                    item['expiry_date'] = item['expiry_date'].strftime('%Y-%m-%d')
-                except:
-                    item['expiry_date'] = str(item['expiry_date'])
-            else:
-                item['expiry_date'] = None
-            
-            if item.get('unit_price') is not None:
-                item['unit_price'] = float(item['unit_price'])
-            if item.get('qty') is not None:
-                item['qty'] = int(item['qty'])
-                
-            inventory.append(item)
+        next_key = None
+        if page and len(rows) > page[0]:
+            rows = rows[:page[0]]
+            next_key = [rows[-1][0]]
         
+        inventory = [format_inventory_row(columns, row) for row in rows]
+        
+        if page:
+            return page_response(inventory, next_key)
         return jsonify(inventory)
     except Exception as e:
         print(f"Error in get_inventory: {str(e)}")
@@ -154,6 +562,17 @@ def get_inventory():
         if conn:
             conn.close()
 
+def low_stock_query():
+    """SQL and binds for items at or below their reorder threshold. Shared with the async app."""
+    query = """
+        SELECT m.medicine_id, m.name, i.qty, i.min_threshold
+        FROM Inventory i 
+        JOIN Medicines m ON i.medicine_id = m.medicine_id
+        WHERE NVL(i.qty,0) <= NVL(i.min_threshold,10)
+        ORDER BY i.qty ASC
+    """
+    return query, {}
+
 @app.route('/api/inventory/low-stock', methods=['GET'])
 def get_low_stock():
     """Get low stock items"""
@@ -163,14 +582,8 @@ def get_low_stock():
     
     try:
         cursor = conn.cursor()
-        query = """
-            SELECT m.medicine_id, m.name, i.qty, i.min_threshold
-            FROM Inventory i 
-            JOIN Medicines m ON i.medicine_id = m.medicine_id
-            WHERE NVL(i.qty,0) <= NVL(i.min_threshold,10)
-            ORDER BY i.qty ASC
-        """
-        cursor.execute(query)
+        query, binds = low_stock_query()
+        cursor.execute(query, binds)
         columns = [col[0].lower() for col in cursor.description]
         rows = cursor.fetchall()
         
@@ -184,47 +597,61 @@ def get_low_stock():
 
 @app.route('/api/inventory/expiring', methods=['GET'])
 def get_expiring_medicines():
-    """Get expired and near-expiry medicines"""
+    """Get expired and near-expiry medicines, bucketed by days to expiry.
+
+    ?days= sets the horizon (default 90, at most EXPIRY_MAX_HORIZON_DAYS).
+    Each bucket reports the stock quantity and value at risk;
+    expired/near_expiry list the medicines.
+    """
+    try:
+        days = int(request.args.get('days', EXPIRY_HORIZON_DAYS))
+    except ValueError:
+        days = -1
+    if not 0 <= days <= expiry_report.EXPIRY_MAX_HORIZON_DAYS:
+        return jsonify({'error': f'days must be an integer from 0 to {expiry_report.EXPIRY_MAX_HORIZON_DAYS}'}), 400
+    
     conn = get_db_connection()
     if not conn:
         return jsonify({'error': 'Database connection failed'}), 500
     
     try:
         cursor = conn.cursor()
+        query, binds = expiry_report.expiring_query(days)
+        cursor.execute(query, binds)
         
-        # Get expired medicines
-        cursor.execute("""
-            SELECT medicine_id, name, expiry_date 
-            FROM Medicines 
-            WHERE expiry_date < TRUNC(SYSDATE)
-        """)
         expired = []
-        for row in cursor.fetchall():
-            expired.append({
-                'medicine_id': row[0],
-                'name': row[1],
-                'expiry_date': row[2].strftime('%Y-%m-%d') if row[2] else None
-            })
-        
-        # Get near-expiry medicines (within 90 days)
-        cursor.execute("""
-            SELECT medicine_id, name, expiry_date 
-            FROM Medicines 
-            WHERE expiry_date BETWEEN TRUNC(SYSDATE) AND TRUNC(SYSDATE)+90
-        """)
         near_expiry = []
+        # Every bucket up to the horizon is reported, even when empty
+        buckets = {bucket['label']: dict(bucket, medicines=0, qty=0, value_at_risk=0.0)
+                   for bucket in expiry_report.all_buckets(days)}
         for row in cursor.fetchall():
-            near_expiry.append({
+            days_left = int(row[3])
+            qty = row[4]
+            value = float(row[4] * row[5])
+            medicine = {
                 'medicine_id': row[0],
                 'name': row[1],
-                'expiry_date': row[2].strftime('%Y-%m-%d') if row[2] else None
-            })
+                'expiry_date': row[2].strftime('%Y-%m-%d') if row[2] else None,
+                'days_left': days_left,
+                'qty': qty,
+                'value_at_risk': value
+            }
+            (expired if days_left < 0 else near_expiry).append(medicine)
+            
+            totals = buckets[expiry_report.expiry_bucket(days_left, days)['label']]
+            totals['medicines'] += 1
+            totals['qty'] += qty
+            totals['value_at_risk'] += value
         
         cursor.close()
         conn.close()
         return jsonify({
+            'days': days,
+            'buckets': list(buckets.values()),
             'expired': expired,
-            'near_expiry': near_expiry
+            'near_expiry': near_expiry,
+            'total_qty': sum(b['qty'] for b in buckets.values()),
+            'total_value_at_risk': sum(b['value_at_risk'] for b in buckets.values())
         })
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -240,40 +667,17 @@ def add_medicine():
     try:
         cursor = conn.cursor()
         
-        # Check for duplicates
-        cursor.execute("""
-            SELECT medicine_id FROM Medicines
-            WHERE LOWER(name)=LOWER(:1)
-              AND LOWER(pharma_form)=LOWER(:2)
-              AND LOWER(strength)=LOWER(:3)
-              AND TO_CHAR(expiry_date,'YYYY-MM-DD')=:4
-        """, (data['name'], data['form'], data['strength'], data['expiry_date']))
-        
-        if cursor.fetchone():
-            cursor.close()
-            conn.close()
-            return jsonify({'error': 'Medicine already exists'}), 400
-        
-        # Insert medicine
+        # Insert medicine and get its ID back in the same round trip;
+        # duplicates are rejected by uq_medicines_dedupe
+        medicine_id_var = cursor.var(int)
         cursor.execute("""
             INSERT INTO Medicines (name, pharma_form, strength, unit_price, supplier_id, expiry_date)
             VALUES (:1, :2, :3, :4, :5, TO_DATE(:6,'YYYY-MM-DD'))
+            RETURNING medicine_id INTO :7
         """, (data['name'], data['form'], data['strength'], 
-              data.get('price', 0), data.get('supplier_id'), data['expiry_date']))
-        
-        conn.commit()
-        
-        # Get the new medicine ID
-        cursor.execute("""
-            SELECT medicine_id FROM Medicines
-            WHERE LOWER(name)=LOWER(:1)
-              AND LOWER(pharma_form)=LOWER(:2)
-              AND LOWER(strength)=LOWER(:3)
-              AND TO_CHAR(expiry_date,'YYYY-MM-DD')=:4
-            ORDER BY medicine_id DESC FETCH FIRST 1 ROWS ONLY
-        """, (data['name'], data['form'], data['strength'], data['expiry_date']))
+              data.get('price', 0), data.get('supplier_id'), data['expiry_date'], medicine_id_var))
         
-        medicine_id = cursor.fetchone()[0]
+        medicine_id = medicine_id_var.getvalue()[0]
         
         # Insert into inventory
         cursor.execute("""
@@ -281,11 +685,18 @@ def add_medicine():
             VALUES (:1, :2, :3)
         """, (medicine_id, data.get('quantity', 0), 10))
         
+        # Medicine and its inventory row become visible together
         conn.commit()
+        bump_table_versions('MEDICINES', 'INVENTORY')
         cursor.close()
         conn.close()
         
         return jsonify({'message': 'Medicine added successfully', 'medicine_id': medicine_id}), 201
+    except cx_Oracle.IntegrityError as e:
+        conn.rollback()
+        if "ORA-00001" in str(e):
+            return jsonify({'error': 'Medicine already exists'}), 400
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         if conn:
             conn.rollback()
@@ -320,6 +731,7 @@ def update_stock():
         """, (data['medicine_id'], data['quantity']))
         
         conn.commit()
+        bump_table_versions('INVENTORY')
         cursor.close()
         conn.close()
         
@@ -329,6 +741,115 @@ def update_stock():
             conn.rollback()
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/inventory/stock/batch', methods=['PUT'])
+def update_stock_batch():
+    """Apply many stock adjustments in one transaction.
+
+    Body: {"adjustments": [{"medicine_id": 1, "quantity": 25}, ...]}.
+    Rows are upserted with one array MERGE and audited with one array
+    INSERT; rows the database rejects are reported individually and the
+    rest are committed.
+    """
+    data = request.json or {}
+    adjustments = data.get('adjustments')
+    if not isinstance(adjustments, list) or not adjustments:
+        return jsonify({'error': 'adjustments must be a non-empty list'}), 400
+
+    try:
+        rows = [(int(a['medicine_id']), int(a['quantity'])) for a in adjustments]
+    except (KeyError, TypeError, ValueError):
+        return jsonify({'error': 'Each adjustment needs integer medicine_id and quantity'}), 400
+
+    conn = get_db_connection()
+    if not conn:
+        return jsonify({'error': 'Database connection failed'}), 500
+
+    try:
+        cursor = conn.cursor()
+
+        # Update existing rows and create missing ones in a single array DML call
+        cursor.executemany("""
+            MERGE INTO Inventory i
+            USING (SELECT :1 AS medicine_id, :2 AS delta FROM dual) s
+            ON (i.medicine_id = s.medicine_id)
+            WHEN MATCHED THEN
+                UPDATE SET i.qty = NVL(i.qty,0) + s.delta
+            WHEN NOT MATCHED THEN
+                INSERT (medicine_id, qty, min_threshold)
+                VALUES (s.medicine_id, s.delta, 10)
+        """, rows, batcherrors=True)
+
+        errors = {err.offset: err.message for err in cursor.getbatcherrors()}
+        applied = [row for offset, row in enumerate(rows) if offset not in errors]
+
+        if applied:
+            cursor.executemany("""
+                INSERT INTO Audit_Log(action_by, action, object_name, details)
+                VALUES(USER,'UPDATE','INVENTORY','Medicine '||:1||' qty change '||:2)
+            """, applied)
+
+        conn.commit()
+        if applied:
+            bump_table_versions('INVENTORY')
+        cursor.close()
+        conn.close()
+
+        results = []
+        for offset, (medicine_id, quantity) in enumerate(rows):
+            result = {'medicine_id': medicine_id, 'quantity': quantity}
+            if offset in errors:
+                result['status'] = 'error'
+                result['error'] = errors[offset]
+            else:
+                result['status'] = 'ok'
+            results.append(result)
+
+        return jsonify({
+            'message': f'{len(applied)} of {len(rows)} stock adjustments applied',
+            'applied': len(applied),
+            'failed': len(errors),
+            'results': results
+        })
+    except Exception as e:
+        if conn:
+            conn.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/inventory/import', methods=['POST'])
+def import_medicines():
+    """Bulk import a medicine catalog from CSV or NDJSON.
+
+    Send the file as multipart field "file" or as the raw request body;
+    ?format=csv|ndjson overrides detection from the file name/content type.
+    The upload is parsed as it is read and inserted in array-DML batches.
+    """
+    if 'file' in request.files:
+        upload = request.files['file']
+        stream = upload.stream
+        fmt = request.args.get('format') or catalog_import.detect_format(upload.filename, upload.mimetype)
+    else:
+        stream = request.stream
+        fmt = request.args.get('format') or catalog_import.detect_format(None, request.mimetype)
+    if fmt not in ('csv', 'ndjson'):
+        return jsonify({'error': 'format must be csv or ndjson'}), 400
+
+    conn = get_db_connection()
+    if not conn:
+        return jsonify({'error': 'Database connection failed'}), 500
+
+    try:
+        text_stream = io.TextIOWrapper(stream, encoding='utf-8', newline='')
+        report = catalog_import.import_catalog(conn, text_stream, fmt)
+        conn.close()
+        return jsonify(dict(report, message=f"{report['inserted']} medicines imported")), 200
+    except Exception as e:
+        if conn:
+            conn.rollback()
+        return jsonify({'error': str(e)}), 500
+    finally:
+        # Earlier batches may have committed even if a later one failed
+        bump_table_versions('MEDICINES', 'INVENTORY')
+
 @app.route('/api/inventory/retire/<int:medicine_id>', methods=['PUT'])
 def retire_medicine(medicine_id):
     """Retire a medicine (mark as inactive)"""
@@ -344,6 +865,10 @@ def retire_medicine(medicine_id):
         if not cursor.fetchone():
             return jsonify({'error': 'Medicine not found'}), 404
         
+        # Drop its holds first, so expiring holds cannot restock it later
+        if 'STOCK_HOLDS' in get_schema_capabilities(cursor)['columns']:
+            release_holds(cursor, "medicine_id = :medicine_id", {'medicine_id': medicine_id})
+        
         # Zero inventory
         cursor.execute("UPDATE Inventory SET qty = 0 WHERE medicine_id = :1", (medicine_id,))
         
@@ -361,6 +886,7 @@ def retire_medicine(medicine_id):
         """, (medicine_id,))
         
         conn.commit()
+        bump_table_versions('MEDICINES', 'INVENTORY')
         cursor.close()
         conn.close()
         
@@ -395,6 +921,7 @@ def restore_medicine(medicine_id):
         """, (medicine_id,))
         
         conn.commit()
+        bump_table_versions('MEDICINES')
         cursor.close()
         conn.close()
         
@@ -406,60 +933,170 @@ def restore_medicine(medicine_id):
 
 # ==================== ORDERS ROUTES ====================
 
+def group_order_rows(rows):
+    """Fold order+item join rows into orders, yielding (order, sort_key).
+
+    Rows must arrive grouped by order; each order is yielded once its
+    last item row has been seen, so this works on a streaming cursor.
+    """
+    order = None
+    order_key = None
+    for row in rows:
+        if order is None or order['order_id'] != row[0]:
+            if order is not None:
+                yield order, order_key
+            order = {
+                'order_id': row[0],
+                'order_date': row[1].strftime('%Y-%m-%d') if row[1] else row[1],
+                'customer_name': row[2],
+                'total_amount': row[3],
+                'status': row[4],
+                'customer_id': row[5],
+                'items': []
+            }
+            order_key = (row[1], row[0])
+        
+        if row[6] is not None:
+            order['items'].append({
+                'medicine_id': row[6],
+                'medicine_name': row[7],
+                'quantity': row[8],
+                'unit_price': float(row[9]) if row[9] else 0,
+                'line_total': float(row[10]) if row[10] else 0
+            })
+    if order is not None:
+        yield order, order_key
+
+def orders_query(after_key=None, limit=None):
+    """SQL and binds for orders joined with their items, newest first.
+
+    With a limit, only that many orders (plus one look-ahead) after the
+    (order_date, order_id) after_key are joined. Shared with the async app.
+    """
+    binds = {}
+    orders_source = "Orders"
+    if limit:
+        # Pick the page of orders first so the limit counts orders, not items
+        after_clause = ""
+        if after_key:
+            after_clause = """
+                WHERE order_date < :after_date
+                   OR (order_date = :after_date AND order_id < :after_id)
+            """
+            binds['after_date'], binds['after_id'] = after_key
+        orders_source = f"""(
+            SELECT order_id, order_date, customer_id, total_amount, status
+            FROM Orders
+            {after_clause}
+            ORDER BY order_date DESC, order_id DESC
+            FETCH FIRST :fetch_rows ROWS ONLY
+        )"""
+        binds['fetch_rows'] = limit + 1
+    
+    query = f"""
+        SELECT o.order_id, o.order_date, c.name as customer_name, 
+               o.total_amount, o.status, o.customer_id,
+               it.medicine_id, it.medicine_name,
+               it.quantity, it.unit_price, it.line_total
+        FROM {orders_source} o 
+        LEFT JOIN Customers c ON o.customer_id = c.customer_id
+        LEFT JOIN (
+            SELECT oi.order_id, oi.order_item_id, oi.medicine_id,
+                   m.name as medicine_name,
+                   oi.quantity, oi.unit_price, oi.line_total
+            FROM Order_Items oi
+            JOIN Medicines m ON oi.medicine_id = m.medicine_id
+        ) it ON it.order_id = o.order_id
+        ORDER BY o.order_date DESC, o.order_id DESC, it.order_item_id
+    """
+    return query, binds
+
 @app.route('/api/orders', methods=['GET'])
 def get_orders():
-    """Get all orders with items"""
+    """Get all orders with items (keyset-paginated on order_date, order_id on request)"""
+    try:
+        page = get_page_args((cursor_datetime, int))
+    except ValueError:
+        return jsonify({'error': 'Invalid pagination cursor'}), 400
+    
     conn = get_db_connection()
     if not conn:
         return jsonify({'error': 'Database connection failed'}), 500
     
     try:
         cursor = conn.cursor()
-        query = """
-            SELECT o.order_id, o.order_date, c.name as customer_name, 
-                   o.total_amount, o.status, o.customer_id
-            FROM Orders o 
-            LEFT JOIN Customers c ON o.customer_id = c.customer_id
-            ORDER BY o.order_date DESC
-        """
-        cursor.execute(query)
-        columns = [col[0].lower() for col in cursor.description]
-        rows = cursor.fetchall()
+        # Orders and their items come back from one statement; a larger
+        # arraysize keeps the number of fetch round trips small as well
+        cursor.arraysize = 1000
+        cursor.prefetchrows = 1000
         
-        orders = []
-        for row in rows:
-            order = dict(zip(columns, row))
-            if order.get('order_date'):
-                order['order_date'] = order['order_date'].strftime('%Y-%m-%d')
-            
-            # Get order items
-            cursor.execute("""
-                SELECT oi.medicine_id, m.name as medicine_name, 
-                       oi.quantity, oi.unit_price, oi.line_total
-                FROM Order_Items oi
-                JOIN Medicines m ON oi.medicine_id = m.medicine_id
-                WHERE oi.order_id = :1
-            """, (order['order_id'],))
-            
-            items = []
-            for item_row in cursor.fetchall():
-                items.append({
-                    'medicine_id': item_row[0],
-                    'medicine_name': item_row[1],
-                    'quantity': item_row[2],
-                    'unit_price': float(item_row[3]) if item_row[3] else 0,
-                    'line_total': float(item_row[4]) if item_row[4] else 0
-                })
-            
-            order['items'] = items
-            orders.append(order)
+        query, binds = orders_query(page[1] if page else None, page[0] if page else None)
+        
+        stream = wants_stream(page)
+        if stream:
+            prepare_stream_cursor(cursor)
+        cursor.execute(query, binds)
+        
+        if stream:
+            return stream_json_response(
+                conn, cursor, (order for order, _ in group_order_rows(cursor)))
+        
+        grouped = list(group_order_rows(cursor))
+        orders = [order for order, _ in grouped]
         
         cursor.close()
         conn.close()
+        
+        if page:
+            next_key = None
+            if len(orders) > page[0]:
+                orders = orders[:page[0]]
+                last_date, last_id = grouped[page[0] - 1][1]
+                next_key = [last_date.strftime('%Y-%m-%d %H:%M:%S'), last_id]
+            return page_response(orders, next_key)
         return jsonify(orders)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def order_procedure(caps):
+    """Prefer the set-based procedure; older schemas only have sp_place_order"""
+    return 'sp_place_order_bulk' if 'SP_PLACE_ORDER_BULK' in caps['procedures'] else 'sp_place_order'
+
+def place_order_procedure(cursor):
+    """order_procedure() for the cached schema capabilities"""
+    return order_procedure(get_schema_capabilities(cursor))
+
+def order_error(error_message):
+    """(JSON body, status) for an ORA error from an order procedure; shared with the async app"""
+    if "ORA-20061" in error_message:
+        return {'error': 'Cannot sell expired medicine'}, 400
+    elif "ORA-20062" in error_message:
+        return {'error': 'Insufficient stock'}, 400
+    elif "ORA-20065" in error_message:
+        return {'error': 'No active holds for this cart'}, 400
+    elif any(code in error_message for code in RETRYABLE_ORDER_ERRORS):
+        return {'error': 'Order conflicted with concurrent orders, please retry'}, 409
+    else:
+        return {'error': str(error_message)}, 500
+
+def callproc_with_retry(conn, cursor, procedure, args):
+    """Call an order procedure, retrying deadlock/serialization failures.
+
+    Backs off with full jitter (0..ORDER_RETRY_BACKOFF_MS * 2^attempt) so
+    colliding tills do not retry in lockstep; other errors, and the last
+    failed attempt, are raised as usual.
+    """
+    for attempt in range(ORDER_RETRY_ATTEMPTS + 1):
+        try:
+            return cursor.callproc(procedure, args)
+        except cx_Oracle.DatabaseError as e:
+            error_obj, = e.args
+            retryable = any(code in error_obj.message for code in RETRYABLE_ORDER_ERRORS)
+            if not retryable or attempt == ORDER_RETRY_ATTEMPTS:
+                raise
+            conn.rollback()
+            time.sleep(random.uniform(0, ORDER_RETRY_BACKOFF_MS * (2 ** attempt)) / 1000.0)
+
 @app.route('/api/orders', methods=['POST'])
 def create_order():
     """Create a new order"""
@@ -471,6 +1108,18 @@ def create_order():
     try:
         cursor = conn.cursor()
         
+        if data.get('cart_id'):
+            # Sell what the cart holds; the stock was taken when the holds were placed
+            callproc_with_retry(conn, cursor, 'sp_place_order_from_holds',
+                                [data.get('customer_id'), data['cart_id']])
+            conn.commit()
+            bump_table_versions('ORDERS')
+            
+            cursor.close()
+            conn.close()
+            
+            return jsonify({'message': 'Order placed successfully'}), 201
+        
         # Get Oracle type for collections
         odci_type = conn.gettype("SYS.ODCINUMBERLIST")
         
@@ -481,8 +1130,10 @@ def create_order():
         oracle_qtys.extend(data['quantities'])
         
         # Call stored procedure
-        cursor.callproc("sp_place_order", [data['customer_id'], oracle_items, oracle_qtys])
+        callproc_with_retry(conn, cursor, place_order_procedure(cursor),
+                            [data['customer_id'], oracle_items, oracle_qtys])
         conn.commit()
+        bump_table_versions('ORDERS', 'INVENTORY')
         
         cursor.close()
         conn.close()
@@ -490,52 +1141,213 @@ def create_order():
         return jsonify({'message': 'Order placed successfully'}), 201
     except cx_Oracle.DatabaseError as e:
         error_obj, = e.args
-        error_message = error_obj.message.strip()
-        
-        if "ORA-20061" in error_message:
-            return jsonify({'error': 'Cannot sell expired medicine'}), 400
-        elif "ORA-20062" in error_message:
-            return jsonify({'error': 'Insufficient stock'}), 400
-        else:
-            return jsonify({'error': str(error_message)}), 500
+        body, status = order_error(error_obj.message.strip())
+        return jsonify(body), status
     except Exception as e:
         if conn:
             conn.rollback()
         return jsonify({'error': str(e)}), 500
 
-# ==================== SUPPLIER ROUTES ====================
+@app.route('/api/orders/batch', methods=['POST'])
+def create_orders_batch():
+    """Place many orders on one pooled session, e.g. a till replaying offline sales.
 
-@app.route('/api/suppliers', methods=['GET'])
-def get_suppliers():
-    """Get all suppliers"""
+    Body: {"orders": [{"customer_id": ..., "items": [...], "quantities": [...], "ref": ...}, ...]}.
+    Each order is placed (and committed) on its own by the procedure, so one
+    failure does not affect the others; the result lists success or the ORA
+    error per order, echoing the optional client "ref".
+    """
+    data = request.json or {}
+    orders = data.get('orders')
+    if not isinstance(orders, list) or not orders:
+        return jsonify({'error': 'orders must be a non-empty list'}), 400
+    
     conn = get_db_connection()
     if not conn:
         return jsonify({'error': 'Database connection failed'}), 500
     
+    placed = 0
     try:
         cursor = conn.cursor()
-        query = "SELECT supplier_id, name, contact_email, phone, created_at FROM Suppliers ORDER BY name"
-        cursor.execute(query)
-        columns = [col[0].lower() for col in cursor.description]
-        rows = cursor.fetchall()
+        procedure = place_order_procedure(cursor)
+        
+        # Looked up once for the whole batch instead of once per order
+        odci_type = conn.gettype("SYS.ODCINUMBERLIST")
         
-        suppliers = []
-        for row in rows:
-            supplier = dict(zip(columns, row))
-            if supplier.get('created_at'):
-                supplier['created_at'] = supplier['created_at'].strftime('%Y-%m-%d %H:%M:%S')
-            suppliers.append(supplier)
+        results = []
+        for i, order in enumerate(orders):
+            result = {'index': i}
+            if isinstance(order, dict) and 'ref' in order:
+                result['ref'] = order['ref']
+            results.append(result)
+            
+            if (not isinstance(order, dict)
+                    or not isinstance(order.get('items'), list)
+                    or not isinstance(order.get('quantities'), list)):
+                result['error'] = 'items and quantities must be lists'
+                continue
+            
+            # Earlier orders are already committed, so a bad order must not abort the batch
+            try:
+                oracle_items = odci_type.newobject()
+                oracle_items.extend(order['items'])
+                oracle_qtys = odci_type.newobject()
+                oracle_qtys.extend(order['quantities'])
+                
+                callproc_with_retry(conn, cursor, procedure,
+                                    [order.get('customer_id'), oracle_items, oracle_qtys])
+                result['status'] = 'placed'
+                placed += 1
+            except cx_Oracle.DatabaseError as e:
+                error_obj, = e.args
+                # Keep the ORA-2006x line, drop the ORA-06512 stack lines
+                lines = [line for line in error_obj.message.strip().split("\n")
+                         if not line.startswith("ORA-06512")]
+                result['error'] = "\n".join(lines)
+            except (TypeError, ValueError, cx_Oracle.Error) as e:
+                result['error'] = str(e)
         
+        conn.commit()
         cursor.close()
         conn.close()
-        return jsonify(suppliers)
+        
+        return jsonify({
+            'message': f'{placed} of {len(orders)} orders placed',
+            'placed': placed,
+            'failed': len(orders) - placed,
+            'orders': results
+        }), 200
     except Exception as e:
-        return jsonify({'error': str(e)}), 500
+        if conn:
+            conn.rollback()
+        return jsonify({'error': str(e), 'placed': placed}), 500
+    finally:
+        if placed:
+            bump_table_versions('ORDERS', 'INVENTORY')
 
-@app.route('/api/suppliers', methods=['POST'])
-def add_supplier():
-    """Add a new supplier"""
-    data = request.json
+# ==================== STOCK HOLD ROUTES ====================
+# A hold moves units out of Inventory.qty into Stock_Holds for a cart, in
+# one short single-row UPDATE. Placing the cart's order converts the holds
+# into order lines without touching Inventory again; expired holds are
+# given back by the sweeper.
+
+def format_hold_row(columns, row):
+    """Turn one Stock_Holds row into its JSON shape"""
+    record = dict(zip(columns, row))
+    for key in ('created_at', 'expires_at'):
+        if record.get(key):
+            record[key] = record[key].strftime('%Y-%m-%d %H:%M:%S')
+    return record
+
+def cart_holds_query(cart_id):
+    """SQL and binds for the live holds of one cart"""
+    query = """
+        SELECT h.hold_id, h.medicine_id, m.name, h.qty, h.created_at, h.expires_at
+        FROM Stock_Holds h
+        JOIN Medicines m ON m.medicine_id = h.medicine_id
+        WHERE h.cart_id = :cart_id
+          AND h.expires_at > SYSTIMESTAMP
+        ORDER BY h.medicine_id
+    """
+    return query, {'cart_id': cart_id}
+
+def fetch_cart_holds(cursor, cart_id):
+    """Live holds of one cart"""
+    cursor.execute(*cart_holds_query(cart_id))
+    columns = [col[0].lower() for col in cursor.description]
+    return [format_hold_row(columns, row) for row in cursor.fetchall()]
+
+def release_holds(cursor, condition, binds=None):
+    """Delete the holds matching `condition` and return their units to Inventory.
+
+    Inventory rows are updated in medicine_id order, like order placement
+    locks them. Returns the number of holds released; the caller commits.
+    """
+    medicine_ids = cursor.var(int)
+    quantities = cursor.var(int)
+    cursor.execute(f"""
+        DELETE FROM Stock_Holds
+        WHERE {condition}
+        RETURNING medicine_id, qty INTO :released_ids, :released_qtys
+    """, dict(binds or {}, released_ids=medicine_ids, released_qtys=quantities))
+    
+    released = {}
+    for medicine_id, qty in zip(medicine_ids.getvalue(), quantities.getvalue()):
+        released[medicine_id] = released.get(medicine_id, 0) + qty
+    if released:
+        cursor.executemany("UPDATE Inventory SET qty = qty + :1 WHERE medicine_id = :2",
+                           [(released[mid], mid) for mid in sorted(released)])
+    return len(medicine_ids.getvalue())
+
+def sweep_expired_holds():
+    """Give back the stock of every expired hold; returns the number released"""
+    with acquire_connection() as conn:
+        cursor = conn.cursor()
+        if 'STOCK_HOLDS' not in get_schema_capabilities(cursor)['columns']:
+            return 0  # schema not set up yet
+        released = release_holds(cursor, "expires_at <= SYSTIMESTAMP")
+        conn.commit()
+        cursor.close()
+    if released:
+        bump_table_versions('INVENTORY')
+    return released
+
+_hold_sweeper_started = False
+_hold_sweeper_lock = threading.Lock()
+
+def start_hold_sweeper():
+    """Run sweep_expired_holds every HOLD_SWEEP_INTERVAL seconds in the background.
+
+    Idempotent: only the first call in a process starts the thread.
+    """
+    global _hold_sweeper_started
+    with _hold_sweeper_lock:
+        if _hold_sweeper_started:
+            return
+        _hold_sweeper_started = True
+    
+    def run():
+        while True:
+            time.sleep(HOLD_SWEEP_INTERVAL)
+            try:
+                released = sweep_expired_holds()
+                if released:
+                    print(f"Released {released} expired stock holds")
+            except Exception as e:
+                print(f"Stock hold sweep failed: {e}")
+    
+    threading.Thread(target=run, name='hold-sweeper', daemon=True).start()
+
+@app.before_request
+def ensure_hold_sweeper():
+    """Start the sweeper in whichever process serves requests.
+
+    Works under flask run and WSGI servers, and skips the debug reloader's
+    parent process, which never serves a request.
+    """
+    if not _hold_sweeper_started:
+        start_hold_sweeper()
+
+@app.route('/api/holds', methods=['POST'])
+def create_hold():
+    """Hold stock of one medicine for a cart.
+
+    Body: {"medicine_id": ..., "qty": ..., "cart_id": optional, "ttl_seconds": optional}.
+    Holding a medicine the cart already holds adds to it and renews the TTL.
+    Without a cart_id a new cart is started; its id is returned.
+    """
+    data = request.json or {}
+    try:
+        medicine_id = int(data['medicine_id'])
+        qty = int(data['qty'])
+        ttl = int(data.get('ttl_seconds', HOLD_TTL_SECONDS))
+    except (KeyError, TypeError, ValueError):
+        return jsonify({'error': 'medicine_id and qty must be integers'}), 400
+    if qty <= 0:
+        return jsonify({'error': 'qty must be positive'}), 400
+    ttl = max(1, min(ttl, HOLD_MAX_TTL_SECONDS))
+    cart_id = str(data.get('cart_id') or uuid.uuid4().hex)
+    
     conn = get_db_connection()
     if not conn:
         return jsonify({'error': 'Database connection failed'}), 500
@@ -543,9 +1355,269 @@ def add_supplier():
     try:
         cursor = conn.cursor()
         
-        # Validate input
-        if not data.get('name'):
-            return jsonify({'error': 'Name is required'}), 400
+        # Hold row first, then Inventory, the same order release_holds uses
+        cursor.execute("""
+            MERGE INTO Stock_Holds h
+            USING (SELECT :cart_id AS cart_id, :medicine_id AS medicine_id FROM dual) s
+            ON (h.cart_id = s.cart_id AND h.medicine_id = s.medicine_id)
+            WHEN MATCHED THEN
+                UPDATE SET h.qty = h.qty + :qty,
+                           h.expires_at = SYSTIMESTAMP + NUMTODSINTERVAL(:ttl, 'SECOND')
+            WHEN NOT MATCHED THEN
+                INSERT (cart_id, medicine_id, qty, expires_at)
+                VALUES (s.cart_id, s.medicine_id, :qty, SYSTIMESTAMP + NUMTODSINTERVAL(:ttl, 'SECOND'))
+        """, cart_id=cart_id, medicine_id=medicine_id, qty=qty, ttl=ttl)
+        
+        cursor.execute("""
+            UPDATE Inventory SET qty = qty - :qty
+            WHERE medicine_id = :medicine_id AND qty >= :qty
+        """, qty=qty, medicine_id=medicine_id)
+        if cursor.rowcount == 0:
+            conn.rollback()
+            return jsonify({'error': 'Insufficient stock'}), 409
+        
+        conn.commit()
+        bump_table_versions('INVENTORY')
+        
+        holds = fetch_cart_holds(cursor, cart_id)
+        cursor.close()
+        conn.close()
+        
+        return jsonify({'message': 'Stock held', 'cart_id': cart_id, 'holds': holds}), 201
+    except cx_Oracle.IntegrityError as e:
+        conn.rollback()
+        if "ORA-02291" in str(e):
+            return jsonify({'error': 'Medicine not found'}), 404
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        if conn:
+            conn.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/holds/<cart_id>', methods=['GET'])
+def get_holds(cart_id):
+    """List the live holds of a cart"""
+    conn = get_db_connection()
+    if not conn:
+        return jsonify({'error': 'Database connection failed'}), 500
+    
+    try:
+        cursor = conn.cursor()
+        holds = fetch_cart_holds(cursor, cart_id)
+        cursor.close()
+        conn.close()
+        
+        return jsonify({'cart_id': cart_id, 'holds': holds})
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/holds/<cart_id>', methods=['DELETE'])
+def release_cart_holds(cart_id):
+    """Give back a cart's holds (all of them, or one medicine with ?medicine_id=)"""
+    medicine_id = request.args.get('medicine_id', type=int)
+    conn = get_db_connection()
+    if not conn:
+        return jsonify({'error': 'Database connection failed'}), 500
+    
+    try:
+        cursor = conn.cursor()
+        if medicine_id is None:
+            released = release_holds(cursor, "cart_id = :cart_id", {'cart_id': cart_id})
+        else:
+            released = release_holds(cursor, "cart_id = :cart_id AND medicine_id = :medicine_id",
+                                     {'cart_id': cart_id, 'medicine_id': medicine_id})
+        conn.commit()
+        if released:
+            bump_table_versions('INVENTORY')
+        
+        cursor.close()
+        conn.close()
+        
+        return jsonify({'message': f'{released} holds released', 'released': released}), 200
+    except Exception as e:
+        if conn:
+            conn.rollback()
+        return jsonify({'error': str(e)}), 500
+
+# ==================== BOOTSTRAP ROUTE ====================
+
+@app.route('/api/bootstrap', methods=['GET'])
+@etag_response('MEDICINES', 'INVENTORY', 'SUPPLIERS', 'CUSTOMERS', 'ORDERS')
+@cached_response('MEDICINES', 'INVENTORY', 'SUPPLIERS', 'CUSTOMERS', 'ORDERS')
+def bootstrap():
+    """Initial datasets for the store UI in one response.
+
+    inventory, suppliers, customers and orders are read on one pooled
+    session inside one read-only transaction, so they form one consistent
+    snapshot. When paginated (?paginate=true&limit=N, or API_PAGINATE_LISTS)
+    each dataset is its first page, with the cursor for the matching list
+    route under "next". ?include=inventory,orders returns only those.
+    """
+    datasets = ('inventory', 'suppliers', 'customers', 'orders')
+    include = request.args.get('include')
+    wanted = [d for d in datasets if not include or d in include.split(',')]
+    if request.args.get('after'):
+        return jsonify({'error': 'Use the list routes to fetch further pages'}), 400
+    page = get_page_args((int,))
+    limit = page[0] if page else None
+    
+    conn = get_db_connection()
+    if not conn:
+        return jsonify({'error': 'Database connection failed'}), 500
+    
+    try:
+        cursor = conn.cursor()
+        cursor.arraysize = 1000
+        cursor.prefetchrows = 1000
+        has_is_active = has_column(cursor, 'MEDICINES', 'IS_ACTIVE')
+        
+        # Every query below sees the database as of this statement
+        if conn.transaction_in_progress:
+            conn.rollback()
+        cursor.execute("SET TRANSACTION READ ONLY")
+        
+        result = {}
+        listings = (
+            ('inventory', inventory_query(has_is_active, limit=limit), format_inventory_row,
+             lambda columns, row: [row[0]]),
+            ('suppliers', suppliers_query(limit=limit), format_contact_row, contacts_next_key),
+            ('customers', customers_query(limit=limit), format_contact_row, contacts_next_key)
+        )
+        for name, (query, binds), format_row, row_key in listings:
+            if name not in wanted:
+                continue
+            cursor.execute(query, binds)
+            columns = [col[0].lower() for col in cursor.description]
+            rows = cursor.fetchall()
+            if limit:
+                next_key = row_key(columns, rows[limit - 1]) if len(rows) > limit else None
+                result[name] = {'items': [format_row(columns, row) for row in rows[:limit]],
+                                'next': encode_cursor(next_key) if next_key else None}
+            else:
+                result[name] = [format_row(columns, row) for row in rows]
+        
+        if 'orders' in wanted:
+            cursor.execute(*orders_query(limit=limit))
+            grouped = list(group_order_rows(cursor))
+            orders = [order for order, _ in grouped]
+            if limit:
+                next_key = None
+                if len(orders) > limit:
+                    orders = orders[:limit]
+                    last_date, last_id = grouped[limit - 1][1]
+                    next_key = [last_date.strftime('%Y-%m-%d %H:%M:%S'), last_id]
+                orders = {'items': orders, 'next': encode_cursor(next_key) if next_key else None}
+            result['orders'] = orders
+        
+        # Ends the read-only transaction
+        conn.commit()
+        cursor.close()
+        conn.close()
+        
+        return jsonify(result)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# ==================== SUPPLIER ROUTES ====================
+
+def format_contact_row(columns, row):
+    """Turn one supplier or customer row into its JSON shape"""
+    record = dict(zip(columns, row))
+    if record.get('created_at'):
+        record['created_at'] = record['created_at'].strftime('%Y-%m-%d %H:%M:%S')
+    return record
+
+def contacts_query(table, id_column, columns, after_key=None, limit=None):
+    """SQL and binds for a supplier/customer listing, ordered by (name, id).
+
+    Without a limit, the whole table; with one, one page (plus one
+    look-ahead row) after after_key, a (name, id) pair.
+    """
+    if not limit:
+        return f"SELECT {columns} FROM {table} ORDER BY name, {id_column}", {}
+    
+    query = f"""
+        SELECT {columns} FROM {table}
+        {f"WHERE name >= :after_name AND (name > :after_name OR {id_column} > :after_id)"
+         if after_key else ""}
+        ORDER BY name, {id_column}
+        FETCH FIRST :fetch_rows ROWS ONLY
+    """
+    binds = {'fetch_rows': limit + 1}
+    if after_key:
+        binds['after_name'], binds['after_id'] = after_key
+    return query, binds
+
+def contacts_next_key(columns, row):
+    """Cursor key (name, id) of the last row on a supplier/customer page"""
+    return [row[columns.index('name')], row[0]]
+
+def suppliers_query(after_key=None, limit=None):
+    """SQL and binds for the supplier listing"""
+    return contacts_query('Suppliers', 'supplier_id', 'supplier_id, name, contact_email, phone, created_at',
+                          after_key, limit)
+
+def customers_query(after_key=None, limit=None):
+    """SQL and binds for the customer listing"""
+    return contacts_query('Customers', 'customer_id', 'customer_id, name, phone, email, address, created_at',
+                          after_key, limit)
+
+@app.route('/api/suppliers', methods=['GET'])
+@etag_response('SUPPLIERS')
+@cached_response('SUPPLIERS')
+def get_suppliers():
+    """Get all suppliers by name (keyset-paginated on (name, supplier_id) on request)"""
+    try:
+        page = get_page_args((str, int))
+    except ValueError:
+        return jsonify({'error': 'Invalid pagination cursor'}), 400
+    
+    conn = get_db_connection()
+    if not conn:
+        return jsonify({'error': 'Database connection failed'}), 500
+    
+    try:
+        cursor = conn.cursor()
+        query, binds = suppliers_query(page[1] if page else None, page[0] if page else None)
+        if wants_stream(page):
+            prepare_stream_cursor(cursor)
+            cursor.execute(query, binds)
+            columns = [col[0].lower() for col in cursor.description]
+            return stream_json_response(
+                conn, cursor, (format_contact_row(columns, row) for row in cursor))
+        cursor.execute(query, binds)
+        columns = [col[0].lower() for col in cursor.description]
+        rows = cursor.fetchall()
+        
+        next_key = None
+        if page and len(rows) > page[0]:
+            rows = rows[:page[0]]
+            next_key = contacts_next_key(columns, rows[-1])
+        
+        suppliers = [format_contact_row(columns, row) for row in rows]
+        
+        cursor.close()
+        conn.close()
+        if page:
+            return page_response(suppliers, next_key)
+        return jsonify(suppliers)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/suppliers', methods=['POST'])
+def add_supplier():
+    """Add a new supplier"""
+    data = request.json
+    conn = get_db_connection()
+    if not conn:
+        return jsonify({'error': 'Database connection failed'}), 500
+    
+    try:
+        cursor = conn.cursor()
+        
+        # Validate input
+        if not data.get('name'):
+            return jsonify({'error': 'Name is required'}), 400
         
         if not data.get('email'):
             return jsonify({'error': 'Email is required'}), 400
@@ -559,35 +1631,66 @@ def add_supplier():
         if not PHONE_RE.match(data['phone']):
             return jsonify({'error': 'Invalid phone format'}), 400
         
-        # Check for duplicates
-        cursor.execute("""
-            SELECT supplier_id FROM Suppliers
-            WHERE LOWER(name) = LOWER(:1)
-              OR LOWER(contact_email) = LOWER(:2)
-              OR phone = :3
-        """, (data['name'], data['email'], data['phone']))
-        
-        if cursor.fetchone():
-            cursor.close()
-            conn.close()
-            return jsonify({'error': 'Supplier already exists'}), 400
-        
+        # A name, email or phone already on file is rejected by the
+        # uq_suppliers_* indexes
         cursor.execute("""
             INSERT INTO Suppliers(name, contact_email, phone) 
             VALUES(:1, :2, :3)
         """, (data['name'], data['email'], data['phone']))
         
         conn.commit()
+        bump_table_versions('SUPPLIERS')
         cursor.close()
         conn.close()
         
         return jsonify({'message': 'Supplier added successfully'}), 201
+    except cx_Oracle.IntegrityError as e:
+        conn.rollback()
+        if "ORA-00001" in str(e):
+            return jsonify({'error': 'Supplier already exists'}), 400
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         if conn:
             conn.rollback()
         return jsonify({'error': str(e)}), 500
 
+def supplier_performance_query(has_supplier_stats, has_is_active=True):
+    """SQL and binds for per-supplier medicine count, average and max price.
+
+    Both variants count active medicines only and treat a missing price
+    as 0, like trg_medicines_supplier_stats.
+    """
+    if has_supplier_stats:
+        # Aggregates kept current by trg_medicines_supplier_stats
+        query = """
+            SELECT s.supplier_id, s.name,
+                   NVL(st.meds_count, 0) as meds_count,
+                   st.price_sum / NULLIF(st.meds_count, 0) as avg_price,
+                   st.max_price
+            FROM Suppliers s
+            LEFT JOIN Supplier_Stats st ON st.supplier_id = s.supplier_id
+            ORDER BY meds_count DESC
+        """
+    else:
+        query = f"""
+            SELECT s.supplier_id, s.name, 
+                   COUNT(m.medicine_id) as meds_count, 
+                   AVG(m.price) as avg_price, 
+                   MAX(m.price) as max_price
+            FROM Suppliers s 
+            LEFT JOIN (
+                SELECT supplier_id, medicine_id, NVL(unit_price, 0) AS price
+                FROM Medicines
+                {"WHERE NVL(is_active, 'Y') = 'Y'" if has_is_active else ""}
+            ) m ON s.supplier_id = m.supplier_id
+            GROUP BY s.supplier_id, s.name
+            ORDER BY meds_count DESC
+        """
+    return query, {}
+
 @app.route('/api/suppliers/performance', methods=['GET'])
+@etag_response('SUPPLIERS', 'MEDICINES')
+@cached_response('SUPPLIERS', 'MEDICINES')
 def supplier_performance():
     """Get supplier performance metrics"""
     conn = get_db_connection()
@@ -596,17 +1699,10 @@ def supplier_performance():
     
     try:
         cursor = conn.cursor()
-        query = """
-            SELECT s.supplier_id, s.name, 
-                   COUNT(m.medicine_id) as meds_count, 
-                   AVG(m.unit_price) as avg_price, 
-                   MAX(m.unit_price) as max_price
-            FROM Suppliers s 
-            LEFT JOIN Medicines m ON s.supplier_id = m.supplier_id
-            GROUP BY s.supplier_id, s.name
-            ORDER BY meds_count DESC
-        """
-        cursor.execute(query)
+        caps = get_schema_capabilities(cursor)
+        query, binds = supplier_performance_query('SUPPLIER_STATS' in caps['columns'],
+                                                  'IS_ACTIVE' in caps['columns'].get('MEDICINES', set()))
+        cursor.execute(query, binds)
         
         performance = []
         for row in cursor.fetchall():
@@ -627,28 +1723,43 @@ def supplier_performance():
 # ==================== CUSTOMER ROUTES ====================
 
 @app.route('/api/customers', methods=['GET'])
+@etag_response('CUSTOMERS')
+@cached_response('CUSTOMERS')
 def get_customers():
-    """Get all customers"""
+    """Get all customers by name (keyset-paginated on (name, customer_id) on request)"""
+    try:
+        page = get_page_args((str, int))
+    except ValueError:
+        return jsonify({'error': 'Invalid pagination cursor'}), 400
+    
     conn = get_db_connection()
     if not conn:
         return jsonify({'error': 'Database connection failed'}), 500
     
     try:
         cursor = conn.cursor()
-        query = "SELECT customer_id, name, phone, email, address, created_at FROM Customers ORDER BY name"
-        cursor.execute(query)
+        query, binds = customers_query(page[1] if page else None, page[0] if page else None)
+        if wants_stream(page):
+            prepare_stream_cursor(cursor)
+            cursor.execute(query, binds)
+            columns = [col[0].lower() for col in cursor.description]
+            return stream_json_response(
+                conn, cursor, (format_contact_row(columns, row) for row in cursor))
+        cursor.execute(query, binds)
         columns = [col[0].lower() for col in cursor.description]
         rows = cursor.fetchall()
         
-        customers = []
-        for row in rows:
-            customer = dict(zip(columns, row))
-            if customer.get('created_at'):
-                customer['created_at'] = customer['created_at'].strftime('%Y-%m-%d %H:%M:%S')
-            customers.append(customer)
+        next_key = None
+        if page and len(rows) > page[0]:
+            rows = rows[:page[0]]
+            next_key = contacts_next_key(columns, rows[-1])
+        
+        customers = [format_contact_row(columns, row) for row in rows]
         
         cursor.close()
         conn.close()
+        if page:
+            return page_response(customers, next_key)
         return jsonify(customers)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -668,42 +1779,122 @@ def add_customer():
         if data.get('phone') and not PHONE_RE.match(data['phone']):
             return jsonify({'error': 'Invalid phone format'}), 400
         
+        customer_id_var = cursor.var(int)
         cursor.execute("""
             INSERT INTO Customers(name, phone, email, address) 
             VALUES(:1, :2, :3, :4)
-        """, (data['name'], data.get('phone'), data.get('email'), data.get('address')))
+            RETURNING customer_id INTO :5
+        """, (data['name'], data.get('phone'), data.get('email'), data.get('address'), customer_id_var))
+        customer_id = customer_id_var.getvalue()[0]
         
         conn.commit()
-        
-        # Get the new customer ID
-        cursor.execute("""
-            SELECT customer_id FROM Customers 
-            WHERE ROWID = (SELECT MAX(ROWID) FROM Customers)
-        """)
-        customer_id = cursor.fetchone()[0]
+        bump_table_versions('CUSTOMERS')
         
         cursor.close()
         conn.close()
         
         return jsonify({'message': 'Customer added successfully', 'customer_id': customer_id}), 201
+    except cx_Oracle.IntegrityError as e:
+        conn.rollback()
+        if "ORA-00001" in str(e):
+            # uq_customers_email
+            return jsonify({'error': 'A customer with this email already exists'}), 400
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         if conn:
             conn.rollback()
         return jsonify({'error': str(e)}), 500
 
-# ==================== REPORTS ROUTES ====================
+@app.route('/api/customers/bulk', methods=['POST'])
+def add_customers_bulk():
+    """Add many customers in one array insert.
 
-@app.route('/api/reports/sales-summary', methods=['GET'])
-def sales_summary():
-    """Get daily sales summary"""
+    Body: {"customers": [{"name": ..., "phone": ..., "email": ..., "address": ...}, ...]}.
+    Returns the new customer_id, or the reason for rejection, per entry.
+    """
+    data = request.json or {}
+    entries = data.get('customers')
+    if not isinstance(entries, list) or not entries:
+        return jsonify({'error': 'customers must be a non-empty list'}), 400
+    
+    results = [{'index': i} for i in range(len(entries))]
+    rows = []
+    row_indexes = []
+    for i, entry in enumerate(entries):
+        if not isinstance(entry, dict) or not entry.get('name'):
+            results[i]['error'] = 'Name is required'
+        elif entry.get('phone') and not PHONE_RE.match(entry['phone']):
+            results[i]['error'] = 'Invalid phone format'
+        else:
+            rows.append((entry['name'], entry.get('phone'), entry.get('email'), entry.get('address')))
+            row_indexes.append(i)
+    
+    if not rows:
+        return jsonify({'created': 0, 'failed': len(entries), 'customers': results}), 400
+    
     conn = get_db_connection()
     if not conn:
         return jsonify({'error': 'Database connection failed'}), 500
     
     try:
         cursor = conn.cursor()
-        days = request.args.get('days', 7, type=int)
         
+        # One array DML call; RETURNING fills one id per row
+        customer_ids = cursor.var(cx_Oracle.DB_TYPE_NUMBER, arraysize=len(rows))
+        cursor.setinputsizes(None, None, None, None, customer_ids)
+        cursor.executemany("""
+            INSERT INTO Customers(name, phone, email, address) 
+            VALUES(:1, :2, :3, :4)
+            RETURNING customer_id INTO :5
+        """, rows, batcherrors=True)
+        
+        errors = {err.offset: err.message for err in cursor.getbatcherrors()}
+        for offset, i in enumerate(row_indexes):
+            if offset in errors:
+                results[i]['error'] = ('A customer with this email already exists'
+                                       if 'ORA-00001' in errors[offset] else errors[offset])
+            else:
+                results[i]['customer_id'] = int(customer_ids.getvalue(offset)[0])
+        
+        conn.commit()
+        bump_table_versions('CUSTOMERS')
+        cursor.close()
+        conn.close()
+        
+        created = sum(1 for r in results if 'customer_id' in r)
+        return jsonify({
+            'message': f'{created} customers added',
+            'created': created,
+            'failed': len(entries) - created,
+            'customers': results
+        }), 201
+    except Exception as e:
+        if conn:
+            conn.rollback()
+        return jsonify({'error': str(e)}), 500
+
+# ==================== REPORTS ROUTES ====================
+# Each report's query lives in a fetch_* function taking a cursor, so the
+# single-report routes and the dashboard share it.
+
+def sales_summary_query(has_daily_sales, days):
+    """SQL and binds for daily order count, total and average over `days` days.
+
+    Read from the Daily_Sales rollup (a few rows per day) when the schema
+    has it, otherwise aggregated from Orders.
+    """
+    if has_daily_sales:
+        query = """
+            SELECT sale_date, SUM(orders) orders,
+                   SUM(total_sales) total_sales,
+                   SUM(total_sales) / NULLIF(SUM(orders), 0) avg_order
+            FROM Daily_Sales
+            WHERE sale_date >= TRUNC(SYSDATE) - :1
+            GROUP BY sale_date
+            HAVING SUM(orders) > 0
+            ORDER BY sale_date DESC
+        """
+    else:
         query = """
             SELECT TRUNC(order_date) sale_date, COUNT(*) orders, 
                    SUM(total_amount) total_sales, AVG(total_amount) avg_order
@@ -712,16 +1903,100 @@ def sales_summary():
             GROUP BY TRUNC(order_date)
             ORDER BY TRUNC(order_date) DESC
         """
-        cursor.execute(query, (days,))
-        
-        summary = []
-        for row in cursor.fetchall():
-            summary.append({
-                'sale_date': row[0].strftime('%Y-%m-%d'),
-                'orders': row[1],
-                'total_sales': float(row[2]) if row[2] else 0,
-                'avg_order': float(row[3]) if row[3] else 0
-            })
+    return query, (days,)
+
+def fetch_sales_summary(cursor, days):
+    """Daily order count, total and average for the last `days` days"""
+    has_daily_sales = 'DAILY_SALES' in get_schema_capabilities(cursor)['columns']
+    cursor.execute(*sales_summary_query(has_daily_sales, days))
+    
+    summary = []
+    for row in cursor.fetchall():
+        summary.append({
+            'sale_date': row[0].strftime('%Y-%m-%d'),
+            'orders': row[1],
+            'total_sales': float(row[2]) if row[2] else 0,
+            'avg_order': float(row[3]) if row[3] else 0
+        })
+    return summary
+
+def above_average_price_query():
+    """SQL and binds for medicines priced above the average price"""
+    query = """
+        SELECT medicine_id, name, unit_price 
+        FROM Medicines 
+        WHERE unit_price > (SELECT AVG(unit_price) FROM Medicines)
+        ORDER BY unit_price DESC
+    """
+    return query, {}
+
+def fetch_above_average_price(cursor):
+    """Medicines priced above the average price"""
+    cursor.execute(*above_average_price_query())
+    
+    medicines = []
+    for row in cursor.fetchall():
+        medicines.append({
+            'medicine_id': row[0],
+            'name': row[1],
+            'unit_price': float(row[2]) if row[2] else 0
+        })
+    return medicines
+
+def inventory_any_threshold_query():
+    """SQL and binds for medicines with stock above ANY min_threshold"""
+    query = """
+        SELECT m.medicine_id, m.name, i.qty, i.min_threshold
+        FROM Medicines m 
+        JOIN Inventory i ON m.medicine_id = i.medicine_id
+        WHERE i.qty > ANY (SELECT min_threshold FROM Inventory)
+        ORDER BY m.name
+    """
+    return query, {}
+
+def fetch_inventory_any_threshold(cursor):
+    """Medicines with stock above ANY min_threshold"""
+    cursor.execute(*inventory_any_threshold_query())
+    
+    medicines = []
+    for row in cursor.fetchall():
+        medicines.append({
+            'medicine_id': row[0],
+            'name': row[1],
+            'quantity': row[2],
+            'min_threshold': row[3]
+        })
+    return medicines
+
+# UNION: unique names from Suppliers and Customers
+UNION_NAMES_QUERY = "SELECT name FROM Suppliers UNION SELECT name FROM Customers"
+# INTERSECT: common names in both Suppliers and Customers
+INTERSECT_NAMES_QUERY = "SELECT name FROM Suppliers INTERSECT SELECT name FROM Customers"
+
+def fetch_union_intersect(cursor):
+    """Supplier/customer names combined with UNION and INTERSECT"""
+    cursor.execute(UNION_NAMES_QUERY)
+    union_results = [row[0] for row in cursor.fetchall()]
+    
+    cursor.execute(INTERSECT_NAMES_QUERY)
+    intersect_results = [row[0] for row in cursor.fetchall()]
+    
+    return {
+        'union_unique_names': union_results,
+        'intersect_common_names': intersect_results
+    }
+
+@app.route('/api/reports/sales-summary', methods=['GET'])
+def sales_summary():
+    """Get daily sales summary"""
+    conn = get_db_connection()
+    if not conn:
+        return jsonify({'error': 'Database connection failed'}), 500
+    
+    try:
+        cursor = conn.cursor()
+        days = request.args.get('days', 7, type=int)
+        summary = fetch_sales_summary(cursor, days)
         
         cursor.close()
         conn.close()
@@ -738,21 +2013,7 @@ def medicines_above_avg():
     
     try:
         cursor = conn.cursor()
-        query = """
-            SELECT medicine_id, name, unit_price 
-            FROM Medicines 
-            WHERE unit_price > (SELECT AVG(unit_price) FROM Medicines)
-            ORDER BY unit_price DESC
-        """
-        cursor.execute(query)
-        
-        medicines = []
-        for row in cursor.fetchall():
-            medicines.append({
-                'medicine_id': row[0],
-                'name': row[1],
-                'unit_price': float(row[2]) if row[2] else 0
-            })
+        medicines = fetch_above_average_price(cursor)
         
         cursor.close()
         conn.close()
@@ -769,23 +2030,7 @@ def meds_inventory_any():
     
     try:
         cursor = conn.cursor()
-        query = """
-            SELECT m.medicine_id, m.name, i.qty, i.min_threshold
-            FROM Medicines m 
-            JOIN Inventory i ON m.medicine_id = i.medicine_id
-            WHERE i.qty > ANY (SELECT min_threshold FROM Inventory)
-            ORDER BY m.name
-        """
-        cursor.execute(query)
-        
-        medicines = []
-        for row in cursor.fetchall():
-            medicines.append({
-                'medicine_id': row[0],
-                'name': row[1],
-                'quantity': row[2],
-                'min_threshold': row[3]
-            })
+        medicines = fetch_inventory_any_threshold(cursor)
         
         cursor.close()
         conn.close()
@@ -802,169 +2047,216 @@ def union_intersect_demo():
     
     try:
         cursor = conn.cursor()
-        
-        # UNION: unique names from Suppliers and Customers
-        cursor.execute("SELECT name FROM Suppliers UNION SELECT name FROM Customers")
-        union_results = [row[0] for row in cursor.fetchall()]
-        
-        # INTERSECT: common names in both Suppliers and Customers
-        cursor.execute("SELECT name FROM Suppliers INTERSECT SELECT name FROM Customers")
-        intersect_results = [row[0] for row in cursor.fetchall()]
+        result = fetch_union_intersect(cursor)
         
         cursor.close()
         conn.close()
         
-        return jsonify({
-            'union_unique_names': union_results,
-            'intersect_common_names': intersect_results
-        })
+        return jsonify(result)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def format_audit_row(row):
+    """Turn one Audit_Log row into its JSON shape"""
+    return {
+        'audit_id': row[0],
+        'action_by': row[1],
+        'action': row[2],
+        'object_name': row[3],
+        'details': row[4],
+        'action_time': row[5].strftime('%Y-%m-%d %H:%M:%S') if row[5] else None
+    }
+
+def audit_log_query(fetch_rows, time_from=None, time_to=None, filters=None, after_key=None):
+    """SQL and binds for audit entries, newest first.
+
+    time_from (inclusive) and time_to (exclusive) bound action_time,
+    filters maps action/object_name to an exact value, and after_key is
+    the (action_time, audit_id) the page starts after.
+    """
+    conditions = []
+    binds = {}
+    if time_from:
+        conditions.append("action_time >= TO_TIMESTAMP(:time_from, 'YYYY-MM-DD HH24:MI:SS.FF6')")
+        binds['time_from'] = time_from
+    if time_to:
+        conditions.append("action_time < TO_TIMESTAMP(:time_to, 'YYYY-MM-DD HH24:MI:SS.FF6')")
+        binds['time_to'] = time_to
+    for column, value in (filters or {}).items():
+        conditions.append(f"{column} = :{column}")
+        binds[column] = value
+    if after_key:
+        conditions.append("""
+            (action_time < TO_TIMESTAMP(:after_time, 'YYYY-MM-DD HH24:MI:SS.FF6')
+             OR (action_time = TO_TIMESTAMP(:after_time, 'YYYY-MM-DD HH24:MI:SS.FF6')
+                 AND audit_id < :after_id))
+        """)
+        binds['after_time'], binds['after_id'] = after_key
+    
+    # The limit is part of the statement, so Oracle can walk the
+    # (action_time, audit_id) index and stop instead of sorting the table
+    query = f"""
+        SELECT audit_id, action_by, action, object_name, details, action_time 
+        FROM Audit_Log 
+        {"WHERE " + " AND ".join(conditions) if conditions else ""}
+        ORDER BY action_time DESC, audit_id DESC
+        FETCH FIRST :fetch_rows ROWS ONLY
+    """
+    binds['fetch_rows'] = fetch_rows
+    return query, binds
+
 @app.route('/api/reports/audit-log', methods=['GET'])
 def get_audit_log():
-    """Get audit log entries"""
+    """Get audit log entries, newest first.
+
+    Optional filters: from (inclusive) and to (exclusive) on action_time,
+    action and object_name (exact match). Keyset-paginated on
+    (action_time, audit_id) on request.
+    """
+    try:
+        page = get_page_args((cursor_timestamp, int), default_limit=50)
+        time_from = parse_time_arg('from')
+        time_to = parse_time_arg('to')
+    except ValueError as e:
+        return jsonify({'error': f'Invalid parameter: {e}'}), 400
+    
     conn = get_db_connection()
     if not conn:
         return jsonify({'error': 'Database connection failed'}), 500
     
     try:
         cursor = conn.cursor()
-        limit = request.args.get('limit', 50, type=int)
+        limit = page[0] if page else max(request.args.get('limit', 50, type=int), 0)
+        filters = {column: request.args[column] for column in ('action', 'object_name')
+                   if request.args.get(column)}
+        query, binds = audit_log_query(limit + 1 if page else limit, time_from, time_to,
+                                       filters, page[1] if page else None)
+        
+        if wants_stream(page):
+            prepare_stream_cursor(cursor)
+            cursor.execute(query, binds)
+            return stream_json_response(conn, cursor, (format_audit_row(row) for row in cursor))
+        
+        cursor.execute(query, binds)
+        rows = cursor.fetchall()
         
-        query = """
-            SELECT audit_id, action_by, action, object_name, details, action_time 
-            FROM Audit_Log 
-            ORDER BY action_time DESC
-        """
-        cursor.execute(query)
-        rows = cursor.fetchmany(limit)
-        
-        logs = []
-        for row in rows:
-            logs.append({
-                'audit_id': row[0],
-                'action_by': row[1],
-                'action': row[2],
-                'object_name': row[3],
-                'details': row[4],
-                'action_time': row[5].strftime('%Y-%m-%d %H:%M:%S') if row[5] else None
-            })
+        next_key = None
+        if page and len(rows) > limit:
+            rows = rows[:limit]
+            next_key = [rows[-1][5].strftime('%Y-%m-%d %H:%M:%S.%f'), rows[-1][0]]
+        
+        logs = [format_audit_row(row) for row in rows]
         
         cursor.close()
         conn.close()
+        if page:
+            return page_response(logs, next_key)
         return jsonify(logs)
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def fetch_recent_audit_log(cursor, limit):
+    """The newest `limit` audit entries (the unfiltered audit-log listing)"""
+    cursor.execute(*audit_log_query(limit))
+    return [format_audit_row(row) for row in cursor.fetchall()]
+
+def run_report(fetch, *args):
+    """Run one fetch_* report on its own pooled session (from a worker thread)"""
+    with acquire_connection() as conn:
+        cursor = conn.cursor()
+        try:
+            return fetch(cursor, *args)
+        finally:
+            cursor.close()
+
+@app.route('/api/reports/dashboard', methods=['GET'])
+def reports_dashboard():
+    """All Reports-tab datasets in one response.
+
+    The five report queries run concurrently, each on its own pooled
+    session, so the response takes about as long as the slowest one.
+    Query args: days (sales window, default 7) and audit_limit (default 100).
+    A report that fails is listed under 'errors'; the others still return.
+    """
+    days = request.args.get('days', 7, type=int)
+    audit_limit = max(0, min(request.args.get('audit_limit', 100, type=int), MAX_PAGE_SIZE))
+    
+    reports = {
+        'sales_summary': (fetch_sales_summary, days),
+        'audit_log': (fetch_recent_audit_log, audit_limit),
+        'above_average_price': (fetch_above_average_price,),
+        'inventory_any_threshold': (fetch_inventory_any_threshold,),
+        'union_intersect': (fetch_union_intersect,)
+    }
+    futures = {name: _report_executor.submit(run_report, *job) for name, job in reports.items()}
+    
+    payload = {}
+    errors = {}
+    for name, future in futures.items():
+        try:
+            payload[name] = future.result()
+        except Exception as e:
+            errors[name] = str(e)
+    if errors:
+        payload['errors'] = errors
+    
+    return jsonify(payload), 500 if len(errors) == len(reports) else 200
+
 # ==================== ADMIN/MAINTENANCE ROUTES ====================
 
 @app.route('/api/admin/setup-schema', methods=['POST'])
 def setup_schema():
-    """Initialize database schema"""
+    """Initialize database schema (applies pending migrations)"""
     conn = get_db_connection()
     if not conn:
         return jsonify({'error': 'Database connection failed'}), 500
     
+    deferred = {}
     try:
-        cursor = conn.cursor()
-        
-        # Create tables
-        tables = [
-            """
-            CREATE TABLE Suppliers (
-                supplier_id NUMBER GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
-                name VARCHAR2(120) NOT NULL,
-                contact_email VARCHAR2(120) NOT NULL,
-                phone VARCHAR2(20) NOT NULL,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                CONSTRAINT unique_supplier_entry UNIQUE (name,contact_email,phone)
-            )
-            """,
-            """
-            CREATE TABLE Customers (
-                customer_id NUMBER GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
-                name VARCHAR2(120) NOT NULL,
-                phone VARCHAR2(20),
-                email VARCHAR2(120),
-                address VARCHAR2(300),
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-            """,
-            """
-            CREATE TABLE Medicines (
-                medicine_id NUMBER GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
-                name VARCHAR2(200) NOT NULL,
-                pharma_form VARCHAR2(50),
-                strength VARCHAR2(50),
-                unit_price NUMBER(10,2) DEFAULT 0,
-                supplier_id NUMBER,
-                expiry_date DATE,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                is_active CHAR(1) DEFAULT 'Y' CHECK (is_active IN ('Y','N')),
-                retired_at TIMESTAMP NULL,
-                CONSTRAINT fk_med_supplier FOREIGN KEY (supplier_id) REFERENCES Suppliers(supplier_id),
-                CONSTRAINT unique_medicine_entry UNIQUE (name, pharma_form, strength, expiry_date)
-            )
-            """,
-            """
-            CREATE TABLE Inventory (
-                medicine_id NUMBER PRIMARY KEY,
-                qty NUMBER DEFAULT 0,
-                min_threshold NUMBER DEFAULT 10,
-                CONSTRAINT fk_inv_med FOREIGN KEY(medicine_id) REFERENCES Medicines(medicine_id)
-            )
-            """,
-            """
-            CREATE TABLE Orders (
-                order_id NUMBER GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
-                order_date DATE DEFAULT SYSDATE,
-                customer_id NUMBER,
-                total_amount NUMBER(12,2),
-                status VARCHAR2(20),
-                CONSTRAINT fk_ord_cust FOREIGN KEY(customer_id) REFERENCES Customers(customer_id)
-            )
-            """,
-            """
-            CREATE TABLE Order_Items (
-                order_item_id NUMBER GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
-                order_id NUMBER,
-                medicine_id NUMBER,
-                quantity NUMBER,
-                unit_price NUMBER(10,2),
-                line_total NUMBER(12,2),
-                CONSTRAINT fk_oi_order FOREIGN KEY(order_id) REFERENCES Orders(order_id)
-            )
-            """,
-            """
-            CREATE TABLE Audit_Log (
-                audit_id NUMBER GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
-                action_by VARCHAR2(100),
-                action VARCHAR2(100),
-                object_name VARCHAR2(100),
-                details VARCHAR2(2000),
-                action_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-            )
-            """
-        ]
-        
-        for table_sql in tables:
-            try_execute(cursor, table_sql, silent_on_exists=True)
-        
-        # Add price constraint
-        try:
-            cursor.execute("ALTER TABLE Medicines ADD (CONSTRAINT chk_price_nonneg CHECK (unit_price >= 0))")
-        except:
-            pass  # ignore if exists
-        
-        conn.commit()
-        cursor.close()
+        applied = migrations.migrate(conn, deferred=deferred)
         conn.close()
-        
-        return jsonify({'message': 'Schema setup completed successfully'}), 200
+        record_migration_result(deferred)
+        if applied:
+            invalidate_schema_capabilities()
+            bump_table_versions('SUPPLIERS', 'CUSTOMERS', 'MEDICINES', 'INVENTORY', 'ORDERS')
+        
+        payload = {
+            'message': 'Schema setup completed successfully',
+            'version': migrations.LATEST_VERSION,
+            'applied': applied
+        }
+        if deferred:
+            payload['deferred'] = deferred
+        return jsonify(payload), 200
     except Exception as e:
         if conn:
             conn.rollback()
+        record_migration_result(deferred, e)
+        invalidate_schema_capabilities()
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/admin/migrations', methods=['GET'])
+def get_migrations():
+    """List schema migrations with when each was applied"""
+    conn = get_db_connection()
+    if not conn:
+        return jsonify({'error': 'Database connection failed'}), 500
+    
+    try:
+        status = migrations.migration_status(conn)
+        conn.close()
+        
+        for m in status:
+            m['applied_at'] = m['applied_at'].isoformat() if m['applied_at'] else None
+            if not m['applied_at'] and m['version'] in _deferred_migrations:
+                m['error'] = _deferred_migrations[m['version']]
+        current = max([m['version'] for m in status if m['applied_at']], default=0)
+        return jsonify({
+            'current_version': current,
+            'latest_version': migrations.LATEST_VERSION,
+            'migrations': status
+        })
+    except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @app.route('/api/admin/create-triggers', methods=['POST'])
@@ -977,50 +2269,7 @@ def create_triggers():
     try:
         cursor = conn.cursor()
         
-        triggers = [
-            """
-            CREATE OR REPLACE TRIGGER trg_med_before_ins
-            BEFORE INSERT OR UPDATE ON Medicines
-            FOR EACH ROW
-            DECLARE
-            BEGIN
-                IF :NEW.expiry_date IS NOT NULL AND :NEW.expiry_date < TRUNC(SYSDATE) THEN
-                    DBMS_OUTPUT.PUT_LINE('Warning: Medicine "' || :NEW.name || 
-                                 '" has an expired date (' || TO_CHAR(:NEW.expiry_date, 'YYYY-MM-DD') || ').');
-                END IF;
-            END;
-            """,
-            """
-            CREATE OR REPLACE TRIGGER trg_audit_orders
-            AFTER INSERT OR UPDATE OR DELETE ON Orders
-            FOR EACH ROW
-            BEGIN
-                IF INSERTING THEN
-                    INSERT INTO Audit_Log(action_by, action, object_name, details) VALUES(USER,'INSERT','ORDERS','Order placed or inserted');
-                ELSIF UPDATING THEN
-                    INSERT INTO Audit_Log(action_by, action, object_name, details) VALUES(USER,'UPDATE','ORDERS','Order updated');
-                ELSIF DELETING THEN
-                    INSERT INTO Audit_Log(action_by, action, object_name, details) VALUES(USER,'DELETE','ORDERS','Order deleted');
-                END IF;
-            END;
-            """,
-            """
-            CREATE OR REPLACE TRIGGER trg_audit_medicines
-            AFTER INSERT OR UPDATE OR DELETE ON Medicines
-            FOR EACH ROW
-            BEGIN
-                IF INSERTING THEN
-                    INSERT INTO Audit_Log(action_by, action, object_name, details) VALUES(USER,'INSERT','MEDICINES','Inserted ' || :NEW.name);
-                ELSIF UPDATING THEN
-                    INSERT INTO Audit_Log(action_by, action, object_name, details) VALUES(USER,'UPDATE','MEDICINES','Updated ' || :NEW.name);
-                ELSIF DELETING THEN
-                    INSERT INTO Audit_Log(action_by, action, object_name, details) VALUES(USER,'DELETE','MEDICINES','Deleted ' || :OLD.name);
-                END IF;
-            END;
-            """
-        ]
-        
-        for trigger_sql in triggers:
+        for _, trigger_sql in migrations.TRIGGERS:
             try_execute(cursor, trigger_sql)
         
         conn.commit()
@@ -1043,86 +2292,12 @@ def create_procedures():
     try:
         cursor = conn.cursor()
         
-        procedure_sql = """
-        CREATE OR REPLACE PROCEDURE sp_place_order (
-            p_customer_id IN NUMBER,
-            p_items       IN "SYS"."ODCINUMBERLIST",
-            p_qtys        IN "SYS"."ODCINUMBERLIST"
-        ) IS
-            v_unit_price   NUMBER(10,2);
-            v_total        NUMBER(12,2) := 0;
-            v_line_total   NUMBER(12,2);
-            v_order_id     NUMBER;
-            v_stock        NUMBER;
-            v_expiry       DATE;
-        BEGIN
-            IF p_items.COUNT != p_qtys.COUNT THEN
-                RAISE_APPLICATION_ERROR(-20060, 'Items and quantities length mismatch');
-            END IF;
-
-            FOR i IN 1 .. p_items.COUNT LOOP
-                BEGIN
-                    SELECT unit_price, expiry_date
-                    INTO v_unit_price, v_expiry
-                    FROM Medicines
-                    WHERE medicine_id = p_items(i);
-                EXCEPTION
-                    WHEN NO_DATA_FOUND THEN
-                        RAISE_APPLICATION_ERROR(-20063, 'Medicine not found: ' || p_items(i));
-                END;
-
-                IF v_expiry IS NOT NULL AND v_expiry < TRUNC(SYSDATE) THEN
-                    RAISE_APPLICATION_ERROR(-20061, 'Cannot sell expired medicine id ' || p_items(i));
-                END IF;
-
-                BEGIN
-                    SELECT qty INTO v_stock
-                    FROM Inventory
-                    WHERE medicine_id = p_items(i)
-                    FOR UPDATE;
-                EXCEPTION
-                    WHEN NO_DATA_FOUND THEN
-                        RAISE_APPLICATION_ERROR(-20064, 'Inventory row not found for medicine id ' || p_items(i));
-                END;
-
-                IF v_stock < p_qtys(i) THEN
-                    RAISE_APPLICATION_ERROR(-20062, 'Insufficient stock for medicine id ' || p_items(i));
-                END IF;
-
-                v_line_total := v_unit_price * p_qtys(i);
-                v_total := v_total + v_line_total;
-            END LOOP;
-
-            INSERT INTO Orders (customer_id, total_amount, status)
-            VALUES (p_customer_id, v_total, 'COMPLETED')
-            RETURNING order_id INTO v_order_id;
-
-            FOR i IN 1 .. p_items.COUNT LOOP
-                SELECT unit_price INTO v_unit_price FROM Medicines WHERE medicine_id = p_items(i);
-
-                INSERT INTO Order_Items (order_id, medicine_id, quantity, unit_price, line_total)
-                VALUES (v_order_id, p_items(i), p_qtys(i), v_unit_price, v_unit_price * p_qtys(i));
-
-                UPDATE Inventory
-                SET qty = qty - p_qtys(i)
-                WHERE medicine_id = p_items(i);
-            END LOOP;
-
-            INSERT INTO Audit_Log (action_by, action, object_name, details)
-            VALUES (USER, 'PROC', 'sp_place_order', 'Order ' || v_order_id || ' placed for customer ' || NVL(TO_CHAR(p_customer_id),'UNKNOWN'));
-
-            COMMIT;
-        EXCEPTION
-            WHEN OTHERS THEN
-                ROLLBACK;
-                RAISE;
-        END sp_place_order;
-        """
-        
-        try_execute(cursor, procedure_sql)
+        for _, procedure_sql in migrations.PROCEDURES:
+            try_execute(cursor, procedure_sql)
         conn.commit()
         cursor.close()
         conn.close()
+        invalidate_schema_capabilities()
         
         return jsonify({'message': 'Stored procedures created successfully'}), 200
     except Exception as e:
@@ -1140,23 +2315,12 @@ def create_views():
     try:
         cursor = conn.cursor()
         
-        view_sql = """
-        CREATE OR REPLACE VIEW vw_inventory_summary AS
-            SELECT m.medicine_id,
-                   NVL(m.name,'') AS name,
-                   NVL(m.pharma_form,'') AS pharma_form,
-                   NVL(m.strength,'') AS strength,
-                   NVL(m.unit_price,0) AS unit_price,
-                   NVL(i.qty,0) AS qty,
-                   m.expiry_date,
-                   NVL(m.is_active,'Y') AS is_active
-            FROM Medicines m LEFT JOIN Inventory i ON m.medicine_id = i.medicine_id
-        """
-        
-        try_execute(cursor, view_sql)
+        for _, view_sql in migrations.VIEWS:
+            try_execute(cursor, view_sql)
         conn.commit()
         cursor.close()
         conn.close()
+        invalidate_schema_capabilities()
         
         return jsonify({'message': 'Views created successfully'}), 200
     except Exception as e:
@@ -1180,28 +2344,24 @@ def seed_data():
             ("Sun Pharma", "support@sunpharma.com", "+91-9123456780")
         ]
         
-        for name, email, phone in suppliers:
-            cursor.execute("""
-                SELECT supplier_id FROM Suppliers
-                WHERE LOWER(name) = LOWER(:1)
-                   OR LOWER(contact_email) = LOWER(:2)
-                   OR phone = :3
-            """, (name, email, phone))
-            if not cursor.fetchone():
-                try_execute(cursor, "INSERT INTO Suppliers(name, contact_email, phone) VALUES(:1,:2,:3)",
-                           (name, email, phone))
+        # Suppliers already on file are rejected by the uq_suppliers_* indexes
+        cursor.executemany("INSERT INTO Suppliers(name, contact_email, phone) VALUES(:1,:2,:3)",
+                           suppliers, batcherrors=True)
+        for err in cursor.getbatcherrors():
+            if "ORA-00001" not in err.message:
+                print(f"SQL Error: {err.message}")
         
         conn.commit()
         
         # Customers
         cursor.execute("""
-            SELECT customer_id FROM Customers
-            WHERE LOWER(name) = LOWER(:1)
-               OR LOWER(email) = LOWER(:2)
-        """, ("John Doe", "john@example.com"))
-        if not cursor.fetchone():
-            try_execute(cursor, "INSERT INTO Customers(name, phone, email, address) VALUES(:1,:2,:3,:4)",
-                       ("John Doe", "9998887776", "john@example.com", "23 Green Street, Vellore"))
+            MERGE INTO Customers c
+            USING (SELECT :1 AS name, :2 AS phone, :3 AS email, :4 AS address FROM dual) s
+            ON (LOWER(c.email) = LOWER(s.email))
+            WHEN NOT MATCHED THEN
+                INSERT (name, phone, email, address)
+                VALUES (s.name, s.phone, s.email, s.address)
+        """, ("John Doe", "9998887776", "john@example.com", "23 Green Street, Vellore"))
         
         # Medicines
         medicines = [
@@ -1210,19 +2370,19 @@ def seed_data():
             ("OldSyrup", "Syrup", "100 ml", 40.00, 2, "2020-01-01")
         ]
         
-        for name, form, strength, price, sup, expiry in medicines:
-            cursor.execute("""
-                SELECT medicine_id FROM Medicines
-                WHERE LOWER(name) = LOWER(:1)
-                  AND LOWER(pharma_form) = LOWER(:2)
-                  AND LOWER(strength) = LOWER(:3)
-                  AND TO_CHAR(expiry_date, 'YYYY-MM-DD') = :4
-            """, (name, form, strength, expiry))
-            if not cursor.fetchone():
-                try_execute(cursor, """
-                    INSERT INTO Medicines(name, pharma_form, strength, unit_price, supplier_id, expiry_date)
-                    VALUES(:1,:2,:3,:4,:5,TO_DATE(:6,'YYYY-MM-DD'))
-                """, (name, form, strength, price, sup, expiry))
+        # Matched on the uq_medicines_dedupe key
+        cursor.executemany("""
+            MERGE INTO Medicines m
+            USING (SELECT :1 AS name, :2 AS pharma_form, :3 AS strength, :4 AS unit_price,
+                          :5 AS supplier_id, TO_DATE(:6,'YYYY-MM-DD') AS expiry_date FROM dual) s
+            ON (LOWER(m.name) = LOWER(s.name)
+                AND LOWER(m.pharma_form) = LOWER(s.pharma_form)
+                AND LOWER(m.strength) = LOWER(s.strength)
+                AND TRUNC(m.expiry_date) = s.expiry_date)
+            WHEN NOT MATCHED THEN
+                INSERT (name, pharma_form, strength, unit_price, supplier_id, expiry_date)
+                VALUES (s.name, s.pharma_form, s.strength, s.unit_price, s.supplier_id, s.expiry_date)
+        """, medicines)
         
         conn.commit()
         
@@ -1236,6 +2396,7 @@ def seed_data():
                            (mid, 50, 10))
         
         conn.commit()
+        bump_table_versions('SUPPLIERS', 'CUSTOMERS', 'MEDICINES', 'INVENTORY')
         cursor.close()
         conn.close()
         
@@ -1260,23 +2421,8 @@ def cleanup_db():
         if not data.get('confirm'):
             return jsonify({'error': 'Confirmation required. Send {"confirm": true} in request body.'}), 400
         
-        stmts = [
-            "DROP TRIGGER trg_audit_medicines",
-            "DROP TRIGGER trg_audit_orders",
-            "DROP TRIGGER trg_med_before_ins",
-            "DROP PROCEDURE sp_place_order",
-            "DROP VIEW vw_inventory_summary",
-            "DROP TABLE Order_Items CASCADE CONSTRAINTS",
-            "DROP TABLE Orders CASCADE CONSTRAINTS",
-            "DROP TABLE Inventory CASCADE CONSTRAINTS",
-            "DROP TABLE Medicines CASCADE CONSTRAINTS",
-            "DROP TABLE Customers CASCADE CONSTRAINTS",
-            "DROP TABLE Suppliers CASCADE CONSTRAINTS",
-            "DROP TABLE Audit_Log CASCADE CONSTRAINTS"
-        ]
-        
         results = []
-        for s in stmts:
+        for s in migrations.DROP_STATEMENTS:
             try:
                 cursor.execute(s)
                 results.append(f"Dropped: {s}")
@@ -1284,8 +2430,10 @@ def cleanup_db():
                 results.append(f"Could not drop: {s} -> {str(e)}")
         
         conn.commit()
+        bump_table_versions('SUPPLIERS', 'CUSTOMERS', 'MEDICINES', 'INVENTORY', 'ORDERS')
         cursor.close()
         conn.close()
+        invalidate_schema_capabilities()
         
         return jsonify({'message': 'Cleanup attempted', 'results': results}), 200
     except Exception as e:
@@ -1293,30 +2441,336 @@ def cleanup_db():
             conn.rollback()
         return jsonify({'error': str(e)}), 500
 
+@app.route('/api/admin/rebuild-sales-rollup', methods=['POST'])
+def rebuild_sales_rollup():
+    """Recompute Daily_Sales from Orders (backfill, or repair after drift)"""
+    conn = get_db_connection()
+    if not conn:
+        return jsonify({'error': 'Database connection failed'}), 500
+    
+    try:
+        cursor = conn.cursor()
+        
+        for statement in migrations.REBUILD_SALES_ROLLUP:
+            cursor.execute(statement)
+        rows = cursor.rowcount
+        conn.commit()
+        
+        cursor.close()
+        conn.close()
+        
+        return jsonify({'message': 'Daily sales rollup rebuilt', 'rows': rows}), 200
+    except Exception as e:
+        if conn:
+            conn.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/admin/rebuild-supplier-stats', methods=['POST'])
+def rebuild_supplier_stats():
+    """Recompute Supplier_Stats from Medicines (backfill, or repair after drift)"""
+    conn = get_db_connection()
+    if not conn:
+        return jsonify({'error': 'Database connection failed'}), 500
+    
+    try:
+        cursor = conn.cursor()
+        
+        for statement in migrations.REBUILD_SUPPLIER_STATS:
+            cursor.execute(statement)
+        rows = cursor.rowcount
+        conn.commit()
+        bump_table_versions('SUPPLIERS')
+        
+        cursor.close()
+        conn.close()
+        
+        return jsonify({'message': 'Supplier stats rebuilt', 'rows': rows}), 200
+    except Exception as e:
+        if conn:
+            conn.rollback()
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/admin/schema-cache/invalidate', methods=['POST'])
+def invalidate_schema_cache():
+    """Forget cached schema capabilities after an out-of-band migration"""
+    global _migration_error
+    invalidate_schema_capabilities()
+    if _migration_error:
+        # Ready again once the required migrations have been applied elsewhere
+        conn = get_db_connection()
+        if conn:
+            try:
+                done = migrations.applied_versions(conn.cursor())
+                if done.issuperset(range(1, migrations.REQUIRED_VERSION + 1)):
+                    _migration_error = None
+            except Exception as e:
+                print(f"Could not read the applied migrations: {e}")
+            finally:
+                conn.close()
+    return jsonify({'message': 'Schema capability cache invalidated'}), 200
+
+@app.route('/api/admin/cache/invalidate', methods=['POST'])
+def invalidate_cache():
+    """Mark tables changed by an out-of-process writer (scripts, SQL*Plus)"""
+    data = request.get_json(silent=True) or {}
+    tables = [t.upper() for t in data.get('tables') or
+              ['SUPPLIERS', 'CUSTOMERS', 'MEDICINES', 'INVENTORY', 'ORDERS']]
+    bump_table_versions(*tables)
+    return jsonify({'message': 'Cached reads invalidated', 'tables': tables}), 200
+
+@app.route('/api/admin/cache-stats', methods=['GET'])
+def cache_stats():
+    """Response cache hit/miss counters, to check the hit rate"""
+    with _response_cache_lock:
+        stats = dict(_response_cache_stats)
+        stats['entries'] = len(_response_cache)
+    
+    lookups = stats['hits'] + stats['misses']
+    stats['hit_rate'] = round(stats['hits'] / lookups, 4) if lookups else 0
+    stats['ttl_seconds'] = RESPONSE_CACHE_TTL
+    stats['max_entries'] = RESPONSE_CACHE_SIZE
+    return jsonify(stats)
+
+@app.route('/api/admin/holds/sweep', methods=['POST'])
+def sweep_holds():
+    """Release expired stock holds now instead of waiting for the sweeper"""
+    try:
+        released = sweep_expired_holds()
+        return jsonify({'message': f'{released} expired holds released', 'released': released}), 200
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@app.route('/api/admin/pool-stats', methods=['GET'])
+def pool_stats():
+    """Session pool usage, for sizing DB_POOL_MIN / DB_POOL_MAX"""
+    try:
+        pool = get_pool()
+        with _pool_lock:
+            stats = dict(_pool_stats)
+
+        acquires = stats['acquires']
+        return jsonify({
+            'min': pool.min,
+            'max': pool.max,
+            'increment': pool.increment,
+            'open': pool.opened,
+            'busy': pool.busy,
+            'wait_timeout_ms': DB_POOL_WAIT_TIMEOUT,
+            'acquires': acquires,
+            'timeouts': stats['timeouts'],
+            'errors': stats['errors'],
+            'avg_wait_ms': round(stats['total_wait_ms'] / acquires, 3) if acquires else 0,
+            'max_wait_ms': round(stats['max_wait_ms'], 3)
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+def plan_audit_queries(cursor):
+    """(route, sql) for the SELECTs behind the read routes.
+
+    Builder arguments only pick the SQL variant (filters, keyset page);
+    the plans are explained without bind values.
+    """
+    caps = get_schema_capabilities(cursor)
+    has_is_active = 'IS_ACTIVE' in caps['columns'].get('MEDICINES', set())
+    now = datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')
+    queries = [
+        ('GET /api/inventory',) + inventory_query(has_is_active),
+        ('GET /api/inventory?paginate',) + inventory_query(has_is_active, after_id=0, limit=DEFAULT_PAGE_SIZE),
+        ('GET /api/inventory/low-stock',) + low_stock_query(),
+        ('GET /api/inventory/expiring',) + expiry_report.expiring_query(EXPIRY_HORIZON_DAYS),
+        ('GET /api/orders',) + orders_query(),
+        ('GET /api/orders?paginate',) + orders_query((datetime.now(), 0), DEFAULT_PAGE_SIZE),
+        ('GET /api/holds/<cart_id>',) + cart_holds_query('cart'),
+        ('GET /api/suppliers',) + suppliers_query(),
+        ('GET /api/suppliers/performance',) + supplier_performance_query('SUPPLIER_STATS' in caps['columns'],
+                                                                             has_is_active),
+        ('GET /api/customers',) + customers_query(),
+        ('GET /api/reports/sales-summary',) + sales_summary_query('DAILY_SALES' in caps['columns'], 7),
+        ('GET /api/reports/above-average-price',) + above_average_price_query(),
+        ('GET /api/reports/inventory-any-threshold',) + inventory_any_threshold_query(),
+        ('GET /api/reports/union-intersect', UNION_NAMES_QUERY, {}),
+        ('GET /api/reports/union-intersect', INTERSECT_NAMES_QUERY, {}),
+        ('GET /api/reports/audit-log',) + audit_log_query(50),
+        ('GET /api/reports/audit-log?from&to&action&object_name&after',)
+            + audit_log_query(DEFAULT_PAGE_SIZE + 1, now, now, {'action': 'UPDATE', 'object_name': 'INVENTORY'},
+                              (now, 0))
+    ]
+    return [(route, sql) for route, sql, _ in queries]
+
+def explain_plan(cursor, sql):
+    """EXPLAIN PLAN one statement; return its plan lines and fully scanned tables"""
+    # plan_table.statement_id is VARCHAR2(30); placeholders stay unbound
+    statement_id = uuid.uuid4().hex[:30]
+    cursor.execute(f"EXPLAIN PLAN SET STATEMENT_ID = '{statement_id}' FOR {sql}")
+    cursor.execute("""
+        SELECT id, depth, operation, options, object_name, cost, cardinality
+        FROM plan_table
+        WHERE statement_id = :1
+        ORDER BY id
+    """, (statement_id,))
+    
+    plan = []
+    full_scans = []
+    for row in cursor.fetchall():
+        step = ' '.join(part for part in (row[2], row[3]) if part)
+        plan.append({
+            'id': row[0],
+            'step': '  ' * (row[1] or 0) + step,
+            'object_name': row[4],
+            'cost': row[5],
+            'rows': row[6]
+        })
+        if row[2] == 'TABLE ACCESS' and 'FULL' in (row[3] or ''):
+            full_scans.append(row[4])
+    return plan, full_scans
+
+@app.route('/api/admin/query-plans', methods=['GET'])
+def query_plans():
+    """EXPLAIN PLAN every read route's SQL and flag full table scans.
+
+    On a small or freshly seeded schema the optimizer may still choose a
+    full scan over an available index; re-check after gathering stats.
+    """
+    conn = get_db_connection()
+    if not conn:
+        return jsonify({'error': 'Database connection failed'}), 500
+    
+    try:
+        cursor = conn.cursor()
+        results = []
+        for route, sql in plan_audit_queries(cursor):
+            entry = {'route': route, 'sql': ' '.join(sql.split())}
+            try:
+                entry['plan'], entry['full_scans'] = explain_plan(cursor, sql)
+            except cx_Oracle.DatabaseError as e:
+                error_obj, = e.args
+                entry['error'] = error_obj.message
+            results.append(entry)
+        
+        # Plans were only written to plan_table by this transaction
+        conn.rollback()
+        conn.close()
+        
+        return jsonify({
+            'queries': results,
+            'flagged': sum(1 for r in results if r.get('full_scans')),
+            'errors': sum(1 for r in results if 'error' in r)
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+# ==================== HEALTH & STATS ROUTES ====================
+
+STATS_TABLES = ('MEDICINES', 'SUPPLIERS', 'CUSTOMERS', 'ORDERS')
+_table_stats = None  # (cached_at datetime, monotonic expiry, {table: {...}})
+_table_stats_lock = threading.Lock()
+
+def get_table_stats(cursor, refresh=False):
+    """Row counts of STATS_TABLES, cached for STATS_CACHE_TTL seconds.
+
+    Counts come from the optimizer statistics (user_tables.num_rows, as of
+    last_analyzed); only a table that has never been analyzed is counted
+    with COUNT(*). Returns (cached_at, {table: {'rows', 'source', 'as_of'}}).
+    """
+    global _table_stats
+    with _table_stats_lock:
+        if _table_stats and not refresh and _table_stats[1] > time.monotonic():
+            return _table_stats[0], _table_stats[2]
+    
+    cursor.execute(f"""
+        SELECT table_name, num_rows, last_analyzed
+        FROM user_tables
+        WHERE table_name IN ({', '.join(f"'{t}'" for t in STATS_TABLES)})
+    """)
+    now = datetime.now()
+    tables = {}
+    for table_name, num_rows, last_analyzed in cursor.fetchall():
+        if num_rows is None:
+            cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
+            tables[table_name] = {'rows': cursor.fetchone()[0], 'source': 'count', 'as_of': now}
+        else:
+            tables[table_name] = {'rows': num_rows, 'source': 'optimizer_stats', 'as_of': last_analyzed}
+    
+    with _table_stats_lock:
+        _table_stats = (now, time.monotonic() + STATS_CACHE_TTL, tables)
+    return now, tables
+
+@app.route('/api/health/live', methods=['GET'])
+def health_live():
+    """Liveness probe: the process is up (no database access)"""
+    return jsonify({'status': 'alive'})
+
+@app.route('/api/health/ready', methods=['GET'])
+def health_ready():
+    """Readiness probe: the required migrations applied and a pooled session answers a ping"""
+    if _migration_error:
+        return jsonify({'status': 'unavailable', 'schema': 'migration failed',
+                        'error': _migration_error}), 503
+    conn = get_db_connection()
+    if not conn:
+        return jsonify({'status': 'unavailable', 'database': 'disconnected'}), 503
+    try:
+        conn.ping()
+        conn.close()
+        return jsonify({'status': 'ready', 'database': 'connected'})
+    except Exception as e:
+        return jsonify({'status': 'unavailable', 'database': 'ping failed', 'error': str(e)}), 503
+
+@app.route('/api/stats', methods=['GET'])
+def table_stats():
+    """Approximate row counts with their source and freshness.
+
+    Served from a cache (STATS_CACHE_TTL); ?refresh=true re-reads the
+    statistics. Run DBMS_STATS.GATHER_SCHEMA_STATS to move as_of forward.
+    """
+    refresh = request.args.get('refresh', 'false').lower() == 'true'
+    conn = get_db_connection()
+    if not conn:
+        return jsonify({'error': 'Database connection failed'}), 500
+    
+    try:
+        cursor = conn.cursor()
+        cached_at, tables = get_table_stats(cursor, refresh)
+        cursor.close()
+        conn.close()
+        
+        return jsonify({
+            'cached_at': cached_at.strftime('%Y-%m-%d %H:%M:%S'),
+            'tables': {
+                name.lower(): {
+                    'rows': info['rows'],
+                    'source': info['source'],
+                    'as_of': info['as_of'].strftime('%Y-%m-%d %H:%M:%S') if info['as_of'] else None
+                }
+                for name, info in tables.items()
+            }
+        })
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
 @app.route('/api/health', methods=['GET'])
 def health_check():
-    """Health check endpoint"""
+    """Health summary for the admin panel: a ping plus the cached row counts.
+
+    Load balancers should probe /api/health/live or /api/health/ready instead.
+    """
     conn = get_db_connection()
     if conn:
         try:
+            conn.ping()
             cursor = conn.cursor()
-            cursor.execute("SELECT COUNT(*) FROM Medicines")
-            med_count = cursor.fetchone()[0]
-            cursor.execute("SELECT COUNT(*) FROM Suppliers")
-            sup_count = cursor.fetchone()[0]
-            cursor.execute("SELECT COUNT(*) FROM Customers")
-            cust_count = cursor.fetchone()[0]
-            cursor.execute("SELECT COUNT(*) FROM Orders")
-            order_count = cursor.fetchone()[0]
+            cached_at, tables = get_table_stats(cursor)
             cursor.close()
             conn.close()
             return jsonify({
                 'status': 'healthy', 
                 'database': 'connected',
-                'medicines_count': med_count,
-                'suppliers_count': sup_count,
-                'customers_count': cust_count,
-                'orders_count': order_count
+                'medicines_count': tables.get('MEDICINES', {}).get('rows'),
+                'suppliers_count': tables.get('SUPPLIERS', {}).get('rows'),
+                'customers_count': tables.get('CUSTOMERS', {}).get('rows'),
+                'orders_count': tables.get('ORDERS', {}).get('rows'),
+                'counts_cached_at': cached_at.strftime('%Y-%m-%d %H:%M:%S')
             })
         except Exception as e:
             if conn:
@@ -1362,4 +2816,7 @@ def debug_tables():
         return jsonify({'error': str(e)}), 500
 
 if __name__ == '__main__':
+    if AUTO_MIGRATE:
+        migrate_schema()
+    warm_schema_capabilities()
     app.run(debug=True, port=5000)
\ No newline at end of file
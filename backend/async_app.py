@@ -0,0 +1,224 @@
+"""
+Async deployment mode of the pharmacy API.
+
+Serves the hot, database-bound routes (inventory and low-stock listings,
+order listing and order placement) as Quart coroutines on an oracledb
+asyncio session pool, so a request waiting on Oracle does not hold a
+thread. Every other route, and the paginated/streamed variants of the
+listings, is handed to the regular Flask app from app.py on a worker
+thread, so the whole API is available from one ASGI process.
+
+Run with an ASGI server, e.g.
+    hypercorn async_app:application --bind 0.0.0.0:5000
+"""
+
+import asyncio
+import random
+from urllib.parse import parse_qs
+
+import oracledb as cx_Oracle
+from hypercorn.middleware import AsyncioWSGIMiddleware
+from quart import Quart, jsonify, request, Response
+from werkzeug.exceptions import HTTPException
+
+import app as sync_app
+
+# Query args only the Flask routes understand (pagination, streaming)
+SYNC_ONLY_ARGS = {'after', 'paginate', 'limit', 'stream'}
+
+# Largest request body handed to the Flask app (catalog imports are uploads)
+SYNC_MAX_BODY_SIZE = 64 * 1024 * 1024
+
+app = Quart(__name__)
+_pool = None
+
+
+@app.before_serving
+async def open_pool():
+    """Create the asyncio session pool, sized like the sync one"""
+    global _pool
+    dsn = cx_Oracle.makedsn(sync_app.DB_HOST, sync_app.DB_PORT, service_name=sync_app.DB_SERVICE)
+    _pool = cx_Oracle.create_pool_async(
+        user=sync_app.DB_USER,
+        password=sync_app.DB_PASS,
+        dsn=dsn,
+        min=sync_app.DB_POOL_MIN,
+        max=sync_app.DB_POOL_MAX,
+        increment=sync_app.DB_POOL_INCREMENT,
+        getmode=cx_Oracle.POOL_GETMODE_TIMEDWAIT,
+        wait_timeout=sync_app.DB_POOL_WAIT_TIMEOUT
+    )
+    # Migrate and warm the shared schema capabilities (and the sync pool) off the loop
+    if sync_app.AUTO_MIGRATE:
+        await asyncio.to_thread(sync_app.migrate_schema)
+    await asyncio.to_thread(sync_app.warm_schema_capabilities)
+    sync_app.start_hold_sweeper()
+
+
+@app.after_request
+async def allow_cors(response):
+    """Same open CORS policy flask_cors gives the Flask routes"""
+    response.headers.setdefault('Access-Control-Allow-Origin', '*')
+    return response
+
+
+@app.after_serving
+async def close_pool():
+    await _pool.close()
+
+
+async def schema_capabilities():
+    """The schema capabilities cached by app.py, introspecting them if needed"""
+    if sync_app._schema_caps is None:
+        await asyncio.to_thread(sync_app.warm_schema_capabilities)
+    return sync_app._schema_caps or {'columns': {}, 'views': set(), 'procedures': set()}
+
+
+def table_etag(*tables):
+    """Weak ETag from the shared change counters, same format as etag_response()"""
+    return sync_app.make_etag(sync_app.get_table_versions(tables))
+
+
+# ==================== INVENTORY ROUTES ====================
+
+@app.route('/api/inventory', methods=['GET'])
+async def get_inventory():
+    """Get all inventory items"""
+    etag = table_etag('MEDICINES', 'INVENTORY')
+    if request.if_none_match.contains_weak(etag):
+        response = Response('', status=304)
+    else:
+        try:
+            caps = await schema_capabilities()
+            has_is_active = 'IS_ACTIVE' in caps['columns'].get('MEDICINES', set())
+            include_inactive = request.args.get('include_inactive', 'false').lower() == 'true'
+            query, binds = sync_app.inventory_query(has_is_active, include_inactive)
+
+            async with _pool.acquire() as conn:
+                cursor = conn.cursor()
+                await cursor.execute(query, binds)
+                columns = [col[0].lower() for col in cursor.description]
+                rows = await cursor.fetchall()
+
+            response = jsonify([sync_app.format_inventory_row(columns, row) for row in rows])
+        except Exception as e:
+            return jsonify({'error': str(e)}), 500
+    response.set_etag(etag, weak=True)
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+
+@app.route('/api/inventory/low-stock', methods=['GET'])
+async def get_low_stock():
+    """Get low stock items"""
+    try:
+        query, binds = sync_app.low_stock_query()
+        async with _pool.acquire() as conn:
+            cursor = conn.cursor()
+            await cursor.execute(query, binds)
+            columns = [col[0].lower() for col in cursor.description]
+            rows = await cursor.fetchall()
+
+        return jsonify([dict(zip(columns, row)) for row in rows])
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+# ==================== ORDERS ROUTES ====================
+
+@app.route('/api/orders', methods=['GET'])
+async def get_orders():
+    """Get all orders with items"""
+    try:
+        query, binds = sync_app.orders_query()
+        async with _pool.acquire() as conn:
+            cursor = conn.cursor()
+            cursor.arraysize = 1000
+            cursor.prefetchrows = 1000
+            await cursor.execute(query, binds)
+            rows = await cursor.fetchall()
+
+        return jsonify([order for order, _ in sync_app.group_order_rows(rows)])
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+async def callproc_with_retry(conn, cursor, procedure, args):
+    """Async twin of app.callproc_with_retry(); backs off without blocking the loop"""
+    for attempt in range(sync_app.ORDER_RETRY_ATTEMPTS + 1):
+        try:
+            return await cursor.callproc(procedure, args)
+        except cx_Oracle.DatabaseError as e:
+            error_obj, = e.args
+            retryable = any(code in error_obj.message for code in sync_app.RETRYABLE_ORDER_ERRORS)
+            if not retryable or attempt == sync_app.ORDER_RETRY_ATTEMPTS:
+                raise
+            await conn.rollback()
+            await asyncio.sleep(random.uniform(0, sync_app.ORDER_RETRY_BACKOFF_MS * (2 ** attempt)) / 1000.0)
+
+
+@app.route('/api/orders', methods=['POST'])
+async def create_order():
+    """Create a new order"""
+    data = await request.get_json()
+    try:
+        async with _pool.acquire() as conn:
+            cursor = conn.cursor()
+            if data.get('cart_id'):
+                # Sell what the cart holds; the stock was taken when the holds were placed
+                await callproc_with_retry(conn, cursor, 'sp_place_order_from_holds',
+                                          [data.get('customer_id'), data['cart_id']])
+                await conn.commit()
+                sync_app.bump_table_versions('ORDERS')
+            else:
+                procedure = sync_app.order_procedure(await schema_capabilities())
+
+                odci_type = await conn.gettype("SYS.ODCINUMBERLIST")
+                oracle_items = odci_type.newobject()
+                oracle_items.extend(data['items'])
+                oracle_qtys = odci_type.newobject()
+                oracle_qtys.extend(data['quantities'])
+
+                await callproc_with_retry(conn, cursor, procedure,
+                                          [data['customer_id'], oracle_items, oracle_qtys])
+                await conn.commit()
+                sync_app.bump_table_versions('ORDERS', 'INVENTORY')
+
+        return jsonify({'message': 'Order placed successfully'}), 201
+    except cx_Oracle.DatabaseError as e:
+        error_obj, = e.args
+        body, status = sync_app.order_error(error_obj.message.strip())
+        return jsonify(body), status
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+# ==================== DISPATCH ====================
+
+_sync_application = AsyncioWSGIMiddleware(sync_app.app, max_body_size=SYNC_MAX_BODY_SIZE)
+
+
+def served_async(scope):
+    """True if this HTTP request has an async route above"""
+    if scope['method'] == 'OPTIONS':
+        return False  # CORS preflight is answered by flask_cors
+    args = parse_qs(scope.get('query_string', b'').decode('latin-1'))
+    # ?paginate=false asks for the whole listing, which the async routes serve
+    unpaginated = args.get('paginate', [''])[-1].lower() == 'false'
+    if sync_app.PAGINATE_LISTS and not unpaginated:
+        return False  # listings default to pages, which only the Flask routes produce
+    if SYNC_ONLY_ARGS & (args.keys() - ({'paginate'} if unpaginated else set())):
+        return False
+    try:
+        app.url_map.bind('').match(scope['path'], method=scope['method'])
+        return True
+    except HTTPException:
+        return False
+
+
+async def application(scope, receive, send):
+    """ASGI entry point: async routes here, everything else in the Flask app"""
+    if scope['type'] == 'http' and not served_async(scope):
+        await _sync_application(scope, receive, send)
+    else:
+        await app(scope, receive, send)
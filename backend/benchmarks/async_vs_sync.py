@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Concurrent GET throughput: sync Flask app vs the async (Quart) app.
+
+Start both servers against the same database first, e.g.
+    API_CACHE_TTL=0 python app.py                            # sync, port 5000
+    hypercorn async_app:application --bind 127.0.0.1:5001    # async
+The sync server must run without its response cache (API_CACHE_TTL=0):
+the async routes query Oracle on every request, so cached sync reads
+would not be comparable. The script checks this before it starts.
+then run
+    python benchmarks/async_vs_sync.py [--sync URL] [--async URL]
+
+For each concurrency level, CONCURRENCY client threads each issue
+REQUESTS_PER_CLIENT requests to every path, and the script prints
+requests/sec, p50/p95 latency and the error count per server.
+"""
+
+import argparse
+import json
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from common import print_table
+
+PATHS = ['/api/inventory', '/api/inventory/low-stock', '/api/orders']
+CONCURRENCY = [10, 50, 200]
+REQUESTS_PER_CLIENT = 20
+
+
+def client(base_url, path, latencies, errors, lock):
+    for _ in range(REQUESTS_PER_CLIENT):
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(base_url + path, timeout=60) as response:
+                response.read()
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+        except Exception:
+            with lock:
+                errors.append(path)
+
+
+def run(base_url, path, concurrency):
+    """Hammer one path with `concurrency` clients; return (req/s, p50 ms, p95 ms, errors)"""
+    latencies, errors, lock = [], [], threading.Lock()
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        for _ in range(concurrency):
+            executor.submit(client, base_url, path, latencies, errors, lock)
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    if not latencies:
+        return 0, '-', '-', len(errors)
+    p50 = latencies[len(latencies) // 2] * 1000
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] * 1000
+    return len(latencies) / elapsed, f"{p50:.1f}", f"{p95:.1f}", len(errors)
+
+
+def response_cache_ttl(base_url):
+    """The sync server's response cache TTL, from /api/admin/cache-stats"""
+    with urllib.request.urlopen(base_url + '/api/admin/cache-stats', timeout=10) as response:
+        return json.load(response)['ttl_seconds']
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare sync and async API throughput")
+    parser.add_argument('--sync', default="http://127.0.0.1:5000", help="sync (Flask) server")
+    parser.add_argument('--async', dest='async_url', default="http://127.0.0.1:5001",
+                        help="async (Quart) server")
+    args = parser.parse_args()
+
+    if response_cache_ttl(args.sync) > 0:
+        print("The sync server caches responses; restart it with API_CACHE_TTL=0")
+        raise SystemExit(1)
+
+    results = []
+    for path in PATHS:
+        for concurrency in CONCURRENCY:
+            for mode, base_url in (("sync", args.sync), ("async", args.async_url)):
+                rps, p50, p95, errors = run(base_url, path, concurrency)
+                results.append((path, concurrency, mode, f"{rps:.1f}", p50, p95, errors))
+
+    print_table(["path", "clients", "mode", "req/s", "p50 ms", "p95 ms", "errors"], results)
+
+
+if __name__ == "__main__":
+    main()
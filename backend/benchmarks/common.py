@@ -0,0 +1,65 @@
+"""
+Shared helpers for the benchmark scripts in this folder.
+
+Run the scripts from the backend folder, e.g.
+    python benchmarks/orders_roundtrips.py
+They talk to the database configured in backend/.env, so point that at a
+scratch schema and not at a live store.
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import oracledb as cx_Oracle
+import app as pharmacy_app
+
+
+def connect():
+    """Open a plain (unpooled) session with the backend's credentials"""
+    dsn = cx_Oracle.makedsn(pharmacy_app.DB_HOST, pharmacy_app.DB_PORT,
+                            service_name=pharmacy_app.DB_SERVICE)
+    return cx_Oracle.connect(user=pharmacy_app.DB_USER, password=pharmacy_app.DB_PASS, dsn=dsn)
+
+
+def session_sid(conn):
+    """SID of the given session, for looking it up in V$SESSTAT"""
+    cursor = conn.cursor()
+    cursor.execute("SELECT SYS_CONTEXT('USERENV','SID') FROM dual")
+    sid = int(cursor.fetchone()[0])
+    cursor.close()
+    return sid
+
+
+def session_stats(monitor, sid, names=("SQL*Net roundtrips to/from client", "execute count")):
+    """Read the named V$SESSTAT counters of another session"""
+    cursor = monitor.cursor()
+    binds = {f"n{i}": name for i, name in enumerate(names)}
+    cursor.execute(f"""
+        SELECT sn.name, ss.value
+        FROM v$sesstat ss
+        JOIN v$statname sn ON ss.statistic# = sn.statistic#
+        WHERE ss.sid = :sid
+          AND sn.name IN ({', '.join(':' + k for k in binds)})
+    """, dict(binds, sid=sid))
+    stats = dict(cursor.fetchall())
+    cursor.close()
+    return stats
+
+
+def timed(fn, *args, **kwargs):
+    """Run fn once and return (result, elapsed seconds)"""
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+def print_table(headers, rows):
+    """Print rows as a fixed-width table"""
+    widths = [max(len(str(h)), *(len(str(r[i])) for r in rows)) for i, h in enumerate(headers)]
+    print("  ".join(str(h).ljust(w) for h, w in zip(headers, widths)))
+    print("  ".join("-" * w for w in widths))
+    for r in rows:
+        print("  ".join(str(v).ljust(w) for v, w in zip(r, widths)))
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Concurrency stress test for POST /api/orders on a few hot SKUs.
+
+Seeds HOT_SKUS throwaway medicines with INITIAL_STOCK units each. Then
+THREADS workers (one pooled session each) place orders for every hot SKU
+in a shuffled item order, until stock runs out or ORDERS_PER_THREAD is
+reached. Afterwards it checks that:
+  * no Inventory row went negative,
+  * sold units (Order_Items) + remaining stock == INITIAL_STOCK per SKU,
+  * no request failed with a deadlock or other 500.
+It prints throughput and the outcome counts. Everything it created is
+deleted again at the end.
+"""
+
+import random
+import threading
+from collections import Counter
+
+from common import pharmacy_app, connect, timed, print_table
+
+THREADS = 16
+HOT_SKUS = 3
+INITIAL_STOCK = 500
+ORDERS_PER_THREAD = 100
+
+
+def seed(cursor):
+    """Create the hot medicines and a customer; return (medicine_ids, customer_id)"""
+    medicine_ids = []
+    for i in range(HOT_SKUS):
+        id_var = cursor.var(int)
+        cursor.execute("""
+            INSERT INTO Medicines (name, pharma_form, strength, unit_price, expiry_date)
+            VALUES (:1, 'Tablet', '1 mg', 1, ADD_MONTHS(TRUNC(SYSDATE), 24))
+            RETURNING medicine_id INTO :2
+        """, (f"Hot SKU {i}", id_var))
+        medicine_ids.append(id_var.getvalue()[0])
+    cursor.executemany("INSERT INTO Inventory (medicine_id, qty, min_threshold) VALUES (:1, :2, 0)",
+                       [(mid, INITIAL_STOCK) for mid in medicine_ids])
+
+    customer_var = cursor.var(int)
+    cursor.execute("""
+        INSERT INTO Customers (name) VALUES ('Contention Customer')
+        RETURNING customer_id INTO :cid
+    """, cid=customer_var)
+    return medicine_ids, customer_var.getvalue()[0]
+
+
+def worker(customer_id, medicine_ids, outcomes, lock):
+    client = pharmacy_app.app.test_client()
+    local = Counter()
+    for _ in range(ORDERS_PER_THREAD):
+        items = medicine_ids[:]
+        random.shuffle(items)
+        response = client.post('/api/orders', json={
+            'customer_id': customer_id,
+            'items': items,
+            'quantities': [1] * len(items)
+        })
+        if response.status_code == 201:
+            local['placed'] += 1
+        elif response.status_code == 400 and 'Insufficient stock' in response.get_json().get('error', ''):
+            local['out of stock'] += 1
+            break
+        else:
+            local[f"{response.status_code}: {response.get_json().get('error', '')[:60]}"] += 1
+    with lock:
+        outcomes.update(local)
+
+
+def main():
+    # One pooled session per worker, so they really contend in the database
+    pharmacy_app.DB_POOL_MIN = THREADS
+    pharmacy_app.DB_POOL_MAX = THREADS
+
+    setup = connect()
+    cursor = setup.cursor()
+    medicine_ids, customer_id = seed(cursor)
+    setup.commit()
+
+    outcomes = Counter()
+    lock = threading.Lock()
+    threads = [threading.Thread(target=worker, args=(customer_id, medicine_ids, outcomes, lock))
+               for _ in range(THREADS)]
+    try:
+        def run():
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        _, elapsed = timed(run)
+
+        cursor.execute(f"""
+            SELECT i.medicine_id, i.qty,
+                   (SELECT NVL(SUM(oi.quantity), 0)
+                    FROM Order_Items oi JOIN Orders o ON o.order_id = oi.order_id
+                    WHERE oi.medicine_id = i.medicine_id AND o.customer_id = :cid)
+            FROM Inventory i
+            WHERE i.medicine_id IN ({', '.join(str(mid) for mid in medicine_ids)})
+            ORDER BY i.medicine_id
+        """, cid=customer_id)
+        stock_rows = cursor.fetchall()
+    finally:
+        cursor.execute("""
+            DELETE FROM Order_Items
+            WHERE order_id IN (SELECT order_id FROM Orders WHERE customer_id = :1)
+        """, (customer_id,))
+        cursor.execute("DELETE FROM Orders WHERE customer_id = :1", (customer_id,))
+        cursor.execute("DELETE FROM Customers WHERE customer_id = :1", (customer_id,))
+        cursor.executemany("DELETE FROM Inventory WHERE medicine_id = :1", [(mid,) for mid in medicine_ids])
+        cursor.executemany("DELETE FROM Medicines WHERE medicine_id = :1", [(mid,) for mid in medicine_ids])
+        setup.commit()
+        setup.close()
+
+    print_table(["medicine_id", "remaining", "sold", "consistent"],
+                [(mid, qty, sold, "yes" if qty >= 0 and qty + sold == INITIAL_STOCK else "NO")
+                 for mid, qty, sold in stock_rows])
+    print()
+    print_table(["outcome", "count"], sorted(outcomes.items()))
+    print(f"\n{outcomes['placed']} orders in {elapsed:.2f}s = {outcomes['placed'] / elapsed:.1f} orders/sec "
+          f"with {THREADS} threads on {HOT_SKUS} hot SKUs")
+
+    oversold = any(qty < 0 or qty + sold != INITIAL_STOCK for _, qty, sold in stock_rows)
+    failed = any(key not in ('placed', 'out of stock') for key in outcomes)
+    if oversold or failed:
+        print("FAILED: oversell or unexpected errors")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
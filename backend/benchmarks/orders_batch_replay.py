@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Replaying buffered till sales: one POST /api/orders per order vs a single
+POST /api/orders/batch.
+
+Seeds a throwaway customer and medicine with plenty of stock, replays
+REPLAY_SIZE 3-line orders both ways through Flask's test client and
+prints orders/sec for each. The benchmark rows are deleted again at the end.
+"""
+
+from common import pharmacy_app, connect, timed, print_table
+
+REPLAY_SIZE = 500
+LINES_PER_ORDER = 3
+
+
+def replay_one_by_one(client, orders):
+    for order in orders:
+        response = client.post('/api/orders', json=order)
+        if response.status_code != 201:
+            raise RuntimeError(response.get_json())
+
+
+def replay_batch(client, orders):
+    response = client.post('/api/orders/batch', json={'orders': orders})
+    body = response.get_json()
+    if response.status_code != 200 or body['failed']:
+        raise RuntimeError(body)
+
+
+def main():
+    setup = connect()
+    cursor = setup.cursor()
+    medicine_var = cursor.var(int)
+    cursor.execute("""
+        INSERT INTO Medicines (name, pharma_form, strength, unit_price, expiry_date)
+        VALUES ('Benchmark Medicine', 'Tablet', '1 mg', 1, ADD_MONTHS(TRUNC(SYSDATE), 24))
+        RETURNING medicine_id INTO :mid
+    """, mid=medicine_var)
+    medicine_id = medicine_var.getvalue()[0]
+    cursor.execute("INSERT INTO Inventory (medicine_id, qty, min_threshold) VALUES (:1, 1000000000, 0)",
+                   (medicine_id,))
+    customer_var = cursor.var(int)
+    cursor.execute("""
+        INSERT INTO Customers (name) VALUES ('Benchmark Customer')
+        RETURNING customer_id INTO :cid
+    """, cid=customer_var)
+    customer_id = customer_var.getvalue()[0]
+    setup.commit()
+
+    orders = [{'customer_id': customer_id,
+               'items': [medicine_id] * LINES_PER_ORDER,
+               'quantities': [1] * LINES_PER_ORDER} for _ in range(REPLAY_SIZE)]
+    client = pharmacy_app.app.test_client()
+    results = []
+    try:
+        for label, replay in [("POST /api/orders x N", replay_one_by_one),
+                              ("POST /api/orders/batch", replay_batch)]:
+            _, elapsed = timed(replay, client, orders)
+            results.append((label, REPLAY_SIZE, f"{elapsed:.2f}", f"{REPLAY_SIZE / elapsed:.1f}"))
+    finally:
+        cursor.execute("""
+            DELETE FROM Order_Items
+            WHERE order_id IN (SELECT order_id FROM Orders WHERE customer_id = :1)
+        """, (customer_id,))
+        cursor.execute("DELETE FROM Orders WHERE customer_id = :1", (customer_id,))
+        cursor.execute("DELETE FROM Customers WHERE customer_id = :1", (customer_id,))
+        cursor.execute("DELETE FROM Inventory WHERE medicine_id = :1", (medicine_id,))
+        cursor.execute("DELETE FROM Medicines WHERE medicine_id = :1", (medicine_id,))
+        setup.commit()
+        setup.close()
+
+    print_table(["replay", "orders", "seconds", "orders/sec"], results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Round trips per GET /api/orders as the number of orders grows.
+
+Seeds batches of 3-item orders for a throwaway customer, calls the route
+through Flask's test client after each batch and reads the server-side
+round-trip and execute counters of the (single) pooled session. The
+statement count stays at 1 and round trips only grow with the fetch
+batches (rows / arraysize), not with one query per order.
+The benchmark rows are deleted again at the end.
+"""
+
+from common import pharmacy_app, connect, session_sid, session_stats, timed, print_table
+
+ORDER_STEPS = [100, 1000, 10000]
+ITEMS_PER_ORDER = 3
+
+
+def seed_orders(cursor, customer_id, medicine_ids, count):
+    """Add `count` orders with ITEMS_PER_ORDER items each, set-based"""
+    cursor.execute("""
+        INSERT INTO Orders (customer_id, total_amount, status)
+        SELECT :cid, 0, 'BENCH' FROM dual CONNECT BY LEVEL <= :n
+    """, cid=customer_id, n=count)
+    cursor.executemany("""
+        INSERT INTO Order_Items (order_id, medicine_id, quantity, unit_price, line_total)
+        SELECT o.order_id, :mid, 1, 1, 1
+        FROM Orders o
+        WHERE o.customer_id = :cid
+          AND (SELECT COUNT(*) FROM Order_Items oi WHERE oi.order_id = o.order_id) < :pos
+    """, [{'mid': medicine_ids[i % len(medicine_ids)], 'cid': customer_id, 'pos': i + 1}
+          for i in range(ITEMS_PER_ORDER)])
+
+
+def main():
+    # One session in the pool, so every request runs on the SID we watch
+    pharmacy_app.DB_POOL_MIN = 1
+    pharmacy_app.DB_POOL_MAX = 1
+    with pharmacy_app.get_pool().acquire() as conn:
+        sid = session_sid(conn)
+
+    monitor = connect()
+    cursor = monitor.cursor()
+    cursor.execute("SELECT medicine_id FROM Medicines FETCH FIRST 3 ROWS ONLY")
+    medicine_ids = [r[0] for r in cursor.fetchall()]
+    if not medicine_ids:
+        print("No medicines found - run /api/admin/seed-data first.")
+        return
+
+    customer_var = cursor.var(int)
+    cursor.execute("""
+        INSERT INTO Customers (name) VALUES ('Benchmark Customer')
+        RETURNING customer_id INTO :cid
+    """, cid=customer_var)
+    customer_id = customer_var.getvalue()[0]
+    monitor.commit()
+
+    client = pharmacy_app.app.test_client()
+    results = []
+    seeded = 0
+    try:
+        for target in ORDER_STEPS:
+            seed_orders(cursor, customer_id, medicine_ids, target - seeded)
+            monitor.commit()
+            seeded = target
+
+            cursor.execute("SELECT COUNT(*) FROM Orders")
+            total_orders = cursor.fetchone()[0]
+
+            before = session_stats(monitor, sid)
+            response, elapsed = timed(client.get, '/api/orders')
+            after = session_stats(monitor, sid)
+            if response.status_code != 200:
+                print("Request failed:", response.get_json())
+                return
+
+            results.append((
+                total_orders,
+                after["execute count"] - before["execute count"],
+                after["SQL*Net roundtrips to/from client"] - before["SQL*Net roundtrips to/from client"],
+                f"{elapsed:.3f}"
+            ))
+    finally:
+        cursor.execute("""
+            DELETE FROM Order_Items
+            WHERE order_id IN (SELECT order_id FROM Orders WHERE customer_id = :1)
+        """, (customer_id,))
+        cursor.execute("DELETE FROM Orders WHERE customer_id = :1", (customer_id,))
+        cursor.execute("DELETE FROM Customers WHERE customer_id = :1", (customer_id,))
+        monitor.commit()
+        monitor.close()
+
+    print_table(["orders", "executes", "round trips", "seconds"], results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Orders per second: sp_place_order vs sp_place_order_bulk.
+
+Installs both procedures through /api/admin/create-procedures, seeds
+LINE_STEPS[-1] throwaway medicines with plenty of stock and a throwaway
+customer, then places ORDERS_PER_RUN orders of 1, 10 and 100 lines with
+each procedure on one session, also reading that session's execute count
+so the per-line statement cost is visible. Everything it created is
+deleted again at the end.
+"""
+
+from common import pharmacy_app, connect, session_sid, session_stats, timed, print_table
+
+LINE_STEPS = [1, 10, 100]
+ORDERS_PER_RUN = 200
+PROCEDURES = ["sp_place_order", "sp_place_order_bulk"]
+
+
+def seed_medicines(cursor, count):
+    """Add `count` benchmark medicines with ample stock, returning their ids"""
+    id_var = cursor.var(int, arraysize=count)
+    cursor.setinputsizes(None, id_var)
+    cursor.executemany("""
+        INSERT INTO Medicines (name, pharma_form, strength, unit_price, expiry_date)
+        VALUES (:1, 'Tablet', '1 mg', 1, ADD_MONTHS(TRUNC(SYSDATE), 24))
+        RETURNING medicine_id INTO :2
+    """, [(f"Benchmark Medicine {i}",) for i in range(count)])
+    medicine_ids = [id_var.getvalue(i)[0] for i in range(count)]
+
+    with cursor.connection.cursor() as inventory_cursor:
+        inventory_cursor.executemany("""
+            INSERT INTO Inventory (medicine_id, qty, min_threshold)
+            VALUES (:1, 1000000000, 0)
+        """, [(mid,) for mid in medicine_ids])
+    return medicine_ids
+
+
+def place_orders(conn, procedure, customer_id, medicine_ids, lines):
+    """Place ORDERS_PER_RUN orders of `lines` lines each with `procedure`"""
+    odci_type = conn.gettype("SYS.ODCINUMBERLIST")
+    items = odci_type.newobject()
+    items.extend(medicine_ids[:lines])
+    qtys = odci_type.newobject()
+    qtys.extend([1] * lines)
+
+    cursor = conn.cursor()
+    for _ in range(ORDERS_PER_RUN):
+        cursor.callproc(procedure, [customer_id, items, qtys])
+    cursor.close()
+
+
+def main():
+    client = pharmacy_app.app.test_client()
+    response = client.post('/api/admin/create-procedures')
+    if response.status_code != 200:
+        print("Could not create procedures:", response.get_json())
+        return
+
+    setup = connect()
+    with setup.cursor() as seed_cursor:
+        medicine_ids = seed_medicines(seed_cursor, max(LINE_STEPS))
+    cursor = setup.cursor()
+    customer_var = cursor.var(int)
+    cursor.execute("""
+        INSERT INTO Customers (name) VALUES ('Benchmark Customer')
+        RETURNING customer_id INTO :cid
+    """, cid=customer_var)
+    customer_id = customer_var.getvalue()[0]
+    setup.commit()
+
+    conn = connect()
+    sid = session_sid(conn)
+    results = []
+    try:
+        for lines in LINE_STEPS:
+            for procedure in PROCEDURES:
+                before = session_stats(setup, sid, ("execute count",))
+                _, elapsed = timed(place_orders, conn, procedure, customer_id, medicine_ids, lines)
+                after = session_stats(setup, sid, ("execute count",))
+                results.append((
+                    lines,
+                    procedure,
+                    f"{ORDERS_PER_RUN / elapsed:.1f}",
+                    f"{(after['execute count'] - before['execute count']) / ORDERS_PER_RUN:.1f}"
+                ))
+    finally:
+        conn.close()
+        cursor.execute("""
+            DELETE FROM Order_Items
+            WHERE order_id IN (SELECT order_id FROM Orders WHERE customer_id = :1)
+        """, (customer_id,))
+        cursor.execute("DELETE FROM Orders WHERE customer_id = :1", (customer_id,))
+        cursor.execute("DELETE FROM Customers WHERE customer_id = :1", (customer_id,))
+        cursor.executemany("DELETE FROM Inventory WHERE medicine_id = :1", [(mid,) for mid in medicine_ids])
+        cursor.executemany("DELETE FROM Medicines WHERE medicine_id = :1", [(mid,) for mid in medicine_ids])
+        setup.commit()
+        setup.close()
+
+    print_table(["lines", "procedure", "orders/sec", "executes/order"], results)
+
+
+if __name__ == "__main__":
+    main()
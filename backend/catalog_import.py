@@ -0,0 +1,199 @@
+#!/usr/bin/env python3
+"""
+Bulk medicine catalog import from CSV or NDJSON.
+
+Rows are parsed one at a time and written in batches: one array INSERT
+into Medicines (returning the new ids) and one array INSERT into
+Inventory per batch, committed per batch. Duplicates are rejected by the
+uq_medicines_dedupe index through batch error reporting, so no
+per-row SELECT is needed and the file is never held in memory.
+
+Columns / keys (same as POST /api/inventory/medicine):
+    name, form, strength, price, supplier_id, expiry_date, quantity
+
+Used by POST /api/inventory/import, and from the command line:
+    python catalog_import.py catalog.csv
+    python catalog_import.py catalog.ndjson --format ndjson
+"""
+
+import csv
+import json
+import math
+import os
+import sys
+import urllib.request
+from datetime import datetime
+
+import oracledb as cx_Oracle
+from dotenv import load_dotenv
+
+BATCH_SIZE = 500
+MAX_REPORTED_REJECTS = 1000  # detailed rejects kept in the report; the rest are only counted
+
+
+def iter_records(text_stream, fmt):
+    """Yield (line_number, dict) pairs from a CSV or NDJSON text stream"""
+    if fmt == 'csv':
+        reader = csv.DictReader(text_stream)
+        for record in reader:
+            yield reader.line_num, record
+    elif fmt == 'ndjson':
+        for line_number, line in enumerate(text_stream, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_number, json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_number, ValueError(f"invalid JSON: {e.msg}")
+    else:
+        raise ValueError(f"Unsupported format: {fmt}")
+
+
+def parse_record(record):
+    """Validate one record and return the Medicines bind tuple plus quantity"""
+    if isinstance(record, Exception):
+        raise record
+    if not isinstance(record, dict):
+        raise ValueError("row must be an object")
+
+    name = (record.get('name') or '').strip()
+    form = (record.get('form') or '').strip()
+    strength = (record.get('strength') or '').strip()
+    expiry = (record.get('expiry_date') or '').strip()
+    if not name or not form or not strength or not expiry:
+        raise ValueError("name, form, strength and expiry_date are required")
+    datetime.strptime(expiry, '%Y-%m-%d')
+
+    price = float(record.get('price') or 0)
+    if not math.isfinite(price):
+        raise ValueError("price must be a finite number")
+    if price < 0:
+        raise ValueError("price must not be negative")
+    supplier = record.get('supplier_id')
+    supplier_id = int(supplier) if supplier not in (None, '') else None
+    quantity = int(record.get('quantity') or 0)
+    if quantity < 0:
+        raise ValueError("quantity must not be negative")
+
+    return (name, form, strength, price, supplier_id, expiry), quantity
+
+
+def import_batch(cursor, batch, report):
+    """Insert one batch of (line_number, medicine_binds, quantity) rows"""
+    id_var = cursor.var(cx_Oracle.DB_TYPE_NUMBER, arraysize=len(batch))
+    cursor.setinputsizes(None, None, None, None, None, None, id_var)
+    cursor.executemany("""
+        INSERT INTO Medicines (name, pharma_form, strength, unit_price, supplier_id, expiry_date)
+        VALUES (:1, :2, :3, :4, :5, TO_DATE(:6,'YYYY-MM-DD'))
+        RETURNING medicine_id INTO :7
+    """, [binds for _, binds, _ in batch], batcherrors=True)
+
+    errors = {err.offset: err.message for err in cursor.getbatcherrors()}
+    inventory_rows = []
+    for offset, (line_number, binds, quantity) in enumerate(batch):
+        if offset in errors:
+            message = errors[offset]
+            if "ORA-00001" in message:
+                message = "duplicate medicine (name, form, strength, expiry_date)"
+            reject(report, line_number, message)
+        else:
+            inventory_rows.append((int(id_var.getvalue(offset)[0]), quantity, 10))
+
+    if inventory_rows:
+        # Fresh cursor, so the RETURNING input sizes above do not carry over
+        with cursor.connection.cursor() as inventory_cursor:
+            inventory_cursor.executemany("""
+                INSERT INTO Inventory (medicine_id, qty, min_threshold)
+                VALUES (:1, :2, :3)
+            """, inventory_rows)
+    report['inserted'] += len(inventory_rows)
+
+
+def reject(report, line_number, reason):
+    """Count a rejected row, keeping the first MAX_REPORTED_REJECTS in detail"""
+    report['rejected'] += 1
+    if len(report['rejects']) < MAX_REPORTED_REJECTS:
+        report['rejects'].append({'line': line_number, 'reason': reason})
+
+
+def import_catalog(conn, text_stream, fmt):
+    """Import a catalog stream on `conn`, committing every BATCH_SIZE rows.
+
+    Returns a report dict with inserted/rejected counts and reject details.
+    """
+    report = {'inserted': 0, 'rejected': 0, 'rejects': []}
+    cursor = conn.cursor()
+    batch = []
+    try:
+        for line_number, record in iter_records(text_stream, fmt):
+            try:
+                binds, quantity = parse_record(record)
+            except (TypeError, ValueError, OverflowError) as e:
+                reject(report, line_number, str(e))
+                continue
+
+            batch.append((line_number, binds, quantity))
+            if len(batch) >= BATCH_SIZE:
+                import_batch(cursor, batch, report)
+                conn.commit()
+                batch = []
+
+        if batch:
+            import_batch(cursor, batch, report)
+            conn.commit()
+    finally:
+        cursor.close()
+    report['rejects'].sort(key=lambda r: r['line'])
+    return report
+
+
+def detect_format(filename, content_type=None):
+    """Guess csv/ndjson from a file name or content type"""
+    name = (filename or '').lower()
+    if name.endswith(('.ndjson', '.jsonl')) or 'ndjson' in (content_type or ''):
+        return 'ndjson'
+    return 'csv'
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Bulk import a medicine catalog")
+    parser.add_argument('path', help="CSV or NDJSON file")
+    parser.add_argument('--format', choices=['csv', 'ndjson'], help="defaults to the file extension")
+    parser.add_argument('--api-url', default="http://localhost:5000/api",
+                        help="running API to notify so its caches drop stale catalog reads")
+    args = parser.parse_args()
+
+    load_dotenv()
+    dsn = cx_Oracle.makedsn(os.getenv('DB_HOST', 'localhost'), os.getenv('DB_PORT', '1521'),
+                            service_name=os.getenv('DB_SERVICE', 'xepdb1'))
+    conn = cx_Oracle.connect(user=os.getenv('DB_USER', 'system'),
+                             password=os.getenv('DB_PASS', 'root'), dsn=dsn)
+
+    fmt = args.format or detect_format(args.path)
+    print(f"Importing {args.path} ({fmt})...")
+    with open(args.path, newline='', encoding='utf-8') as f:
+        report = import_catalog(conn, f, fmt)
+    conn.close()
+
+    print(f"✓ Inserted {report['inserted']} medicines, rejected {report['rejected']} rows")
+    for r in report['rejects']:
+        print(f"   line {r['line']}: {r['reason']}")
+    if report['rejected'] > len(report['rejects']):
+        print(f"   ... {report['rejected'] - len(report['rejects'])} more")
+
+    try:
+        req = urllib.request.Request(
+            f"{args.api_url}/admin/cache/invalidate",
+            data=json.dumps({'tables': ['MEDICINES', 'INVENTORY']}).encode(),
+            headers={'Content-Type': 'application/json'}, method="POST")
+        urllib.request.urlopen(req, timeout=5)
+    except Exception as e:
+        print(f"Flask server not reachable ({e}); POST /api/admin/cache/invalidate once it is up")
+
+    return 0 if report['inserted'] or not report['rejected'] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
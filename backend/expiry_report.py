@@ -0,0 +1,44 @@
+"""
+Expiry report shared by the Flask API and the CLI.
+
+Medicines expired or expiring within a horizon come from one range scan
+of idx_medicines_expiry and are grouped into buckets of days to expiry:
+expired, 0-30, 31-60, ... up to the horizon.
+"""
+
+EXPIRY_BUCKET_DAYS = 30
+EXPIRY_MAX_HORIZON_DAYS = 3650  # caps the horizon, and with it the bucket list
+
+
+def expiring_query(days):
+    """SQL and binds for medicines expired or expiring within `days`, soonest first.
+
+    Columns: medicine_id, name, expiry_date, days_left, qty, unit_price.
+    """
+    # One range scan of idx_medicines_expiry covers expired and near-expiry
+    query = """
+        SELECT m.medicine_id, m.name, m.expiry_date,
+               TRUNC(m.expiry_date) - TRUNC(SYSDATE) AS days_left,
+               NVL(i.qty, 0) AS qty, NVL(m.unit_price, 0) AS unit_price
+        FROM Medicines m
+        LEFT JOIN Inventory i ON i.medicine_id = m.medicine_id
+        WHERE m.expiry_date < TRUNC(SYSDATE) + :days + 1
+        ORDER BY m.expiry_date, m.medicine_id
+    """
+    return query, {'days': days}
+
+
+def expiry_bucket(days_left, horizon):
+    """Bucket a medicine by days until expiry: expired, 0-30, 31-60, ..."""
+    if days_left < 0:
+        return {'label': 'expired', 'from_day': None, 'to_day': -1}
+    index = max(days_left - 1, 0) // EXPIRY_BUCKET_DAYS
+    from_day = index * EXPIRY_BUCKET_DAYS + (1 if index else 0)
+    to_day = min((index + 1) * EXPIRY_BUCKET_DAYS, horizon)
+    return {'label': f'{from_day}-{to_day}', 'from_day': from_day, 'to_day': to_day}
+
+
+def all_buckets(horizon):
+    """Every bucket up to the horizon, in order, including empty ones"""
+    return [expiry_bucket(days_left, horizon) for days_left in
+            [-1, 0] + list(range(EXPIRY_BUCKET_DAYS + 1, horizon + 1, EXPIRY_BUCKET_DAYS))]
@@ -0,0 +1,910 @@
+#!/usr/bin/env python3
+"""
+Versioned schema migrations for the pharmacy database.
+
+MIGRATIONS lists every schema change in order and Schema_Version records
+which ones a database has. migrate() applies only the missing ones, so on
+a current schema it costs a single version query. The Flask admin routes
+and the CLI both migrate through this module, and it can be run directly:
+    python migrations.py            # apply pending migrations
+    python migrations.py --status   # show applied and pending migrations
+
+Migration steps skip objects that already exist, so a database created
+before versioning was introduced is adopted and brought up to date.
+"""
+
+import os
+import sys
+import urllib.request
+
+import oracledb as cx_Oracle
+
+# Errors meaning a step's object is already in place
+ALREADY_EXISTS_ERRORS = (
+    'ORA-00955',  # name is already used by an existing object
+    'ORA-01430',  # column being added already exists in table
+    'ORA-01408',  # such column list already indexed
+    'ORA-02260',  # table can have only one primary key
+    'ORA-02261',  # such unique or primary key already exists
+    'ORA-02264',  # name already used by an existing constraint
+    'ORA-02275',  # such a referential constraint already exists
+)
+
+SCHEMA_VERSION_TABLE = """
+    CREATE TABLE Schema_Version (
+        version NUMBER PRIMARY KEY,
+        description VARCHAR2(200) NOT NULL,
+        applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )
+    """
+
+# ---------- Code objects (CREATE OR REPLACE, safe to re-run) ----------
+# The V8_* lists are exactly what migration 8 installed; never edit them.
+# To change a code object, add a new snapshot list holding its new SQL,
+# a migration running it, and the snapshot to the latest_definitions()
+# call below the lists.
+
+V8_VIEWS = [
+    ('vw_inventory_summary', """
+    CREATE OR REPLACE VIEW vw_inventory_summary AS
+        SELECT m.medicine_id,
+               NVL(m.name,'') AS name,
+               NVL(m.pharma_form,'') AS pharma_form,
+               NVL(m.strength,'') AS strength,
+               NVL(m.unit_price,0) AS unit_price,
+               NVL(i.qty,0) AS qty,
+               m.expiry_date,
+               NVL(m.is_active,'Y') AS is_active
+        FROM Medicines m LEFT JOIN Inventory i ON m.medicine_id = i.medicine_id
+    """),
+]
+
+V8_TRIGGERS = [
+    ('trg_med_before_ins', """
+    CREATE OR REPLACE TRIGGER trg_med_before_ins
+    BEFORE INSERT OR UPDATE ON Medicines
+    FOR EACH ROW
+    DECLARE
+    BEGIN
+        IF :NEW.expiry_date IS NOT NULL AND :NEW.expiry_date < TRUNC(SYSDATE) THEN
+            DBMS_OUTPUT.PUT_LINE('Warning: Medicine "' || :NEW.name || 
+                         '" has an expired date (' || TO_CHAR(:NEW.expiry_date, 'YYYY-MM-DD') || ').');
+        END IF;
+    END;
+    """),
+    ('trg_audit_orders', """
+    CREATE OR REPLACE TRIGGER trg_audit_orders
+    AFTER INSERT OR UPDATE OR DELETE ON Orders
+    FOR EACH ROW
+    BEGIN
+        IF INSERTING THEN
+            INSERT INTO Audit_Log(action_by, action, object_name, details) VALUES(USER,'INSERT','ORDERS','Order placed or inserted');
+        ELSIF UPDATING THEN
+            INSERT INTO Audit_Log(action_by, action, object_name, details) VALUES(USER,'UPDATE','ORDERS','Order updated');
+        ELSIF DELETING THEN
+            INSERT INTO Audit_Log(action_by, action, object_name, details) VALUES(USER,'DELETE','ORDERS','Order deleted');
+        END IF;
+    END;
+    """),
+    ('trg_orders_daily_sales', """
+    CREATE OR REPLACE TRIGGER trg_orders_daily_sales
+    AFTER INSERT OR UPDATE OF order_date, total_amount OR DELETE ON Orders
+    FOR EACH ROW
+    BEGIN
+        -- Each day is split over 8 slots (by order_id) so concurrent
+        -- orders rarely wait on the same rollup row
+        IF (DELETING OR UPDATING) AND :OLD.order_date IS NOT NULL THEN
+            UPDATE Daily_Sales
+            SET orders = orders - 1,
+                total_sales = total_sales - NVL(:OLD.total_amount, 0)
+            WHERE sale_date = TRUNC(:OLD.order_date)
+              AND slot = MOD(:OLD.order_id, 8);
+        END IF;
+        IF (INSERTING OR UPDATING) AND :NEW.order_date IS NOT NULL THEN
+            BEGIN
+                MERGE INTO Daily_Sales d
+                USING (SELECT TRUNC(:NEW.order_date) AS sale_date, MOD(:NEW.order_id, 8) AS slot FROM dual) s
+                ON (d.sale_date = s.sale_date AND d.slot = s.slot)
+                WHEN MATCHED THEN
+                    UPDATE SET d.orders = d.orders + 1,
+                               d.total_sales = d.total_sales + NVL(:NEW.total_amount, 0)
+                WHEN NOT MATCHED THEN
+                    INSERT (sale_date, slot, orders, total_sales)
+                    VALUES (s.sale_date, s.slot, 1, NVL(:NEW.total_amount, 0));
+            EXCEPTION
+                WHEN DUP_VAL_ON_INDEX THEN
+                    -- Another session created the row first
+                    UPDATE Daily_Sales
+                    SET orders = orders + 1,
+                        total_sales = total_sales + NVL(:NEW.total_amount, 0)
+                    WHERE sale_date = TRUNC(:NEW.order_date)
+                      AND slot = MOD(:NEW.order_id, 8);
+            END;
+        END IF;
+    END;
+    """),
+    ('trg_medicines_supplier_stats', """
+    CREATE OR REPLACE TRIGGER trg_medicines_supplier_stats
+    FOR INSERT OR UPDATE OF supplier_id, unit_price, is_active OR DELETE ON Medicines
+    COMPOUND TRIGGER
+        -- Suppliers whose current max price left in this statement
+        TYPE t_supplier_set IS TABLE OF PLS_INTEGER INDEX BY PLS_INTEGER;
+        g_stale t_supplier_set;
+        v_max Supplier_Stats.max_price%TYPE;
+        v_supplier PLS_INTEGER;
+
+        BEFORE STATEMENT IS
+        BEGIN
+            g_stale.DELETE;
+        END BEFORE STATEMENT;
+
+        AFTER EACH ROW IS
+        BEGIN
+            -- Only active medicines with a supplier are counted
+            IF (DELETING OR UPDATING) AND :OLD.supplier_id IS NOT NULL
+               AND NVL(:OLD.is_active, 'Y') = 'Y' THEN
+                UPDATE Supplier_Stats
+                SET meds_count = meds_count - 1,
+                    price_sum = price_sum - NVL(:OLD.unit_price, 0)
+                WHERE supplier_id = :OLD.supplier_id
+                RETURNING max_price INTO v_max;
+                IF SQL%ROWCOUNT > 0 AND NVL(:OLD.unit_price, 0) >= NVL(v_max, 0) THEN
+                    g_stale(:OLD.supplier_id) := 1;
+                END IF;
+            END IF;
+            IF (INSERTING OR UPDATING) AND :NEW.supplier_id IS NOT NULL
+               AND NVL(:NEW.is_active, 'Y') = 'Y' THEN
+                BEGIN
+                    MERGE INTO Supplier_Stats st
+                    USING (SELECT :NEW.supplier_id AS supplier_id, NVL(:NEW.unit_price, 0) AS price FROM dual) s
+                    ON (st.supplier_id = s.supplier_id)
+                    WHEN MATCHED THEN
+                        UPDATE SET st.meds_count = st.meds_count + 1,
+                                   st.price_sum = st.price_sum + s.price,
+                                   st.max_price = GREATEST(NVL(st.max_price, s.price), s.price)
+                    WHEN NOT MATCHED THEN
+                        INSERT (supplier_id, meds_count, price_sum, max_price)
+                        VALUES (s.supplier_id, 1, s.price, s.price);
+                EXCEPTION
+                    WHEN DUP_VAL_ON_INDEX THEN
+                        -- Another session created the row first
+                        UPDATE Supplier_Stats
+                        SET meds_count = meds_count + 1,
+                            price_sum = price_sum + NVL(:NEW.unit_price, 0),
+                            max_price = GREATEST(NVL(max_price, NVL(:NEW.unit_price, 0)), NVL(:NEW.unit_price, 0))
+                        WHERE supplier_id = :NEW.supplier_id;
+                END;
+            END IF;
+        END AFTER EACH ROW;
+
+        AFTER STATEMENT IS
+        BEGIN
+            -- Medicines can be queried again here, so recompute the lost maxima
+            v_supplier := g_stale.FIRST;
+            WHILE v_supplier IS NOT NULL LOOP
+                UPDATE Supplier_Stats
+                SET max_price = (SELECT MAX(NVL(unit_price, 0)) FROM Medicines
+                                 WHERE supplier_id = v_supplier AND NVL(is_active, 'Y') = 'Y')
+                WHERE supplier_id = v_supplier;
+                v_supplier := g_stale.NEXT(v_supplier);
+            END LOOP;
+            g_stale.DELETE;
+        END AFTER STATEMENT;
+    END trg_medicines_supplier_stats;
+    """),
+    ('trg_audit_medicines', """
+    CREATE OR REPLACE TRIGGER trg_audit_medicines
+    AFTER INSERT OR UPDATE OR DELETE ON Medicines
+    FOR EACH ROW
+    BEGIN
+        IF INSERTING THEN
+            INSERT INTO Audit_Log(action_by, action, object_name, details) VALUES(USER,'INSERT','MEDICINES','Inserted ' || :NEW.name);
+        ELSIF UPDATING THEN
+            INSERT INTO Audit_Log(action_by, action, object_name, details) VALUES(USER,'UPDATE','MEDICINES','Updated ' || :NEW.name);
+        ELSIF DELETING THEN
+            INSERT INTO Audit_Log(action_by, action, object_name, details) VALUES(USER,'DELETE','MEDICINES','Deleted ' || :OLD.name);
+        END IF;
+    END;
+    """)
+]
+
+V8_PROCEDURES = [
+    ('sp_place_order', """
+    CREATE OR REPLACE PROCEDURE sp_place_order (
+        p_customer_id IN NUMBER,
+        p_items       IN "SYS"."ODCINUMBERLIST",
+        p_qtys        IN "SYS"."ODCINUMBERLIST"
+    ) IS
+        v_unit_price   NUMBER(10,2);
+        v_total        NUMBER(12,2) := 0;
+        v_line_total   NUMBER(12,2);
+        v_order_id     NUMBER;
+        v_stock        NUMBER;
+        v_expiry       DATE;
+    BEGIN
+        IF p_items.COUNT != p_qtys.COUNT THEN
+            RAISE_APPLICATION_ERROR(-20060, 'Items and quantities length mismatch');
+        END IF;
+
+        -- Lock every ordered Inventory row up front, lowest medicine_id first,
+        -- so orders over the same medicines queue instead of deadlocking
+        FOR r IN (
+            SELECT medicine_id FROM Inventory
+            WHERE medicine_id IN (SELECT COLUMN_VALUE FROM TABLE(p_items))
+            ORDER BY medicine_id
+            FOR UPDATE
+        ) LOOP
+            NULL;
+        END LOOP;
+
+        FOR i IN 1 .. p_items.COUNT LOOP
+            BEGIN
+                SELECT unit_price, expiry_date
+                INTO v_unit_price, v_expiry
+                FROM Medicines
+                WHERE medicine_id = p_items(i);
+            EXCEPTION
+                WHEN NO_DATA_FOUND THEN
+                    RAISE_APPLICATION_ERROR(-20063, 'Medicine not found: ' || p_items(i));
+            END;
+
+            IF v_expiry IS NOT NULL AND v_expiry < TRUNC(SYSDATE) THEN
+                RAISE_APPLICATION_ERROR(-20061, 'Cannot sell expired medicine id ' || p_items(i));
+            END IF;
+
+            BEGIN
+                SELECT qty INTO v_stock
+                FROM Inventory
+                WHERE medicine_id = p_items(i)
+                FOR UPDATE;
+            EXCEPTION
+                WHEN NO_DATA_FOUND THEN
+                    RAISE_APPLICATION_ERROR(-20064, 'Inventory row not found for medicine id ' || p_items(i));
+            END;
+
+            IF v_stock < p_qtys(i) THEN
+                RAISE_APPLICATION_ERROR(-20062, 'Insufficient stock for medicine id ' || p_items(i));
+            END IF;
+
+            v_line_total := v_unit_price * p_qtys(i);
+            v_total := v_total + v_line_total;
+        END LOOP;
+
+        INSERT INTO Orders (customer_id, total_amount, status)
+        VALUES (p_customer_id, v_total, 'COMPLETED')
+        RETURNING order_id INTO v_order_id;
+
+        FOR i IN 1 .. p_items.COUNT LOOP
+            SELECT unit_price INTO v_unit_price FROM Medicines WHERE medicine_id = p_items(i);
+
+            INSERT INTO Order_Items (order_id, medicine_id, quantity, unit_price, line_total)
+            VALUES (v_order_id, p_items(i), p_qtys(i), v_unit_price, v_unit_price * p_qtys(i));
+
+            UPDATE Inventory
+            SET qty = qty - p_qtys(i)
+            WHERE medicine_id = p_items(i);
+        END LOOP;
+
+        INSERT INTO Audit_Log (action_by, action, object_name, details)
+        VALUES (USER, 'PROC', 'sp_place_order', 'Order ' || v_order_id || ' placed for customer ' || NVL(TO_CHAR(p_customer_id),'UNKNOWN'));
+
+        COMMIT;
+    EXCEPTION
+        WHEN OTHERS THEN
+            ROLLBACK;
+            RAISE;
+    END sp_place_order;
+    """),
+    # Same contract and error codes as sp_place_order, but set-based:
+    # one locking SELECT for all lines and bulk DML instead of ~5 statements per line
+    ('sp_place_order_bulk', """
+    CREATE OR REPLACE PROCEDURE sp_place_order_bulk (
+        p_customer_id IN NUMBER,
+        p_items       IN "SYS"."ODCINUMBERLIST",
+        p_qtys        IN "SYS"."ODCINUMBERLIST"
+    ) IS
+        TYPE t_num_list  IS TABLE OF NUMBER;
+        TYPE t_date_list IS TABLE OF DATE;
+        TYPE t_num_map   IS TABLE OF NUMBER INDEX BY PLS_INTEGER;
+        TYPE t_date_map  IS TABLE OF DATE INDEX BY PLS_INTEGER;
+        v_found_ids    t_num_list;
+        v_found_prices t_num_list;
+        v_found_expiry t_date_list;
+        v_found_inv    t_num_list;
+        v_found_stock  t_num_list;
+        v_price        t_num_map;
+        v_expiry       t_date_map;
+        v_stock        t_num_map;
+        v_needed       t_num_map;
+        v_line_prices  t_num_list := t_num_list();
+        v_total        NUMBER(12,2) := 0;
+        v_order_id     NUMBER;
+        v_mid          NUMBER;
+    BEGIN
+        IF p_items.COUNT != p_qtys.COUNT THEN
+            RAISE_APPLICATION_ERROR(-20060, 'Items and quantities length mismatch');
+        END IF;
+
+        -- Price, expiry and locked stock of every ordered medicine in one pass,
+        -- locking in medicine_id order like sp_place_order
+        SELECT m.medicine_id, m.unit_price, m.expiry_date, inv.medicine_id, inv.qty
+        BULK COLLECT INTO v_found_ids, v_found_prices, v_found_expiry, v_found_inv, v_found_stock
+        FROM Medicines m
+        LEFT JOIN Inventory inv ON inv.medicine_id = m.medicine_id
+        WHERE m.medicine_id IN (SELECT COLUMN_VALUE FROM TABLE(p_items))
+        ORDER BY m.medicine_id
+        FOR UPDATE OF inv.qty;
+
+        FOR i IN 1 .. v_found_ids.COUNT LOOP
+            v_price(v_found_ids(i)) := v_found_prices(i);
+            v_expiry(v_found_ids(i)) := v_found_expiry(i);
+            IF v_found_inv(i) IS NOT NULL THEN
+                v_stock(v_found_ids(i)) := v_found_stock(i);
+            END IF;
+        END LOOP;
+
+        -- Same checks, in the same line order, as sp_place_order
+        v_line_prices.EXTEND(p_items.COUNT);
+        FOR i IN 1 .. p_items.COUNT LOOP
+            v_mid := p_items(i);
+            IF v_mid IS NULL OR NOT v_price.EXISTS(v_mid) THEN
+                RAISE_APPLICATION_ERROR(-20063, 'Medicine not found: ' || v_mid);
+            END IF;
+
+            IF v_expiry(v_mid) IS NOT NULL AND v_expiry(v_mid) < TRUNC(SYSDATE) THEN
+                RAISE_APPLICATION_ERROR(-20061, 'Cannot sell expired medicine id ' || v_mid);
+            END IF;
+
+            IF NOT v_stock.EXISTS(v_mid) THEN
+                RAISE_APPLICATION_ERROR(-20064, 'Inventory row not found for medicine id ' || v_mid);
+            END IF;
+
+            -- Repeated lines for one medicine draw on the same stock
+            IF v_needed.EXISTS(v_mid) THEN
+                v_needed(v_mid) := v_needed(v_mid) + p_qtys(i);
+            ELSE
+                v_needed(v_mid) := p_qtys(i);
+            END IF;
+
+            IF v_stock(v_mid) < v_needed(v_mid) THEN
+                RAISE_APPLICATION_ERROR(-20062, 'Insufficient stock for medicine id ' || v_mid);
+            END IF;
+
+            v_line_prices(i) := v_price(v_mid);
+            v_total := v_total + v_line_prices(i) * p_qtys(i);
+        END LOOP;
+
+        INSERT INTO Orders (customer_id, total_amount, status)
+        VALUES (p_customer_id, v_total, 'COMPLETED')
+        RETURNING order_id INTO v_order_id;
+
+        FORALL i IN 1 .. p_items.COUNT
+            INSERT INTO Order_Items (order_id, medicine_id, quantity, unit_price, line_total)
+            VALUES (v_order_id, p_items(i), p_qtys(i), v_line_prices(i), v_line_prices(i) * p_qtys(i));
+
+        FORALL i IN 1 .. p_items.COUNT
+            UPDATE Inventory
+            SET qty = qty - p_qtys(i)
+            WHERE medicine_id = p_items(i);
+
+        INSERT INTO Audit_Log (action_by, action, object_name, details)
+        VALUES (USER, 'PROC', 'sp_place_order_bulk', 'Order ' || v_order_id || ' placed for customer ' || NVL(TO_CHAR(p_customer_id),'UNKNOWN'));
+
+        COMMIT;
+    EXCEPTION
+        WHEN OTHERS THEN
+            ROLLBACK;
+            RAISE;
+    END sp_place_order_bulk;
+    """),
+    # Turns a cart's stock holds into an order. The held units already left
+    # Inventory when the holds were placed, so no Inventory row is locked here.
+    ('sp_place_order_from_holds', """
+    CREATE OR REPLACE PROCEDURE sp_place_order_from_holds (
+        p_customer_id IN NUMBER,
+        p_cart_id     IN VARCHAR2
+    ) IS
+        TYPE t_num_list  IS TABLE OF NUMBER;
+        TYPE t_date_list IS TABLE OF DATE;
+        v_hold_ids   t_num_list;
+        v_ids        t_num_list;
+        v_qtys       t_num_list;
+        v_prices     t_num_list;
+        v_expiry     t_date_list;
+        v_total      NUMBER(12,2) := 0;
+        v_order_id   NUMBER;
+    BEGIN
+        SELECT h.hold_id, h.medicine_id, h.qty, m.unit_price, m.expiry_date
+        BULK COLLECT INTO v_hold_ids, v_ids, v_qtys, v_prices, v_expiry
+        FROM Stock_Holds h
+        JOIN Medicines m ON m.medicine_id = h.medicine_id
+        WHERE h.cart_id = p_cart_id
+          AND h.expires_at > SYSTIMESTAMP
+        ORDER BY h.medicine_id
+        FOR UPDATE OF h.qty;
+
+        IF v_hold_ids.COUNT = 0 THEN
+            RAISE_APPLICATION_ERROR(-20065, 'No active holds for cart ' || p_cart_id);
+        END IF;
+
+        FOR i IN 1 .. v_hold_ids.COUNT LOOP
+            IF v_expiry(i) IS NOT NULL AND v_expiry(i) < TRUNC(SYSDATE) THEN
+                RAISE_APPLICATION_ERROR(-20061, 'Cannot sell expired medicine id ' || v_ids(i));
+            END IF;
+            v_total := v_total + v_prices(i) * v_qtys(i);
+        END LOOP;
+
+        INSERT INTO Orders (customer_id, total_amount, status)
+        VALUES (p_customer_id, v_total, 'COMPLETED')
+        RETURNING order_id INTO v_order_id;
+
+        FORALL i IN 1 .. v_hold_ids.COUNT
+            INSERT INTO Order_Items (order_id, medicine_id, quantity, unit_price, line_total)
+            VALUES (v_order_id, v_ids(i), v_qtys(i), v_prices(i), v_prices(i) * v_qtys(i));
+
+        FORALL i IN 1 .. v_hold_ids.COUNT
+            DELETE FROM Stock_Holds WHERE hold_id = v_hold_ids(i);
+
+        INSERT INTO Audit_Log (action_by, action, object_name, details)
+        VALUES (USER, 'PROC', 'sp_place_order_from_holds', 'Order ' || v_order_id || ' placed for customer ' || NVL(TO_CHAR(p_customer_id),'UNKNOWN') || ' from cart ' || p_cart_id);
+
+        COMMIT;
+    EXCEPTION
+        WHEN OTHERS THEN
+            ROLLBACK;
+            RAISE;
+    END sp_place_order_from_holds;
+    """)
+]
+
+
+def latest_definitions(*snapshots):
+    """Newest (name, sql) of every code object across the snapshots, oldest first"""
+    latest = {}
+    for snapshot in snapshots:
+        for name, sql in snapshot:
+            latest[name] = sql
+    return list(latest.items())
+
+
+# Current definitions, used to (re)create the objects outside migrations
+VIEWS = latest_definitions(V8_VIEWS)
+TRIGGERS = latest_definitions(V8_TRIGGERS)
+PROCEDURES = latest_definitions(V8_PROCEDURES)
+
+# Table_Versions and its triggers, as migration 11 installed them;
+# migration 13 drops them again
+VERSIONED_TABLES = ['SUPPLIERS', 'CUSTOMERS', 'MEDICINES', 'INVENTORY', 'ORDERS']
+
+VERSION_PROCEDURE = """
+    CREATE OR REPLACE PROCEDURE bump_table_version(p_table IN VARCHAR2) AS
+        PRAGMA AUTONOMOUS_TRANSACTION;
+    BEGIN
+        UPDATE Table_Versions SET version = version + 1 WHERE table_name = p_table;
+        COMMIT;
+    END bump_table_version;
+    """
+
+VERSION_TRIGGERS = [
+    (f'trg_{table.lower()}_version', f"""
+    CREATE OR REPLACE TRIGGER trg_{table.lower()}_version
+    AFTER INSERT OR UPDATE OR DELETE ON {table}
+    BEGIN
+        bump_table_version('{table}');
+    END;
+    """) for table in VERSIONED_TABLES
+]
+
+# ---------- Derived tables, rebuilt from their sources ----------
+
+# Recompute Daily_Sales from Orders; the share lock holds off new orders
+# until the rebuilt rollup is committed
+REBUILD_SALES_ROLLUP = [
+    "LOCK TABLE Orders IN SHARE MODE",
+    "DELETE FROM Daily_Sales",
+    """
+    INSERT INTO Daily_Sales (sale_date, slot, orders, total_sales)
+    SELECT TRUNC(order_date), MOD(order_id, 8), COUNT(*), NVL(SUM(total_amount), 0)
+    FROM Orders
+    WHERE order_date IS NOT NULL
+    GROUP BY TRUNC(order_date), MOD(order_id, 8)
+    """
+]
+
+# Recompute Supplier_Stats from Medicines, holding off medicine changes
+REBUILD_SUPPLIER_STATS = [
+    "LOCK TABLE Medicines IN SHARE MODE",
+    "DELETE FROM Supplier_Stats",
+    """
+    INSERT INTO Supplier_Stats (supplier_id, meds_count, price_sum, max_price)
+    SELECT supplier_id, COUNT(*), SUM(NVL(unit_price, 0)), MAX(NVL(unit_price, 0))
+    FROM Medicines
+    WHERE supplier_id IS NOT NULL
+      AND NVL(is_active, 'Y') = 'Y'
+    GROUP BY supplier_id
+    """
+]
+
+# (table, id column, key expression) of each dedupe unique index in migration 12
+DEDUPE_KEYS = [
+    ('Medicines', 'medicine_id',
+     "LOWER(name) || ' / ' || LOWER(pharma_form) || ' / ' || LOWER(strength)"
+     " || ' / ' || TO_CHAR(TRUNC(expiry_date), 'YYYY-MM-DD')"),
+    ('Suppliers', 'supplier_id', "LOWER(name)"),
+    ('Suppliers', 'supplier_id', "LOWER(contact_email)"),
+    ('Suppliers', 'supplier_id', "phone"),
+    ('Customers', 'customer_id', "LOWER(email)"),
+]
+
+
+class DataCheckError(RuntimeError):
+    """Existing data blocks a migration; raised by its first step, before any change"""
+
+
+class MigrationError(RuntimeError):
+    """A migration failed; .version is the one that failed"""
+
+    def __init__(self, version, error):
+        super().__init__(f"migration {version} failed: {error}")
+        self.version = version
+
+
+def check_dedupe_keys(cursor):
+    """Fail with the offending rows if existing data would break a dedupe index"""
+    problems = []
+    for table, id_column, key in DEDUPE_KEYS:
+        cursor.execute(f"""
+            SELECT {key}, LISTAGG({id_column}, ', ') WITHIN GROUP (ORDER BY {id_column})
+            FROM {table}
+            WHERE {key} IS NOT NULL
+            GROUP BY {key}
+            HAVING COUNT(*) > 1
+            FETCH FIRST 20 ROWS ONLY
+        """)
+        problems.extend(f"  {table} '{value}': ids {ids}" for value, ids in cursor.fetchall())
+    if problems:
+        raise DataCheckError("Merge or rename these duplicate rows, then migrate again:\n"
+                           + "\n".join(problems))
+
+
+# ---------- Migrations ----------
+# (version, description, steps). A step is a SQL statement or a function
+# taking a cursor. Never edit an applied migration; append a new one.
+# A migration whose first step raises DataCheckError is deferred: it stays
+# pending and the ones after it still apply.
+
+MIGRATIONS = [
+    (1, 'Core tables', [
+        """
+        CREATE TABLE Suppliers (
+            supplier_id NUMBER GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+            name VARCHAR2(120) NOT NULL,
+            contact_email VARCHAR2(120) NOT NULL,
+            phone VARCHAR2(20) NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            CONSTRAINT unique_supplier_entry UNIQUE (name,contact_email,phone)
+        )
+        """,
+        """
+        CREATE TABLE Customers (
+            customer_id NUMBER GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+            name VARCHAR2(120) NOT NULL,
+            phone VARCHAR2(20),
+            email VARCHAR2(120),
+            address VARCHAR2(300),
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        """
+        CREATE TABLE Medicines (
+            medicine_id NUMBER GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+            name VARCHAR2(200) NOT NULL,
+            pharma_form VARCHAR2(50),
+            strength VARCHAR2(50),
+            unit_price NUMBER(10,2) DEFAULT 0,
+            supplier_id NUMBER,
+            expiry_date DATE,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            CONSTRAINT fk_med_supplier FOREIGN KEY (supplier_id) REFERENCES Suppliers(supplier_id),
+            CONSTRAINT unique_medicine_entry UNIQUE (name, pharma_form, strength, expiry_date)
+        )
+        """,
+        """
+        CREATE TABLE Inventory (
+            medicine_id NUMBER PRIMARY KEY,
+            qty NUMBER DEFAULT 0,
+            min_threshold NUMBER DEFAULT 10,
+            CONSTRAINT fk_inv_med FOREIGN KEY(medicine_id) REFERENCES Medicines(medicine_id)
+        )
+        """,
+        """
+        CREATE TABLE Orders (
+            order_id NUMBER GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+            order_date DATE DEFAULT SYSDATE,
+            customer_id NUMBER,
+            total_amount NUMBER(12,2),
+            status VARCHAR2(20),
+            CONSTRAINT fk_ord_cust FOREIGN KEY(customer_id) REFERENCES Customers(customer_id)
+        )
+        """,
+        """
+        CREATE TABLE Order_Items (
+            order_item_id NUMBER GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+            order_id NUMBER,
+            medicine_id NUMBER,
+            quantity NUMBER,
+            unit_price NUMBER(10,2),
+            line_total NUMBER(12,2),
+            CONSTRAINT fk_oi_order FOREIGN KEY(order_id) REFERENCES Orders(order_id)
+        )
+        """,
+        """
+        CREATE TABLE Audit_Log (
+            audit_id NUMBER GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+            action_by VARCHAR2(100),
+            action VARCHAR2(100),
+            object_name VARCHAR2(100),
+            details VARCHAR2(2000),
+            action_time TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        )
+        """,
+        "ALTER TABLE Medicines ADD (CONSTRAINT chk_price_nonneg CHECK (unit_price >= 0))"
+    ]),
+    (2, 'Medicine retirement columns', [
+        """
+        ALTER TABLE Medicines ADD (
+            is_active CHAR(1) DEFAULT 'Y' CHECK (is_active IN ('Y','N')),
+            retired_at TIMESTAMP NULL
+        )
+        """
+    ]),
+    (3, 'Audit log time index', [
+        # Audit log is read newest-first with keyset paging
+        "CREATE INDEX idx_audit_log_time ON Audit_Log (action_time, audit_id)"
+    ]),
+    (4, 'Stock holds', [
+        """
+        CREATE TABLE Stock_Holds (
+            hold_id NUMBER GENERATED BY DEFAULT AS IDENTITY PRIMARY KEY,
+            cart_id VARCHAR2(64) NOT NULL,
+            medicine_id NUMBER NOT NULL,
+            qty NUMBER NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            expires_at TIMESTAMP WITH TIME ZONE NOT NULL,
+            CONSTRAINT uq_hold_cart_med UNIQUE (cart_id, medicine_id),
+            CONSTRAINT chk_hold_qty CHECK (qty > 0),
+            CONSTRAINT fk_hold_med FOREIGN KEY (medicine_id) REFERENCES Medicines(medicine_id)
+        )
+        """,
+        # The hold sweeper looks for expired holds
+        "CREATE INDEX idx_stock_holds_expiry ON Stock_Holds (expires_at)"
+    ]),
+    (5, 'Daily sales rollup table', [
+        """
+        CREATE TABLE Daily_Sales (
+            sale_date DATE NOT NULL,
+            slot NUMBER(2) NOT NULL,
+            orders NUMBER DEFAULT 0 NOT NULL,
+            total_sales NUMBER(14,2) DEFAULT 0 NOT NULL,
+            CONSTRAINT pk_daily_sales PRIMARY KEY (sale_date, slot)
+        )
+        """
+    ]),
+    (6, 'Supplier stats table', [
+        """
+        CREATE TABLE Supplier_Stats (
+            supplier_id NUMBER PRIMARY KEY,
+            meds_count NUMBER DEFAULT 0 NOT NULL,
+            price_sum NUMBER(16,2) DEFAULT 0 NOT NULL,
+            max_price NUMBER(10,2),
+            CONSTRAINT fk_stats_supplier FOREIGN KEY (supplier_id) REFERENCES Suppliers(supplier_id) ON DELETE CASCADE
+        )
+        """
+    ]),
+    (7, 'Expiry index', [
+        # Expiry report is one range scan up to the horizon
+        "CREATE INDEX idx_medicines_expiry ON Medicines (expiry_date)"
+    ]),
+    (8, 'Views, triggers and stored procedures',
+        [sql for _, sql in V8_VIEWS + V8_TRIGGERS + V8_PROCEDURES]),
+    (9, 'Backfill derived tables', REBUILD_SALES_ROLLUP + REBUILD_SUPPLIER_STATS),
+    (10, 'Indexes for joins, filters and foreign keys', [
+        # Unindexed foreign keys make a parent delete/key update lock the whole child table
+        "CREATE INDEX idx_order_items_order ON Order_Items (order_id)",
+        "CREATE INDEX idx_orders_customer ON Orders (customer_id)",
+        "CREATE INDEX idx_medicines_supplier ON Medicines (supplier_id)",
+        "CREATE INDEX idx_stock_holds_medicine ON Stock_Holds (medicine_id)",
+        # Sales window and newest-first keyset paging of the order listing
+        "CREATE INDEX idx_orders_date ON Orders (order_date, order_id)"
+    ]),
+    (11, 'Table change counters for cross-process ETags', [
+        """
+        CREATE TABLE Table_Versions (
+            table_name VARCHAR2(30) PRIMARY KEY,
+            version NUMBER DEFAULT 0 NOT NULL
+        )
+        """,
+        """
+        MERGE INTO Table_Versions v
+        USING (SELECT COLUMN_VALUE AS table_name
+               FROM TABLE(SYS.ODCIVARCHAR2LIST('SUPPLIERS', 'CUSTOMERS', 'MEDICINES',
+                                               'INVENTORY', 'ORDERS'))) t
+        ON (v.table_name = t.table_name)
+        WHEN NOT MATCHED THEN INSERT (table_name, version) VALUES (t.table_name, 0)
+        """,
+        VERSION_PROCEDURE
+    ] + [sql for _, sql in VERSION_TRIGGERS]),
+    (12, 'Case-insensitive dedupe keys', [
+        # Inserts rely on these instead of a SELECT first
+        check_dedupe_keys,
+        """
+        CREATE UNIQUE INDEX uq_medicines_dedupe ON Medicines
+            (LOWER(name), LOWER(pharma_form), LOWER(strength), TRUNC(expiry_date))
+        """,
+        "CREATE UNIQUE INDEX uq_suppliers_name ON Suppliers (LOWER(name))",
+        "CREATE UNIQUE INDEX uq_suppliers_email ON Suppliers (LOWER(contact_email))",
+        "CREATE UNIQUE INDEX uq_suppliers_phone ON Suppliers (phone)",
+        "CREATE UNIQUE INDEX uq_customers_email ON Customers (LOWER(email))"
+    ]),
+    # Every DML statement paid an extra commit and writers queued on one
+    # counter row; the API counts changes after commit instead
+    (13, 'Drop per-statement table change counters',
+        [f"DROP TRIGGER {name}" for name, _ in VERSION_TRIGGERS] +
+        ["DROP PROCEDURE bump_table_version", "DROP TABLE Table_Versions"]),
+    (14, 'Name-ordered contact listing indexes', [
+        # Supplier and customer pages are keyed on (name, id)
+        "CREATE INDEX idx_suppliers_name ON Suppliers (name, supplier_id)",
+        "CREATE INDEX idx_customers_name ON Customers (name, customer_id)",
+    ]),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+# The API and the CLI need every migration up to this one; later ones only
+# add constraints on existing data or clean up
+REQUIRED_VERSION = 11
+
+# Everything the migrations create, in a safe drop order (dev cleanup)
+DROP_STATEMENTS = (
+    [f"DROP TRIGGER {name}" for name, _ in TRIGGERS] +
+    [f"DROP PROCEDURE {name}" for name, _ in PROCEDURES] +
+    [f"DROP VIEW {name}" for name, _ in VIEWS] +
+    [f"DROP TABLE {table} CASCADE CONSTRAINTS" for table in (
+        'Stock_Holds', 'Daily_Sales', 'Supplier_Stats', 'Order_Items', 'Orders', 'Inventory',
+        'Medicines', 'Customers', 'Suppliers', 'Audit_Log', 'Schema_Version')]
+)
+
+
+def run_step(cursor, step):
+    """Run one migration step, skipping objects that already exist"""
+    if callable(step):
+        step(cursor)
+        return
+    try:
+        cursor.execute(step)
+    except cx_Oracle.DatabaseError as e:
+        error_obj, = e.args
+        if not any(code in error_obj.message for code in ALREADY_EXISTS_ERRORS):
+            raise
+        return
+    # PL/SQL that compiled with errors only raises a warning
+    if cursor.warning:
+        raise RuntimeError(f"{cursor.warning.message} in:{step.rstrip()}")
+
+
+def applied_versions(cursor):
+    """Versions recorded in Schema_Version, empty for an unversioned database"""
+    try:
+        cursor.execute("SELECT version FROM Schema_Version")
+    except cx_Oracle.DatabaseError as e:
+        error_obj, = e.args
+        if 'ORA-00942' in error_obj.message:  # table or view does not exist
+            return set()
+        raise
+    return {int(row[0]) for row in cursor.fetchall()}
+
+
+def migrate(conn, log=None, deferred=None):
+    """Apply pending migrations in order; return the versions applied.
+
+    Each migration is recorded (and committed) as soon as it has run, so a
+    failed run resumes from the migration that failed; a failure raises
+    MigrationError. Deferred migrations are logged and, if `deferred` is a
+    dict, collected in it as {version: reason}.
+    """
+    cursor = conn.cursor()
+    try:
+        done = applied_versions(cursor)
+        pending = [m for m in MIGRATIONS if m[0] not in done]
+        if not pending:
+            return []
+
+        run_step(cursor, SCHEMA_VERSION_TABLE)
+        applied = []
+        for version, description, steps in pending:
+            if log:
+                log(f"Applying migration {version}: {description}")
+            try:
+                for step in steps:
+                    run_step(cursor, step)
+            except DataCheckError as e:
+                if log:
+                    log(f"Deferred migration {version}: {e}")
+                if deferred is not None:
+                    deferred[version] = str(e)
+                conn.rollback()
+                continue
+            except Exception as e:
+                raise MigrationError(version, e) from e
+            try:
+                cursor.execute("INSERT INTO Schema_Version (version, description) VALUES (:1, :2)",
+                               (version, description))
+            except cx_Oracle.IntegrityError:
+                pass  # another process applied it at the same time
+            conn.commit()
+            applied.append(version)
+        return applied
+    finally:
+        cursor.close()
+
+
+def migration_status(conn):
+    """Every migration with its applied_at time (None if pending)"""
+    cursor = conn.cursor()
+    try:
+        applied_at = {}
+        if applied_versions(cursor):
+            cursor.execute("SELECT version, applied_at FROM Schema_Version")
+            applied_at = dict(cursor.fetchall())
+        return [{'version': version,
+                 'description': description,
+                 'applied_at': applied_at.get(version)} for version, description, _ in MIGRATIONS]
+    finally:
+        cursor.close()
+
+
+def main():
+    import argparse
+
+    from dotenv import load_dotenv
+
+    parser = argparse.ArgumentParser(description="Apply pharmacy schema migrations")
+    parser.add_argument('--status', action='store_true', help="only list applied and pending migrations")
+    parser.add_argument('--api-url', default="http://localhost:5000/api",
+                        help="running API to notify so it re-reads the schema")
+    args = parser.parse_args()
+
+    load_dotenv()
+    dsn = cx_Oracle.makedsn(os.getenv('DB_HOST', 'localhost'), os.getenv('DB_PORT', '1521'),
+                            service_name=os.getenv('DB_SERVICE', 'xepdb1'))
+    conn = cx_Oracle.connect(user=os.getenv('DB_USER', 'system'),
+                             password=os.getenv('DB_PASS', 'root'), dsn=dsn)
+
+    if args.status:
+        for m in migration_status(conn):
+            state = m['applied_at'].strftime('%Y-%m-%d %H:%M:%S') if m['applied_at'] else 'pending'
+            print(f"{m['version']:>3}  {m['description']:<50} {state}")
+        conn.close()
+        return 0
+
+    deferred = {}
+    applied = migrate(conn, log=print, deferred=deferred)
+    conn.close()
+    if deferred:
+        print(f"! Deferred migration(s) {', '.join(map(str, deferred))}; fix the data above and migrate again")
+    if not applied:
+        if not deferred:
+            print(f"✓ Schema is current (version {LATEST_VERSION})")
+        return 0
+    print(f"✓ Applied {len(applied)} migration(s)")
+
+    try:
+        req = urllib.request.Request(f"{args.api_url}/admin/schema-cache/invalidate", method="POST")
+        urllib.request.urlopen(req, timeout=5)
+    except Exception as e:
+        print(f"Flask server not reachable ({e}); it will read the schema when it starts")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,4 @@
-import React, { useState, useEffect } from "react";
+import React, { useState, useEffect, useRef } from "react";
 import axios from "axios";
 import { motion, AnimatePresence } from "framer-motion";
 
@@ -78,6 +78,7 @@ function App() {
   const [orders, setOrders] = useState([]);
   const [loading, setLoading] = useState(false);
   const [message, setMessage] = useState({ text: "", type: "" });
+  const bootstrapped = useRef(false);
 
   useEffect(() => {
     fetchData();
@@ -86,27 +87,38 @@ function App() {
   const fetchData = async () => {
     setLoading(true);
     try {
+      if (!bootstrapped.current) {
+        // First load: every dataset from one request and one DB snapshot.
+        // The tables need whole lists, even if the API pages by default.
+        const bootResponse = await axios.get(`${API_URL}/bootstrap?paginate=false`);
+        setInventory(bootResponse.data.inventory);
+        setSuppliers(bootResponse.data.suppliers);
+        setCustomers(bootResponse.data.customers);
+        setOrders(bootResponse.data.orders);
+        bootstrapped.current = true;
+        return;
+      }
       switch (activeTab) {
         case "inventory":
-          const invResponse = await axios.get(`${API_URL}/inventory`);
+          const invResponse = await axios.get(`${API_URL}/inventory?paginate=false`);
           setInventory(invResponse.data);
-          const supResponse = await axios.get(`${API_URL}/suppliers`);
+          const supResponse = await axios.get(`${API_URL}/suppliers?paginate=false`);
           setSuppliers(supResponse.data);
           break;
         case "suppliers":
-          const supResp = await axios.get(`${API_URL}/suppliers`);
+          const supResp = await axios.get(`${API_URL}/suppliers?paginate=false`);
           setSuppliers(supResp.data);
           break;
         case "customers":
-          const custResponse = await axios.get(`${API_URL}/customers`);
+          const custResponse = await axios.get(`${API_URL}/customers?paginate=false`);
           setCustomers(custResponse.data);
           break;
         case "orders":
-          const ordResponse = await axios.get(`${API_URL}/orders`);
+          const ordResponse = await axios.get(`${API_URL}/orders?paginate=false`);
           setOrders(ordResponse.data);
-          const invResp = await axios.get(`${API_URL}/inventory`);
+          const invResp = await axios.get(`${API_URL}/inventory?paginate=false`);
           setInventory(invResp.data);
-          const custResp = await axios.get(`${API_URL}/customers`);
+          const custResp = await axios.get(`${API_URL}/customers?paginate=false`);
           setCustomers(custResp.data);
           break;
         case "reports":
@@ -2239,44 +2251,26 @@ function EnhancedReportsTab({ showMessage, inventory }) {
 
   useEffect(() => {
     fetchReportData();
-  }, [activeReport, days]);
+  }, [days]);
 
+  // One request loads every report; switching report tabs needs no refetch
   const fetchReportData = async () => {
     setLoading(true);
     try {
-      switch (activeReport) {
-        case "sales":
-          const salesResp = await axios.get(
-            `${API_URL}/reports/sales-summary?days=${days}`
-          );
-          setSalesData(salesResp.data);
-          break;
-        case "audit":
-          const auditResp = await axios.get(
-            `${API_URL}/reports/audit-log?limit=100`
-          );
-          setAuditLog(auditResp.data);
-          break;
-        case "pricing":
-          const pricingResp = await axios.get(
-            `${API_URL}/reports/above-average-price`
-          );
-          setPricingData(pricingResp.data);
-          break;
-        case "inventoryThreshold":
-          const thresholdResp = await axios.get(
-            `${API_URL}/reports/inventory-any-threshold`
-          );
-          setInventoryThresholdData(thresholdResp.data);
-          break;
-        case "unionIntersect":
-          const unionResp = await axios.get(
-            `${API_URL}/reports/union-intersect`
-          );
-          setUnionIntersectData(unionResp.data);
-          break;
-        default:
-          break;
+      const resp = await axios.get(
+        `${API_URL}/reports/dashboard?days=${days}&audit_limit=100`
+      );
+      const data = resp.data;
+      setSalesData(data.sales_summary || []);
+      setAuditLog(data.audit_log || []);
+      setPricingData(data.above_average_price || []);
+      setInventoryThresholdData(data.inventory_any_threshold || []);
+      setUnionIntersectData(data.union_intersect || {});
+      if (data.errors) {
+        showMessage(
+          "Some reports failed to load: " + Object.keys(data.errors).join(", "),
+          "error"
+        );
       }
     } catch (error) {
       showMessage("Error fetching report data: " + error.message, "error");